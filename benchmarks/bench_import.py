@@ -0,0 +1,60 @@
+"""
+Cold import time of byefrontend.widgets – what every worker and management
+command pays at start-up.
+
+    python benchmarks/bench_import.py [--repeat 10]
+
+Each sample is a fresh interpreter (Django already set up, so only BFE's own
+imports are timed): the bare package, one widget, and every widget module
+(what the package used to import eagerly).
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+SETUP = """
+import sys, time
+sys.path.insert(0, {src!r})
+import django
+from django.conf import settings
+settings.configure(USE_I18N=False)
+django.setup()
+t0 = time.perf_counter()
+"""
+
+REPORT = """
+elapsed = time.perf_counter() - t0
+loaded = sum(name.startswith("byefrontend.") for name in sys.modules)
+print(elapsed, loaded)
+"""
+
+CASES = {
+    "import byefrontend.widgets": "import byefrontend.widgets",
+    "from byefrontend.widgets import TableWidget": "from byefrontend.widgets import TableWidget",
+    "all widget modules": "import byefrontend.widgets; byefrontend.widgets.import_all()",
+}
+
+
+def sample(statement: str) -> tuple[float, int]:
+    code = SETUP.format(src=SRC) + statement + REPORT
+    out = subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True).stdout
+    elapsed, loaded = out.split()
+    return float(elapsed), int(loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    for label, statement in CASES.items():
+        samples = [sample(statement) for _ in range(args.repeat)]
+        best = min(elapsed for elapsed, _ in samples)
+        print(f"{label:<46} {best * 1000:7.1f} ms  {samples[0][1]:3d} modules")
+
+
+if __name__ == "__main__":
+    main()
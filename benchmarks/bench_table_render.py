@@ -0,0 +1,74 @@
+"""
+Rows/sec for TableWidget: generic per-cell path vs compiled column renderers.
+
+    python benchmarks/bench_table_render.py [--rows 10000] [--cols 12] [--repeat 5]
+
+Runs without a Django project – settings are configured in-process.
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import django
+from django.conf import settings
+
+settings.configure(USE_I18N=False)
+django.setup()
+
+from byefrontend.configs import TableConfig  # noqa: E402
+from byefrontend.widgets import TableWidget  # noqa: E402
+
+
+def build(rows: int, cols: int) -> TableWidget:
+    kinds = ("text", "text", "text", "img", "text", "actions")
+    fields = [
+        {"field_name": f"c{i}", "field_text": f"Col {i}",
+         "field_type": kinds[i % len(kinds)], "editable": i % 5 == 4}
+        for i in range(cols)
+    ]
+    data = [{f"c{i}": f"r{r}c{i}" for i in range(cols)} for r in range(rows)]
+    return TableWidget(config=TableConfig(fields=fields, data=data))
+
+
+def generic(table: TableWidget) -> str:
+    fields = list(table.cfg.fields)
+    return "".join(table._render_row(row, fields) for row in table.cfg.data)
+
+
+def compiled(table: TableWidget) -> str:
+    render_row = table._row_renderer(list(table.cfg.fields))
+    return "".join(render_row(row) for row in table.cfg.data)
+
+
+def bench(fn, table, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(table)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--cols", type=int, default=12)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    table = build(args.rows, args.cols)
+    assert generic(table) == compiled(table), "compiled output differs"
+
+    before = bench(generic, table, args.repeat)
+    after = bench(compiled, table, args.repeat)
+    print(f"{args.rows} rows x {args.cols} cols (best of {args.repeat})")
+    print(f"  generic  : {args.rows / before:>12,.0f} rows/s  ({before * 1000:.1f} ms)")
+    print(f"  compiled : {args.rows / after:>12,.0f} rows/s  ({after * 1000:.1f} ms)")
+    print(f"  speed-up : {before / after:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -24,6 +24,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'byefrontend.middleware.WidgetIdScopeMiddleware',
 ]
 
 ROOT_URLCONF = 'bfe_test.urls'
@@ -36,45 +36,48 @@ from byefrontend.configs import (
 )
 from .models import Feedback, DataForFiltering
 from byefrontend.render import render_with_automatic_static
+from byefrontend.trees import bind, shared_tree
+
+
+# built once per process via shared_tree(); the selection is bound per request
+DEMO_NAVBAR = NavBarConfig(
+    name="top_nav",
+    text="ByeFrontend Demo",
+    title_button=True,
+    children={
+        "home": HyperlinkConfig(text="Home",   link="/"),
+        "about": NavBarConfig(
+            name="about",
+            text="About",
+            children={
+                "team":     HyperlinkConfig(text="Team",    link="/about/team"),
+                "company":  HyperlinkConfig(text="Company", link="/about/company"),
+                "further_dropdown": NavBarConfig(
+                    name="further_dropdown",
+                    text="Further Dropdown",
+                    children={
+                        "widgets_button": HyperlinkConfig(text="Widgets", link="/widgets/"),
+                    },
+                ),
+                "bottom_dropdown": NavBarConfig(
+                    name="bottom_dropdown",
+                    text="Bottom Dropdown",
+                    children={
+                        "data": HyperlinkConfig(text="Data", link="/data/"),
+                    },
+                ),
+            },
+        ),
+        "feedback": HyperlinkConfig(text="Feedback", link="/feedback/"),
+    },
+)
 
 
 def basic_view(request):
     # to show compatibility with normal django forms
     form = SecretTestForm()
 
-    navbar_cfg = NavBarConfig(
-        name="top_nav",
-        text="ByeFrontend Demo",
-        title_button=True,
-        selected_id="further_dropdown",
-        children={
-            "home": HyperlinkConfig(text="Home",   link="/"),
-            "about": NavBarConfig(
-                name="about",
-                text="About",
-                children={
-                    "team":     HyperlinkConfig(text="Team",    link="/about/team"),
-                    "company":  HyperlinkConfig(text="Company", link="/about/company"),
-                    "further_dropdown": NavBarConfig(
-                        name="further_dropdown",
-                        text="Further Dropdown",
-                        children={
-                            "widgets_button": HyperlinkConfig(text="Widgets", link="/widgets/"),
-                        },
-                    ),
-                    "bottom_dropdown": NavBarConfig(
-                        name="bottom_dropdown",
-                        text="Bottom Dropdown",
-                        children={
-                            "data": HyperlinkConfig(text="Data", link="/data/"),
-                        },
-                    ),
-                },
-            ),
-            "feedback": HyperlinkConfig(text="Feedback", link="/feedback/"),
-        },
-    )
-    navbar = NavBarWidget(config=navbar_cfg)
+    navbar = bind(shared_tree(NavBarWidget, DEMO_NAVBAR), selected_id="further_dropdown")
 
     upload_cfg = FileUploadConfig(
         upload_url=reverse("upload_file"),
@@ -400,7 +403,7 @@ def data_explorer_view(request):
     sort_dir = request.GET.get("sort_dir", "asc")
     page = max(int(request.GET.get("page", 1)), 1)
 
-    # building queryset
+    # building queryset – stays lazy, DataFilterWidget only fetches one page
     qs = DataForFiltering.objects.all()
     if q_name:
         qs = qs.filter(name__icontains=q_name)
@@ -408,15 +411,12 @@ def data_explorer_view(request):
         qs = qs.filter(domain__icontains=q_domain)
     if q_active:
         qs = qs.filter(is_active=True)
-    if sort_by in {"name", "domain", "created", "account_credits"}:
-        order = sort_by if sort_dir == "asc" else f"-{sort_by}"
-        qs = qs.order_by(order)
-
-    rows = list(
-        qs.values(
-            "name", "domain", "created", "birthday",
-            "is_active", "is_admin", "account_credits",
-        )
+    if sort_by not in {"name", "domain", "created", "account_credits"}:
+        sort_by = None
+
+    rows = qs.values(
+        "name", "domain", "created", "birthday",
+        "is_active", "is_admin", "account_credits",
     )
 
     filter_cfg = {
@@ -456,6 +456,7 @@ def data_explorer_view(request):
         page_size=25,
         sort_by=sort_by,
         sort_dir=sort_dir,
+        fragments=True,
     )
     datafilter = DataFilterWidget(config=df_cfg, request=request)
 
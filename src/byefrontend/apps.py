@@ -8,7 +8,9 @@ class ByeFrontendConfig(AppConfig):
     verbose_name = "Bye-Frontend Widgets"
 
     def ready(self) -> None:
-        """register sane default for the *optional* widget cache flag"""
+        """register sane defaults for the *optional* widget cache settings"""
         # todo: consider more automated settings here
         if not hasattr(settings, "BFE_WIDGET_CACHE"):
             settings.BFE_WIDGET_CACHE = False
+        if not hasattr(settings, "BFE_WIDGET_CACHE_BACKEND"):
+            settings.BFE_WIDGET_CACHE_BACKEND = "byefrontend.cache.LRURenderCache"
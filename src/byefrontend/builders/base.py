@@ -5,6 +5,7 @@ NOTE: forward references + TYPE_CHECKING let us keep full typing
 """
 from __future__ import annotations
 
+from importlib import import_module
 from types import MappingProxyType
 from typing import Callable, Mapping, TypeVar, TYPE_CHECKING
 
@@ -24,8 +25,12 @@ class ChildBuilderRegistry:
         @ChildBuilderRegistry.register(MyConfig)
         def _(cfg: MyConfig, parent):
             return MyWidget(config=cfg, parent=parent)
+
+    Builders living in modules nobody imported yet are announced with
+    `register_lazy` and imported on the first `build` of their config type.
     """
     _registry: dict[type[WidgetConfig], BuilderFn] = {}
+    _lazy: dict[str, str] = {}  # "pkg.module.ConfigName" -> module registering its builder
 
     @classmethod
     def register(cls, cfg_type: type[T]):
@@ -34,20 +39,32 @@ class ChildBuilderRegistry:
             return fn
         return decorator
 
+    @classmethod
+    def register_lazy(cls, cfg_path: str, module: str) -> None:
+        """*module* registers the builder for the config class at dotted *cfg_path*"""
+        cls._lazy[cfg_path] = module
+
     @classmethod
     def build(
         cls,
         cfg: "WidgetConfig",
         parent: "BFEBaseWidget | None" = None,
     ) -> "BFEBaseWidget":
-        try:
-            builder = cls._registry[type(cfg)]
-        except KeyError as exc:  # pragma: no cover
+        builder = cls._registry.get(type(cfg)) or cls._resolve(type(cfg))
+        if builder is None:
             raise ValueError(
                 f"No builder registered for {type(cfg).__name__}"
-            ) from exc
+            )
         return builder(cfg, parent)
 
+    @classmethod
+    def _resolve(cls, cfg_type: type) -> BuilderFn | None:
+        module = cls._lazy.get(f"{cfg_type.__module__}.{cfg_type.__qualname__}")
+        if module is None:
+            return None
+        import_module(module)  # registers on import
+        return cls._registry.get(cfg_type)
+
 
 def build_children(
     parent: "BFEBaseWidget",
@@ -0,0 +1,320 @@
+"""
+Page-level asset bundling (``settings.BFE_ASSET_BUNDLING = True``).
+
+Without it `aggregate_media` emits one ``<link>`` / ``<script>`` per widget
+file – a dozen requests for a typical page.  With it every distinct, ordered
+set of CSS (and of JS) files is concatenated, minified and written *once* to a
+content-hashed file under ``STATIC_ROOT``:
+
+    STATIC_ROOT/byefrontend/bundles/<hash>.css
+    STATIC_ROOT/byefrontend/bundles/<hash>.js
+    STATIC_ROOT/byefrontend/bundles/manifest.json
+
+so the page references one stylesheet and one script.  Bundles are built
+lazily on the first page that needs them, or ahead of time with
+``manage.py bundle_assets`` (which also rebuilds every set already in the
+manifest after a deploy).  The manifest remembers which sources went into each
+bundle plus their mtimes / sizes, so a process can reuse a bundle without
+reading the sources and a changed source is noticed.
+
+A set is left unbundled (plain tags, as before) when ``STATIC_ROOT`` is unset
+or one of its files cannot be found by the staticfiles finders.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .cache import make_key
+
+BUNDLE_DIR = "byefrontend/bundles"
+MANIFEST_NAME = "manifest.json"
+KINDS = ("css", "js")
+
+_lock = threading.Lock()
+_resolved: dict[str, str | None] = {}  # set key -> bundle path, per process
+_manifest: dict | None = None
+
+
+def bundling_enabled() -> bool:
+    return getattr(settings, "BFE_ASSET_BUNDLING", False)
+
+
+def bundle(kind: str, paths) -> str | None:
+    """
+    static-relative path of the bundle holding *paths* (static-relative, in
+    cascade order), built on first use; *None* when the set can't be bundled
+    """
+    if kind not in KINDS:
+        raise ValueError(f"Unknown asset kind {kind!r}; choose from {KINDS}")
+    paths = tuple(paths)
+    key = make_key("bundle", kind, paths)
+    try:
+        return _resolved[key]
+    except KeyError:
+        pass
+    with _lock:
+        if key not in _resolved:
+            _resolved[key] = _lookup_or_build(key, kind, paths)
+        return _resolved[key]
+
+
+def bundle_paths(kind: str, paths) -> list[str]:
+    """
+    *paths* (static paths as collected from the widgets) with the local ones
+    folded into one bundle (at the position of the first of them); absolute
+    URLs / paths are kept as they are
+    """
+    paths = list(paths)
+    local = [path for path in paths if not is_absolute(path)]
+    if len(local) < 2:
+        return paths
+    bundled = bundle(kind, local)
+    if bundled is None:
+        return paths
+    out, placed = [], False
+    for path in paths:
+        if is_absolute(path):
+            out.append(path)
+        elif not placed:
+            out.append(bundled)
+            placed = True
+    return out
+
+
+def is_absolute(path: str) -> bool:
+    """served from elsewhere – `django.forms.Media` leaves these alone too"""
+    return path.startswith(("http://", "https://", "/"))
+
+
+def rebuild_manifest(*, clear: bool = False) -> list[str]:
+    """
+    rebuild every set recorded in the manifest, return the bundle paths
+    - clear – delete the existing bundles (and manifest) first
+    """
+    global _manifest
+    with _lock:
+        entries = list(_read_manifest().values())
+        _resolved.clear()
+        root = _bundle_root()
+        if clear and root is not None and root.is_dir():
+            shutil.rmtree(root)
+            _manifest = None
+    return [path for entry in entries
+            if (path := bundle(entry["kind"], entry["sources"])) is not None]
+
+
+def reset_bundles() -> None:
+    """forget resolved bundles and the loaded manifest (tests, settings changes)"""
+    global _manifest
+    with _lock:
+        _resolved.clear()
+        _manifest = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(*, setting, **kwargs):
+    if setting in {"BFE_ASSET_BUNDLING", "STATIC_ROOT", "STATICFILES_DIRS"}:
+        reset_bundles()
+
+
+# ── building ────────────────────────────────────────────────────────────────
+
+
+def _lookup_or_build(key: str, kind: str, paths: tuple[str, ...]) -> str | None:
+    root = _bundle_root()
+    if root is None:
+        return None
+    sources = [finders.find(path) for path in paths]
+    if not all(sources):
+        return None
+    stamp = _stamp(sources)
+
+    entry = _read_manifest().get(key)
+    if entry and entry["stamp"] == stamp and (root.parent.parent / entry["file"]).exists():
+        return entry["file"]
+
+    minify = minify_css if kind == "css" else minify_js
+    chunks = []
+    for path, source in zip(paths, sources):
+        text = Path(source).read_text(encoding="utf-8")
+        if kind == "css":
+            text = rebase_urls(text, path)
+        chunks.append(minify(text))
+    # a file without a trailing ";" must not run into the next one
+    content = ("\n" if kind == "css" else "\n;\n").join(chunks) + "\n"
+
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+    name = f"{BUNDLE_DIR}/{digest}.{kind}"
+    target = root / f"{digest}.{kind}"
+    if not target.exists():
+        write_atomic(target, content)
+
+    global _manifest
+    manifest = _manifest = {**_read_manifest(), **_load_manifest()}  # other processes write too
+    manifest[key] = {"kind": kind, "sources": list(paths), "stamp": stamp, "file": name}
+    write_atomic(root / MANIFEST_NAME, json.dumps(manifest, indent=1, sort_keys=True))
+    return name
+
+
+def _bundle_root() -> Path | None:
+    static_root = getattr(settings, "STATIC_ROOT", None)
+    if not static_root:
+        return None
+    return Path(static_root) / BUNDLE_DIR
+
+
+def _read_manifest() -> dict:
+    global _manifest
+    if _manifest is None:
+        _manifest = _load_manifest()
+    return _manifest
+
+
+def _load_manifest() -> dict:
+    try:
+        return json.loads((_bundle_root() / MANIFEST_NAME).read_text(encoding="utf-8"))
+    except (TypeError, OSError, ValueError):  # no root / no manifest / garbage
+        return {}
+
+
+def _stamp(sources) -> str:
+    stats = [os.stat(source) for source in sources]
+    return make_key([(st.st_mtime_ns, st.st_size) for st in stats])
+
+
+def write_atomic(target: Path, content: str) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as fh:
+            fh.write(content)
+        os.chmod(tmp, 0o644)  # mkstemp is owner-only; the web server has to read it
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+# ── minification ────────────────────────────────────────────────────────────
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)([^'")]+)\1\s*\)""")
+_CSS_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE = re.compile(r"\s+")
+_CSS_PUNCT = re.compile(r"\s*([{};,>])\s*")
+
+
+def rebase_urls(css: str, path: str, target_dir: str = BUNDLE_DIR) -> str:
+    """relative ``url()``s in *path* (static-relative) re-pointed from *target_dir*"""
+    base = posixpath.dirname(path)
+
+    def repl(match):
+        quote, url = match.groups()
+        if url.startswith(("data:", "http:", "https:", "//", "/", "#")):
+            return match.group(0)
+        target = posixpath.normpath(posixpath.join(base, url))
+        return f"url({quote}{posixpath.relpath(target, target_dir)}{quote})"
+
+    return _CSS_URL.sub(repl, css)
+
+
+def minify_css(css: str) -> str:
+    """comments and insignificant whitespace out, nothing else touched"""
+    css = _CSS_COMMENT.sub("", css)
+    css = _CSS_SPACE.sub(" ", css)
+    css = _CSS_PUNCT.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+# `/` after one of these (or at the start) opens a regex literal, not a division
+_REGEX_AFTER = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {"return", "typeof", "case", "void", "in", "of", "delete", "throw"}
+_TRAILING_WORD = re.compile(r"[A-Za-z_$][\w$]*$")
+
+
+def minify_js(js: str) -> str:
+    """
+    Conservative minifier: drops comments, indentation, blank lines and
+    repeated spaces while copying string, template and regex literals
+    verbatim.  Newlines are kept so automatic semicolon insertion still sees
+    the same statements.
+    """
+    out: list[str] = []
+    i, n = 0, len(js)
+
+    def last_significant():
+        for chunk in reversed(out):
+            stripped = chunk.rstrip()
+            if stripped:
+                return stripped
+        return ""
+
+    def separate(newline: bool):
+        """one space / newline between tokens, however much whitespace and comment was there"""
+        if out and out[-1] in (" ", "\n"):
+            if newline:
+                out[-1] = "\n"
+        else:
+            out.append("\n" if newline else " ")
+
+    while i < n:
+        ch = js[i]
+        if ch in "'\"`":
+            j = i + 1
+            while j < n and js[j] != ch:
+                j += 2 if js[j] == "\\" else 1
+            out.append(js[i:j + 1])
+            i = j + 1
+        elif js.startswith("//", i):
+            i = js.find("\n", i)
+            i = n if i < 0 else i
+        elif js.startswith("/*", i):
+            end = js.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            separate("\n" in js[i:end])
+            i = end
+        elif ch == "/" and _opens_regex(last_significant()):
+            j, in_class = i + 1, False
+            while j < n and (in_class or js[j] != "/") and js[j] != "\n":
+                if js[j] == "\\":
+                    j += 1
+                elif js[j] == "[":
+                    in_class = True
+                elif js[j] == "]":
+                    in_class = False
+                j += 1
+            out.append(js[i:j + 1])
+            i = j + 1
+        elif ch in " \t\r\n":
+            j = i
+            while j < n and js[j] in " \t\r\n":
+                j += 1
+            separate("\n" in js[i:j])
+            i = j
+        else:
+            j = i
+            while j < n and js[j] not in "'\"`/ \t\r\n":
+                j += 1
+            out.append(js[i:max(j, i + 1)])
+            i = max(j, i + 1)
+
+    return "".join(out).strip()
+
+
+def _opens_regex(previous: str) -> bool:
+    if not previous or previous[-1] in _REGEX_AFTER:
+        return True
+    word = _TRAILING_WORD.search(previous)
+    return word is not None and word.group(0) in _REGEX_KEYWORDS
@@ -0,0 +1,175 @@
+"""
+Pluggable render/media cache used by :class:`~byefrontend.widgets.base.BFEBaseWidget`
+when ``settings.BFE_WIDGET_CACHE`` is switched on.
+
+Two tiers ship with the package:
+
+- ``LRURenderCache``     – in-process, bounded LRU (default)
+- ``DjangoRenderCache``  – delegates to a Django cache alias (Redis, memcached, …)
+
+Pick one via ``settings.BFE_WIDGET_CACHE_BACKEND`` (dotted path) and tune it with
+``settings.BFE_WIDGET_CACHE_OPTIONS`` (kwargs passed to the backend).
+
+Entries are *content addressed*: the key already contains everything the HTML
+depends on, so invalidation on the widget side (``_invalidate_render_cache``)
+only has to drop the per-instance memo – stale keys simply age out.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from importlib import import_module
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import setting_changed
+
+
+DEFAULT_BACKEND = "byefrontend.cache.LRURenderCache"
+
+
+class BaseRenderCache:
+    """
+    Minimal interface every backend implements.
+
+    ``get`` returns *None* on a miss; values are plain ``str`` (render) or
+    ``django.forms.Media`` (media) and must be treated as immutable.
+    """
+
+    def get(self, key: str) -> Any | None:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class LRURenderCache(BaseRenderCache):
+    """
+    Thread-safe, bounded, in-process LRU.
+
+    - maxsize – number of entries kept before the least recently used is evicted
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            return self._data[key]
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DjangoRenderCache(BaseRenderCache):
+    """
+    Shares rendered HTML between processes through Django's cache framework.
+
+    - alias      – key of ``settings.CACHES`` to use
+    - timeout    – seconds an entry lives (``None`` = backend default)
+    - key_prefix – namespace so widget entries never collide with app keys
+    """
+
+    def __init__(self, alias: str = "default", timeout: int | None = 300,
+                 key_prefix: str = "bfe"):
+        self.alias = alias
+        self.timeout = timeout
+        self.key_prefix = key_prefix
+
+    @property
+    def _cache(self):
+        from django.core.cache import caches
+        return caches[self.alias]
+
+    def _k(self, key: str) -> str:
+        return f"{self.key_prefix}:{key}"
+
+    def get(self, key: str) -> Any | None:
+        return self._cache.get(self._k(key))
+
+    def set(self, key: str, value: Any) -> None:
+        self._cache.set(self._k(key), value, self.timeout)
+
+    def delete(self, key: str) -> None:
+        self._cache.delete(self._k(key))
+
+    def clear(self) -> None:
+        # only safe when the alias is dedicated to widgets – documented caveat
+        self._cache.clear()
+
+
+_backend: BaseRenderCache | None = None
+_backend_lock = threading.Lock()
+
+
+def cache_enabled() -> bool:
+    return bool(getattr(settings, "BFE_WIDGET_CACHE", False))
+
+
+def get_render_cache() -> BaseRenderCache:
+    """
+    Return the process-wide backend referenced by
+    ``settings.BFE_WIDGET_CACHE_BACKEND`` (built once, then reused).
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                dotted = getattr(settings, "BFE_WIDGET_CACHE_BACKEND", None) or DEFAULT_BACKEND
+                options = getattr(settings, "BFE_WIDGET_CACHE_OPTIONS", None) or {}
+                module_path, cls_name = dotted.rsplit(".", 1)
+                backend_cls = getattr(import_module(module_path), cls_name)
+                _backend = backend_cls(**options)
+    return _backend
+
+
+def reset_render_cache() -> None:
+    """drop the backend instance so the next lookup re-reads settings"""
+    global _backend
+    with _backend_lock:
+        _backend = None
+
+
+def make_key(*parts: Any) -> str:
+    """
+    Collapse arbitrary key *parts* into a short, backend-safe digest.
+    Parts are ``repr``-ed, so they must have a deterministic repr.
+    """
+    raw = "\x1f".join(repr(p) for p in parts)
+    return hashlib.blake2b(raw.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+def _on_setting_changed(*, setting, **kwargs):
+    if setting in {"BFE_WIDGET_CACHE_BACKEND", "BFE_WIDGET_CACHE_OPTIONS"}:
+        reset_render_cache()
+
+
+setting_changed.connect(_on_setting_changed)
@@ -0,0 +1,188 @@
+"""
+Precompressed static assets.
+
+``manage.py compress_assets`` (after ``collectstatic``) writes compressed
+siblings next to every BFE stylesheet and script under ``STATIC_ROOT`` –
+``navbar.css.gz``, ``navbar.css.br`` … – once per deploy.  A proxy with
+``gzip_static``-style support serves them directly; for deployments without
+one, `PrecompressedStaticMiddleware` (byefrontend.middleware) picks the best
+sibling the client's ``Accept-Encoding`` allows.
+
+Codecs (`CODECS`):
+
+- ``gzip`` – always (stdlib)
+- ``zstd`` – when the stdlib has ``compression.zstd`` (Python 3.14+)
+- ``br``   – when the optional ``brotli`` package is installed
+"""
+from __future__ import annotations
+
+import gzip
+import mimetypes
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .bundling import minify_css, minify_js
+
+try:  # pragma: no cover - depends on the interpreter
+    from compression import zstd
+except ImportError:  # pragma: no cover
+    zstd = None
+
+try:  # pragma: no cover - optional dependency
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+ASSET_DIR = "byefrontend"
+EXTENSIONS = (".css", ".js", ".svg")
+MIN_SIZE = 256  # below this the headers outweigh the saving
+
+
+@dataclass(frozen=True, slots=True)
+class Codec:
+    """a content-coding: its ``Accept-Encoding`` token, file suffix and compressor"""
+    name: str
+    suffix: str
+    compress: Callable[[bytes], bytes]
+
+
+CODECS: dict[str, Codec] = {
+    "gzip": Codec("gzip", ".gz", lambda data: gzip.compress(data, compresslevel=9, mtime=0)),
+}
+if zstd is not None:  # pragma: no cover
+    CODECS["zstd"] = Codec("zstd", ".zst", lambda data: zstd.compress(data, level=19))
+if brotli is not None:  # pragma: no cover
+    CODECS["br"] = Codec("br", ".br", lambda data: brotli.compress(data, quality=11))
+
+# server preference when the client accepts several equally
+PREFERENCE = ("br", "zstd", "gzip")
+
+
+def compress_assets(root=None, *, codecs=("gzip",), minify=False, force=False) -> list[Path]:
+    """
+    write compressed siblings for every asset under ``<root>/byefrontend``
+    (``STATIC_ROOT`` by default) and return the files written; the collected
+    originals are never touched, so manifest hashes and SRI digests hold
+
+    - codecs – names from `CODECS`
+    - minify – compress a minified copy of plain ``.css`` / ``.js`` files
+      (bundles and the generated stylesheet already are).  Opt-in: the
+      decoded sibling then differs from the original, which breaks
+      ``integrity=`` attributes on those files
+    - force  – recompress even when a sibling is newer than its source
+    """
+    unknown = set(codecs) - CODECS.keys()
+    if unknown:
+        raise ValueError(f"Unavailable codec(s) {sorted(unknown)}; choose from {sorted(CODECS)}")
+    root = root or settings.STATIC_ROOT
+    if not root:
+        raise ValueError("compress_assets needs settings.STATIC_ROOT")
+    root = Path(root) / ASSET_DIR
+    written = []
+    for source in sorted(root.rglob("*")):
+        if not source.is_file() or source.suffix not in EXTENSIONS:
+            continue
+        targets = [(CODECS[name], source.with_name(source.name + CODECS[name].suffix)) for name in codecs]
+        if not force:
+            mtime = source.stat().st_mtime_ns
+            targets = [(codec, target) for codec, target in targets
+                       if not (target.exists() and target.stat().st_mtime_ns >= mtime)]
+        if not targets:
+            continue
+        data = source.read_bytes()
+        if minify and source.suffix in (".css", ".js") and not _already_minified(source, root):
+            data = _minified(source, data)
+        if len(data) < MIN_SIZE:
+            continue
+        for codec, target in targets:
+            packed = codec.compress(data)
+            if len(packed) >= len(data):
+                continue
+            target.write_bytes(packed)
+            written.append(target)
+    return written
+
+
+def _already_minified(source: Path, root: Path) -> bool:
+    return source.relative_to(root).parts[0] in ("bundles", "generated")
+
+
+def _minified(source: Path, data: bytes) -> bytes:
+    minify = minify_css if source.suffix == ".css" else minify_js
+    return (minify(data.decode("utf-8")) + "\n").encode("utf-8")
+
+
+# ── serving ─────────────────────────────────────────────────────────────────
+
+
+def accepted_codings(header: str) -> dict[str, float]:
+    """``"gzip, br;q=0.8, *;q=0"`` -> ``{"gzip": 1.0, "br": 0.8, "*": 0.0}``"""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate(header: str, available) -> str | None:
+    """best codec name from *available* the ``Accept-Encoding`` *header* allows"""
+    accepted = accepted_codings(header or "")
+    best, best_q = None, 0.0
+    for name in PREFERENCE:
+        if name not in available:
+            continue
+        q = accepted.get(name, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def serve_precompressed(request, path: str, document_root=None):
+    """
+    response with the best precompressed sibling of static *path* under
+    *document_root* (``STATIC_ROOT``), or *None* when there is none the
+    client accepts – the caller then serves the file as usual
+    """
+    try:
+        fullpath = Path(safe_join(document_root or settings.STATIC_ROOT, path))
+    except (SuspiciousFileOperation, TypeError):  # escaping the root / no STATIC_ROOT
+        return None
+    if not fullpath.is_file():
+        return None
+
+    available = {name: fullpath.with_name(fullpath.name + codec.suffix) for name, codec in CODECS.items()}
+    available = {name: sibling for name, sibling in available.items() if sibling.is_file()}
+    coding = negotiate(request.headers.get("Accept-Encoding", ""), available)
+    if coding is None:
+        return None
+
+    stat = fullpath.stat()
+    if not was_modified_since(request.headers.get("If-Modified-Since"), stat.st_mtime):
+        response = HttpResponseNotModified()
+        patch_vary_headers(response, ("Accept-Encoding",))
+        return response
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    response = FileResponse(available[coding].open("rb"), filename=fullpath.name,
+                            content_type=content_type or "application/octet-stream")
+    response.headers["Content-Encoding"] = coding
+    response.headers["Last-Modified"] = http_date(stat.st_mtime)
+    patch_vary_headers(response, ("Accept-Encoding",))
+    return response
@@ -1,32 +1,91 @@
-from .base import WidgetConfig
-from .input import TextInputConfig
-from .secret import SecretToggleConfig
-from .hyperlink import HyperlinkConfig
-from .navbar import NavBarConfig
-from .file_upload import FileUploadConfig
-from .code_box import CodeBoxConfig
-from .label import LabelConfig
-from .binary import CheckBoxConfig, RadioConfig
-from .thumbnail import ThumbnailConfig
-from .title import TitleConfig
-from .popout import PopOutConfig
-from .table import TableConfig
-from .radio_group import RadioGroupConfig
-from .inline_group import InlineGroupConfig
-from .card import CardConfig
-from .text_editor import TextEditorConfig
-from .datepicker import DatePickerConfig
-from .dropdown import DropdownConfig
-from .tag_input import TagInputConfig
-from .form import FormConfig
-from .inline_form import InlineFormConfig
-from .button import ButtonConfig
-from .paragraph import ParagraphConfig
-from .document_viewer import DocumentViewerConfig
-from .document_link import DocumentLinkConfig
-from .data_filter import DataFilterConfig
-
-from ._helpers import tweak
+"""
+Widget configs, imported on first use – ``from byefrontend.configs import
+TableConfig`` loads ``configs/table.py`` only (see byefrontend.widgets).
+"""
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import WidgetConfig
+    from .input import TextInputConfig
+    from .secret import SecretToggleConfig
+    from .hyperlink import HyperlinkConfig
+    from .navbar import NavBarConfig
+    from .file_upload import FileUploadConfig
+    from .code_box import CodeBoxConfig
+    from .label import LabelConfig
+    from .binary import CheckBoxConfig, RadioConfig
+    from .thumbnail import ThumbnailConfig
+    from .title import TitleConfig
+    from .popout import PopOutConfig
+    from .table import TableConfig
+    from .radio_group import RadioGroupConfig
+    from .inline_group import InlineGroupConfig
+    from .card import CardConfig
+    from .text_editor import TextEditorConfig
+    from .datepicker import DatePickerConfig
+    from .dropdown import DropdownConfig
+    from .tag_input import TagInputConfig
+    from .form import FormConfig
+    from .inline_form import InlineFormConfig
+    from .button import ButtonConfig
+    from .paragraph import ParagraphConfig
+    from .document_viewer import DocumentViewerConfig
+    from .document_link import DocumentLinkConfig
+    from .data_filter import DataFilterConfig
+
+    from ._helpers import tweak
+    from ._fingerprint import fingerprint
+
+# public name -> submodule defining it
+_EXPORTS: dict[str, str] = {
+    "WidgetConfig": "base",
+    "TextInputConfig": "input",
+    "SecretToggleConfig": "secret",
+    "HyperlinkConfig": "hyperlink",
+    "NavBarConfig": "navbar",
+    "FileUploadConfig": "file_upload",
+    "CodeBoxConfig": "code_box",
+    "LabelConfig": "label",
+    "CheckBoxConfig": "binary",
+    "RadioConfig": "binary",
+    "ThumbnailConfig": "thumbnail",
+    "TitleConfig": "title",
+    "PopOutConfig": "popout",
+    "TableConfig": "table",
+    "RadioGroupConfig": "radio_group",
+    "InlineGroupConfig": "inline_group",
+    "CardConfig": "card",
+    "TextEditorConfig": "text_editor",
+    "DatePickerConfig": "datepicker",
+    "DropdownConfig": "dropdown",
+    "TagInputConfig": "tag_input",
+    "FormConfig": "form",
+    "InlineFormConfig": "inline_form",
+    "ButtonConfig": "button",
+    "ParagraphConfig": "paragraph",
+    "DocumentViewerConfig": "document_viewer",
+    "DocumentLinkConfig": "document_link",
+    "DataFilterConfig": "data_filter",
+    "tweak": "_helpers",
+    "fingerprint": "_fingerprint",
+}
+
+
+def __getattr__(name: str):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
 
 
 __all__: tuple[str, ...] = (
@@ -37,6 +96,7 @@ __all__: tuple[str, ...] = (
     "NavBarConfig",
     "FileUploadConfig",
     "tweak",
+    "fingerprint",
     "CodeBoxConfig",
     "LabelConfig",
     "CheckBoxConfig",
@@ -0,0 +1,145 @@
+"""
+Stable structural fingerprints for (trees of) frozen configs.
+
+`WidgetConfig` holds dicts (`attrs`, `children`) so it cannot be hashed, but it
+*can* be serialised into a canonical token stream and digested.  The digest of
+every config instance is memoised on the instance itself, so a parent only pays
+O(1) for each child it has already seen.
+
+Mapping order is **kept** on purpose – children and attrs render in insertion
+order, so two mappings with the same items in a different order produce
+different HTML and therefore must not share a fingerprint.
+
+Values whose content can't be known from the object itself make the digest
+*None* – the config is then simply not cacheable:
+
+- Django QuerySets: the same SQL returns different rows once the table changes
+- lambdas, closures and bound methods – the token would name a qualname
+  shared by unrelated objects, so two configs could collide
+- any other object, unless it has its own ``fingerprint`` or its type is one
+  of the plain value types in `_VALUES` (whose repr spells out the whole
+  value). A custom ``__repr__`` usually leaves state out – two Django model
+  instances with different emails can both be ``<User: ada>``
+
+Caveat: the memo assumes configs really are immutable. mutating a nested
+dict/list after the first `fingerprint` call is not detected.
+"""
+from __future__ import annotations
+
+import datetime
+import decimal
+import enum
+import fractions
+import hashlib
+import inspect
+import uuid
+from collections.abc import Mapping, Set
+from dataclasses import fields
+from pathlib import PurePath
+from typing import Any
+
+DIGEST_SIZE = 16  # bytes -> 32 hex chars
+
+_SCALARS = (str, int, float, bool, bytes, type(None))
+# value types whose repr is their complete state (datetime covers date too)
+_VALUES = (
+    datetime.date, datetime.time, datetime.timedelta, decimal.Decimal,
+    fractions.Fraction, uuid.UUID, enum.Enum, PurePath, complex, range,
+)
+
+
+class Unfingerprintable(Exception):
+    """raised inside the encoder for a value with no stable content identity"""
+
+
+def fingerprint(obj: Any) -> str | None:
+    """
+    Return a hex digest describing the *structure and content* of *obj*, or
+    *None* when some part of it can't be fingerprinted (see module docs).
+
+    Works for any `WidgetConfig` (memoised) and for plain values, mappings and
+    sequences, so callers can also fingerprint e.g. a bare `fields` schema.
+    """
+    from .base import WidgetConfig
+
+    if isinstance(obj, WidgetConfig):
+        return obj.fingerprint
+    try:
+        return _digest(_tokens(obj))
+    except Unfingerprintable:
+        return None
+
+
+def config_fingerprint(cfg) -> str | None:
+    """uncached digest of one config instance – use ``cfg.fingerprint`` instead"""
+    out: list[str] = [f"C:{type(cfg).__module__}.{type(cfg).__qualname__}("]
+    try:
+        for f in fields(cfg):
+            if not f.compare:  # memo slot & friends
+                continue
+            out.append(f.name)
+            out.append("=")
+            _feed(getattr(cfg, f.name), out)
+            out.append(",")
+    except Unfingerprintable:
+        return None
+    out.append(")")
+    return _digest(out)
+
+
+def _digest(tokens: list[str]) -> str:
+    raw = "\x1f".join(tokens).encode("utf-8", "surrogatepass")
+    return hashlib.blake2b(raw, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def _tokens(obj: Any) -> list[str]:
+    out: list[str] = []
+    _feed(obj, out)
+    return out
+
+
+def _feed(obj: Any, out: list[str]) -> None:
+    """append canonical, type-tagged tokens for *obj* to *out*"""
+    from .base import WidgetConfig
+
+    if isinstance(obj, _SCALARS):
+        # type tag keeps 1 / "1" / True / 1.0 apart
+        out.append(f"{type(obj).__name__}:{obj!r}")
+    elif isinstance(obj, WidgetConfig):
+        fp = obj.fingerprint
+        if fp is None:
+            raise Unfingerprintable(type(obj).__qualname__)
+        out.append(f"cfg:{fp}")
+    elif isinstance(obj, Mapping):
+        out.append("{")
+        for k, v in obj.items():
+            _feed(k, out)
+            _feed(v, out)
+        out.append("}")
+    elif isinstance(obj, (list, tuple)):
+        out.append("[")
+        for item in obj:
+            _feed(item, out)
+        out.append("]")
+    elif isinstance(obj, Set):
+        out.append("set{")
+        out.extend(sorted(_digest(_tokens(item)) for item in obj))
+        out.append("}")
+    elif hasattr(obj, "model") and hasattr(obj, "query"):
+        # Django QuerySet: the SQL says nothing about the rows it will fetch
+        raise Unfingerprintable(f"QuerySet of {obj.model._meta.label}")
+    elif callable(obj) and hasattr(obj, "__qualname__"):
+        if inspect.ismethod(obj) or "<" in obj.__qualname__:  # bound / lambda / closure
+            raise Unfingerprintable(obj.__qualname__)
+        out.append(f"fn:{getattr(obj, '__module__', '')}.{obj.__qualname__}")
+    elif hasattr(obj, "fingerprint"):
+        # any object that already knows its own identity (datasets, …)
+        fp = obj.fingerprint
+        if not isinstance(fp, str):
+            raise Unfingerprintable(type(obj).__qualname__)
+        out.append(f"fp:{fp}")
+    elif isinstance(obj, _VALUES):
+        out.append(f"{type(obj).__module__}.{type(obj).__qualname__}:{obj!r}")
+    else:
+        # model instances, opaque objects, custom reprs: no trustworthy identity
+        raise Unfingerprintable(type(obj).__qualname__)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field, replace
 from typing import List, Dict, Any, Tuple
+from ._fingerprint import config_fingerprint
 
 
 @dataclass(slots=True, frozen=True)
@@ -28,6 +29,24 @@ class WidgetConfig:
     attrs: Dict[str, Any] = field(default_factory=dict)
     # todo: compound/additive attr function for adding to a known but unhandled attr
 
+    # memo for `fingerprint` ("" = can't be fingerprinted) – not part of the config's identity,
+    # reset by `replace()`
+    _fingerprint: str | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def fingerprint(self) -> str | None:
+        """
+        Stable digest of this config *and every nested config/value*.
+        computed on first access, then O(1) – safe to use as a cache key or ETag part.
+        *None* when it holds a QuerySet or another value without a stable content
+        identity (see configs._fingerprint); such configs must never be cached.
+        """
+        fp = self._fingerprint
+        if fp is None:
+            fp = config_fingerprint(self) or ""
+            object.__setattr__(self, "_fingerprint", fp)  # frozen: bypass on purpose
+        return fp or None
+
     # constructor to merge overrides without breaking immutability
     @classmethod
     def build(cls, **overrides: Any) -> "WidgetConfig":
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Mapping, Sequence, Any
+from typing import Callable, Mapping, Sequence, Any
 from .base import WidgetConfig
 
 
@@ -10,15 +10,33 @@ class DataFilterConfig(WidgetConfig):
     Immutable settings for DataFilterWidget.
 
     - filters – mapping *name -> WidgetConfig* (rendered in an InlineForm)
-    - data – the **full, unfiltered** dataset: Sequence[Mapping]
+    - data – the **full, unfiltered** dataset: Sequence[Mapping] *or* a Django QuerySet.
+             QuerySets are never materialised: sort -> `order_by`, page -> LIMIT/OFFSET,
+             page count -> one `count()`. For large in-memory lists wrap them once in a
+             :class:`byefrontend.datasets.IndexedDataset` – sort/filter then come from its indexes
     - table_fields – TableWidget fields definition (same shape you already use)
     - page – 1-based current page number
     - page_size – rows per page
     - max_page_size – hard cap (safety against “100 000 rows per page”)
-    - sort_by / dir – optional client-side sort when the dataset is a Python list, todo: make server-side?
+    - sort_by / dir – optional sort; in-memory for lists, pushed down to the DB for QuerySets.
+                      only a `field_name` of `table_fields` is honoured, anything else
+                      (unknown names, relation paths) falls back to the default order
+    - pagination – "offset" (page numbers) or "keyset" (opaque `cursor=` tokens, QuerySets only;
+                   deep pages cost the same as page 1, page-number jumps are not offered)
+    - cursor – the current `cursor=` query parameter when pagination == "keyset"
+    - pk_field – unique tie-breaker column for keyset ordering ("pk": the model's primary key);
+                 it and `sort_by` are added to a `.values(...)` QuerySet that lacks them,
+                 `.values_list()` is refused. NULL sort values are not supported
+    - count_strategy – how the offset pager learns the total: "exact", "cached", "capped",
+                       "estimated" or any callable, see :mod:`byefrontend.pagination`
+    - fragments – pager links & filter submits fetch only table + pager (``X-BFE-Fragment``
+                  request header) and swap them in place; the view must render through
+                  `render_with_automatic_static` (or answer with `render_fragment_response`).
+                  the region is found again by `html_id` or `name`, so several fragment
+                  DataFilters on one page each need their own
     """
     filters: Mapping[str, WidgetConfig] = field(default_factory=dict)
-    data: Sequence[Mapping[str, Any]] = field(default_factory=list)
+    data: Sequence[Mapping[str, Any]] | Any = field(default_factory=list)
     table_fields: Sequence[Mapping[str, Any]] = field(default_factory=list)
 
     page: int = 1
@@ -27,3 +45,11 @@ class DataFilterConfig(WidgetConfig):
 
     sort_by: str | None = None
     sort_dir: str = "asc"  # or "desc"
+
+    pagination: str = "offset"  # or "keyset"
+    cursor: str | None = None
+    pk_field: str = "pk"
+
+    count_strategy: str | Callable[..., Any] = "exact"
+
+    fragments: bool = False
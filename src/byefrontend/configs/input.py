@@ -7,6 +7,9 @@ class TextInputConfig(WidgetConfig):
     """
     Configuration for widgets rendering an <input> or <textarea> element and don't add their own higher-level behaviour
     fields mirror vanilla HTML attributes so the widget can add verbatim to `<input ...>` without special-casing.
+
+    - wrapper_class / trailing_html – layout hooks for widgets wrapping a text input
+      (e.g. the secret field's eye-toggle), emitted inside the wrapper `<div>` after the input
     """
 
     placeholder: str | None = None
@@ -18,3 +21,5 @@ class TextInputConfig(WidgetConfig):
     disabled: bool = False
     autocomplete: str | None = None  # e.g. "off" or "one-time-code"
     is_in_form: bool = False
+    wrapper_class: str = "text-input-wrapper"
+    trailing_html: str = ""
@@ -17,6 +17,7 @@ class TableConfig(WidgetConfig):
 
     # behaviour
     scrollable: bool = True
+    stream_chunk_rows: int = 500  # rows per chunk yielded by `TableWidget.iter_render()`
 
     # structural
     table_id: str = ""
@@ -0,0 +1,537 @@
+"""
+In-memory datasets that :class:`~byefrontend.widgets.DataFilterWidget` can
+page through without re-sorting or re-scanning a Python list per request.
+
+- `IndexedDataset`  – list of row mappings + permutation/hash/prefix/trigram indexes
+- `ColumnarDataset` – dict of NumPy arrays, vectorised masks (optional NumPy dependency)
+
+Both speak the small QuerySet subset the widget relies on (`filter`,
+`order_by`, slicing, `count`), so they are passed as
+``DataFilterConfig.data`` exactly like a QuerySet.  Build it **once** – at
+module level or in an app's ``ready()`` – and reuse it across requests::
+
+    CUSTOMERS = IndexedDataset(
+        rows,
+        sortable=("name", "credits"),   # pre-sorted permutations
+        indexed=("domain",),            # hash index: exact / in
+        searchable=("name",),           # prefix + trigram index: istartswith / icontains
+    )
+
+    def view(request):
+        data = CUSTOMERS
+        if name := request.GET.get("name"):
+            data = data.filter(name__icontains=name)  # trigram index from 3 chars on
+        cfg = DataFilterConfig(data=data, sort_by="name", ...)
+
+Indexes are built lazily on first use (thread-safe) or eagerly with `warm()`.
+Rows are treated as immutable; build a new dataset when the data changes.
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping, Sequence
+from typing import Any, Iterable, Iterator
+
+from .cache import LRURenderCache
+
+try:
+    import numpy as np
+except ImportError:  # optional: only ColumnarDataset needs it
+    np = None
+
+PK = "pk"  # pseudo-column: the row's position, the natural tie-breaker
+ORDERED_SELECTIONS = 32  # sorted filter results kept per dataset (8 bytes per matching row)
+
+_OPS = {"exact", "iexact", "in", "icontains", "istartswith", "gt", "gte", "lt", "lte"}
+_SUBSTRING_OPS = {"icontains", "istartswith"}  # "" matches everything
+
+
+def _sort_key(value):
+    # None sorts last instead of blowing up the comparison
+    return (value is None, value)
+
+
+def _trigrams(text: str) -> set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _Indexes:
+    """shared, lazily built indexes of one row list – never copied by views"""
+
+    def __init__(self, rows: Sequence[Mapping[str, Any]], sortable, indexed, searchable):
+        self.rows = rows
+        self.sortable = frozenset(sortable)
+        self.indexed = frozenset(indexed)
+        self.searchable = frozenset(searchable)
+        self._perms: dict[tuple[str, bool], array] = {}
+        self._ranks: dict[tuple[str, bool], array] = {}
+        self._hash: dict[str, dict[Any, array]] = {}
+        self._prefix: dict[str, tuple[list[str], array]] = {}
+        self._grams: dict[str, dict[str, array]] = {}
+        # filtered selections in sort order, by (filters, column, direction)
+        self.ordered = LRURenderCache(maxsize=ORDERED_SELECTIONS)
+        self._fingerprint: str | None = None
+        self._lock = threading.Lock()
+
+    def perm(self, col: str, desc: bool) -> array:
+        """row positions ordered by *col*; ties keep row order in both directions"""
+        key = (col, desc)
+        if key not in self._perms:
+            with self._lock:
+                if key not in self._perms:
+                    rows = self.rows
+                    order = sorted(range(len(rows)),
+                                   key=lambda i: _sort_key(rows[i].get(col)),
+                                   reverse=desc)
+                    self._perms[key] = array("q", order)
+        return self._perms[key]
+
+    def rank(self, col: str, desc: bool) -> array:
+        """inverse permutation: position of each row in `perm(col, desc)`"""
+        key = (col, desc)
+        if key not in self._ranks:
+            perm = self.perm(col, desc)
+            ranks = array("q", bytes(8 * len(perm)))
+            for pos, i in enumerate(perm):
+                ranks[i] = pos
+            self._ranks[key] = ranks
+        return self._ranks[key]
+
+    def hash_index(self, col: str) -> dict[Any, array]:
+        if col not in self._hash:
+            with self._lock:
+                if col not in self._hash:
+                    index: dict[Any, array] = {}
+                    for i, row in enumerate(self.rows):
+                        index.setdefault(row.get(col), array("q")).append(i)
+                    self._hash[col] = index
+        return self._hash[col]
+
+    def prefix_index(self, col: str) -> tuple[list[str], array]:
+        """(sorted lower-cased values, matching row positions) for bisect"""
+        if col not in self._prefix:
+            with self._lock:
+                if col not in self._prefix:
+                    pairs = sorted(
+                        (str(row.get(col) or "").lower(), i) for i, row in enumerate(self.rows)
+                    )
+                    self._prefix[col] = ([v for v, _ in pairs], array("q", (i for _, i in pairs)))
+        return self._prefix[col]
+
+    def gram_index(self, col: str) -> dict[str, array]:
+        if col not in self._grams:
+            with self._lock:
+                if col not in self._grams:
+                    index: dict[str, array] = {}
+                    for i, row in enumerate(self.rows):
+                        for gram in _trigrams(str(row.get(col) or "").lower()):
+                            index.setdefault(gram, array("q")).append(i)
+                    self._grams[col] = index
+        return self._grams[col]
+
+    def fingerprint(self) -> str | None:
+        if self._fingerprint is None:
+            from .configs import fingerprint
+            self._fingerprint = fingerprint(list(self.rows)) or ""  # "": rows can't be fingerprinted
+        return self._fingerprint or None
+
+
+class BaseDataset:
+    """
+    QuerySet-ish surface shared by the dataset types below. Views are cheap
+    clones that share the (immutable) storage and its indexes.
+
+    - filter(**lookups) – `col`, `col__exact`, `__iexact`, `__in`, `__icontains`,
+      `__istartswith`, `__gt/__gte/__lt/__lte`; an empty `__icontains` /
+      `__istartswith` matches every row and is skipped instead of scanned
+    - order_by(col | "-col", ["pk"]) – first key only, ties by row position
+    - [a:b] / count() / len() / iteration – only the requested page is materialised
+    """
+    _selection = None  # backend specific; None = every row
+    _ordering: tuple[str, bool] | None = None
+    _lookups: tuple = ()
+
+    def _clone(self, **changes):
+        clone = copy.copy(self)
+        for k, v in changes.items():
+            setattr(clone, f"_{k}", v)
+        return clone
+
+    def all(self):
+        return self._clone()
+
+    def filter(self, **lookups):
+        selection = self._selection
+        applied = []
+        for lookup, value in lookups.items():
+            col, _, op = lookup.rpartition("__")
+            if op not in _OPS or not col:
+                col, op = lookup, "exact"
+            if op in _SUBSTRING_OPS and value == "":
+                continue  # no-op filter, not worth an O(n) scan
+            selection = self._match(col, op, value, selection)
+            applied.append((lookup, value))
+        return self._clone(selection=selection,
+                           lookups=self._lookups + tuple(sorted(applied)))
+
+    def order_by(self, *fields: str):
+        """only the first key is used; "pk" (row position) is the implicit tie-breaker"""
+        ordering = None
+        for f in fields:
+            desc = f.startswith("-")
+            col = f.lstrip("-")
+            if col != PK:
+                ordering = (col, desc)
+                break
+        return self._clone(ordering=ordering)
+
+    @property
+    def ordered(self) -> bool:
+        return True  # row order is a stable default ordering
+
+    def count(self) -> int:
+        return len(self)
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self[0:len(self)])
+
+    def __getitem__(self, item):
+        if isinstance(item, int):
+            n = len(self)
+            pos = item + n if item < 0 else item
+            page = self[pos:pos + 1] if 0 <= pos < n else []
+            if not page:
+                raise IndexError(item)
+            return page[0]
+        start, stop, step = item.indices(len(self))
+        if step != 1:
+            raise ValueError(f"{type(self).__name__} slices do not support a step")
+        if stop <= start:
+            return []
+        return self._page(start, stop)
+
+    @property
+    def fingerprint(self) -> str | None:
+        """
+        content digest of the data + this view's filters/ordering (see
+        configs.fingerprint); *None* when the rows can't be fingerprinted
+        """
+        from .configs import fingerprint
+        data = self._data_fingerprint()
+        if data is None:
+            return None
+        return fingerprint((data, self._lookups, self._ordering))
+
+    # backend hooks
+
+    def _match(self, col: str, op: str, value, selection):
+        raise NotImplementedError
+
+    def _page(self, start: int, stop: int) -> list[Mapping[str, Any]]:
+        raise NotImplementedError
+
+    def _data_fingerprint(self) -> str | None:
+        raise NotImplementedError
+
+
+class IndexedDataset(BaseDataset):
+    """
+    Read-only wrapper around a list of row mappings. Declared columns are
+    answered from indexes, anything else falls back to a scan of the
+    current selection.
+
+    A filtered *and* sorted view is put in order once – O(k log k) for a
+    selection of k < n/8 rows, one O(n) walk of the sort permutation above
+    that – and kept for the next `ORDERED_SELECTIONS` distinct (filters, sort)
+    combinations, so every further page of it costs O(page size).
+    """
+
+    def __init__(self,
+                 rows: Iterable[Mapping[str, Any]],
+                 *,
+                 sortable: Iterable[str] = (),
+                 indexed: Iterable[str] = (),
+                 searchable: Iterable[str] = ()):
+        rows = rows if isinstance(rows, Sequence) else list(rows)
+        self._ix = _Indexes(rows, sortable, indexed, searchable)
+        self._selection: array | None = None  # ascending row positions
+
+    def warm(self) -> "IndexedDataset":
+        """build every declared index now (e.g. at start-up) instead of on first request"""
+        ix = self._ix
+        for col in ix.sortable:
+            ix.perm(col, False)
+            ix.perm(col, True)
+        for col in ix.indexed:
+            ix.hash_index(col)
+        for col in ix.searchable:
+            ix.prefix_index(col)
+            ix.gram_index(col)
+        return self
+
+    def __len__(self) -> int:
+        sel = self._selection
+        return len(self._ix.rows) if sel is None else len(sel)
+
+    def _data_fingerprint(self) -> str | None:
+        return self._ix.fingerprint()
+
+    def _page(self, start: int, stop: int) -> list[Mapping[str, Any]]:
+        rows = self._ix.rows
+        return [rows[i] for i in self._positions(start, stop)]
+
+    def _positions(self, start: int, stop: int) -> Sequence[int]:
+        """row positions for [start:stop] of the current selection & ordering"""
+        sel = self._selection
+        if self._ordering is None:
+            return range(start, stop) if sel is None else sel[start:stop]
+
+        col, desc = self._ordering
+        if sel is None:
+            return self._ix.perm(col, desc)[start:stop]
+        return self._ordered_selection(col, desc)[start:stop]
+
+    def _ordered_selection(self, col: str, desc: bool) -> array:
+        """
+        the current selection in (col, desc) order. sorted once per (filters,
+        sort) and kept in `_Indexes.ordered`, so later pages are O(page size)
+        """
+        from .configs import fingerprint
+        key = fingerprint((self._lookups, col, desc))  # None: unhashable filter values
+        ordered = None if key is None else self._ix.ordered.get(key)
+        if ordered is None:
+            ordered = self._sort_selection(col, desc)
+            if key is not None:
+                self._ix.ordered.set(key, ordered)
+        return ordered
+
+    def _sort_selection(self, col: str, desc: bool) -> array:
+        sel = self._selection
+        perm = self._ix.perm(col, desc)
+        if len(sel) * 8 < len(perm):
+            # small selection: sort it by rank – O(k log k), independent of n
+            rank = self._ix.rank(col, desc)
+            return array("q", sorted(sel, key=rank.__getitem__))
+
+        # large selection: one walk of the permutation – O(n)
+        member = bytearray(len(perm))
+        for i in sel:
+            member[i] = 1
+        return array("q", (i for i in perm if member[i]))
+
+    def _match(self, col: str, op: str, value, selection: array | None) -> array:
+        ix = self._ix
+        found: Iterable[int] | None = None
+
+        if op in {"exact", "in"} and col in ix.indexed:
+            index = ix.hash_index(col)
+            values = value if op == "in" else (value,)
+            found = sorted(i for v in values for i in index.get(v, ()))
+        elif op == "istartswith" and col in ix.searchable:
+            keys, positions = ix.prefix_index(col)
+            needle = str(value).lower()
+            lo = bisect_left(keys, needle)
+            hi = bisect_left(keys, needle + "\U0010ffff")
+            found = sorted(positions[lo:hi])
+        elif op == "icontains" and col in ix.searchable and len(str(value)) >= 3:
+            needle = str(value).lower()
+            grams = ix.gram_index(col)
+            postings = sorted((grams.get(g, array("q")) for g in _trigrams(needle)), key=len)
+            candidates = set(postings[0])
+            for p in postings[1:]:
+                candidates.intersection_update(p)
+            rows = ix.rows
+            found = sorted(i for i in candidates if needle in str(rows[i].get(col) or "").lower())
+
+        if found is not None:
+            if selection is not None:
+                keep = set(selection)
+                found = [i for i in found if i in keep]
+            return array("q", found)
+
+        # no index for this lookup -> scan the current selection
+        rows = ix.rows
+        test = _predicate(op, value)
+        candidates = range(len(rows)) if selection is None else selection
+        return array("q", (i for i in candidates if test(rows[i].get(col))))
+
+
+def _predicate(op: str, value):
+    if op == "exact":
+        return lambda v: v == value
+    if op == "in":
+        values = set(value)
+        return lambda v: v in values
+    if op == "iexact":
+        needle = str(value).lower()
+        return lambda v: str(v or "").lower() == needle
+    if op == "icontains":
+        needle = str(value).lower()
+        return lambda v: needle in str(v or "").lower()
+    if op == "istartswith":
+        needle = str(value).lower()
+        return lambda v: str(v or "").lower().startswith(needle)
+    compare = {
+        "gt": lambda v: v is not None and v > value,
+        "gte": lambda v: v is not None and v >= value,
+        "lt": lambda v: v is not None and v < value,
+        "lte": lambda v: v is not None and v <= value,
+    }
+    return compare[op]
+
+
+# ── columnar (NumPy) backend ────────────────────────────────────────────────
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "ColumnarDataset needs NumPy: pip install 'byefrontend[columnar]'"
+        )
+    return np
+
+
+class _Columns:
+    """shared column storage + lazily built permutations / lower-cased text"""
+
+    def __init__(self, columns: Mapping[str, Any]):
+        self.arrays = {name: np.asarray(values) for name, values in columns.items()}
+        lengths = {len(a) for a in self.arrays.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"ColumnarDataset columns differ in length: {sorted(lengths)}")
+        self.size = lengths.pop() if lengths else 0
+        self.names = tuple(self.arrays)
+        self._perms: dict[tuple[str, bool], Any] = {}
+        self._lower: dict[str, Any] = {}
+        # filtered selections in sort order, by (filters, column, direction)
+        self.ordered = LRURenderCache(maxsize=ORDERED_SELECTIONS)
+        self._fingerprint: str | None = None
+        self._lock = threading.Lock()
+
+    def perm(self, col: str, desc: bool):
+        """stable argsort; ties keep row order in both directions"""
+        key = (col, desc)
+        if key not in self._perms:
+            with self._lock:
+                if key not in self._perms:
+                    values = self.arrays[col]
+                    if desc:
+                        # stable descending: sort the reversed column, flip, map back
+                        rev = np.argsort(values[::-1], kind="stable")[::-1]
+                        order = (self.size - 1) - rev
+                    else:
+                        order = np.argsort(values, kind="stable")
+                    self._perms[key] = order
+        return self._perms[key]
+
+    def lower(self, col: str):
+        if col not in self._lower:
+            with self._lock:
+                if col not in self._lower:
+                    self._lower[col] = np.char.lower(self.arrays[col].astype(str))
+        return self._lower[col]
+
+    def fingerprint(self) -> str | None:
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            for name, values in self.arrays.items():
+                h.update(f"{name}:{values.dtype.str}:{values.shape}".encode())
+                if values.dtype.hasobject:
+                    from .configs import fingerprint
+                    fp = fingerprint(values.tolist())
+                    if fp is None:
+                        self._fingerprint = ""  # objects without a stable identity
+                        break
+                    h.update(fp.encode())
+                else:
+                    h.update(np.ascontiguousarray(values).tobytes())
+            else:
+                self._fingerprint = h.hexdigest()
+        return self._fingerprint or None
+
+
+class ColumnarDataset(BaseDataset):
+    """
+    Dataset stored as a dict of equally long NumPy arrays (``pip install
+    byefrontend[columnar]``). Filters are vectorised boolean masks, sorting
+    uses cached stable `argsort` permutations and a page is one fancy-index
+    per column – row dicts are only built for the rows actually rendered::
+
+        SALES = ColumnarDataset({"region": regions, "amount": amounts})
+        data = SALES.filter(amount__gte=100).order_by("-amount")
+
+    NULLs are not special-cased: use NaN for floats and keep object columns
+    free of None if they are sorted.
+    """
+
+    def __init__(self, columns: Mapping[str, Any]):
+        _require_numpy()
+        self._cols = _Columns(columns)
+        self._selection = None  # boolean mask over all rows
+        self._size: int | None = None
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]], columns: Sequence[str] | None = None):
+        rows = list(rows)
+        if columns is None:
+            columns = list(rows[0]) if rows else []
+        return cls({c: [r.get(c) for r in rows] for c in columns})
+
+    def _clone(self, **changes):
+        clone = super()._clone(**changes)
+        if "selection" in changes:
+            clone._size = None
+        return clone
+
+    def __len__(self) -> int:
+        if self._size is None:
+            sel = self._selection
+            self._size = self._cols.size if sel is None else int(np.count_nonzero(sel))
+        return self._size
+
+    def _data_fingerprint(self) -> str | None:
+        return self._cols.fingerprint()
+
+    def _match(self, col: str, op: str, value, selection):
+        cols = self._cols
+        values = cols.arrays[col]
+        if op == "exact":
+            mask = values == value
+        elif op == "in":
+            mask = np.isin(values, list(value))
+        elif op == "iexact":
+            mask = cols.lower(col) == str(value).lower()
+        elif op == "icontains":
+            mask = np.char.find(cols.lower(col), str(value).lower()) >= 0
+        elif op == "istartswith":
+            mask = np.char.startswith(cols.lower(col), str(value).lower())
+        elif op == "gt":
+            mask = values > value
+        elif op == "gte":
+            mask = values >= value
+        elif op == "lt":
+            mask = values < value
+        else:  # lte
+            mask = values <= value
+        mask = np.asarray(mask, dtype=bool)
+        return mask if selection is None else selection & mask
+
+    def _page(self, start: int, stop: int) -> list[Mapping[str, Any]]:
+        sel = self._selection
+        if self._ordering is None:
+            idx = np.arange(start, stop) if sel is None else np.flatnonzero(sel)[start:stop]
+        else:
+            perm = self._cols.perm(*self._ordering)
+            idx = perm[start:stop] if sel is None else perm[sel[perm]][start:stop]
+
+        names = self._cols.names
+        # .tolist() hands back plain Python scalars – templates & fingerprints expect those
+        columns = [self._cols.arrays[name][idx].tolist() for name in names]
+        return [dict(zip(names, values)) for values in zip(*columns)]
@@ -0,0 +1,80 @@
+"""
+Deterministic HTML ids for widgets.
+
+An id is derived from *where* the widget sits in the tree and *what kind* of
+widget it is – never from its content, so it costs O(1) however much data
+a table holds, and stays put while a DataFilter pages or filters:
+
+- child widgets  -> parent id + class + config name + occurrence among the
+                    parent's children with that same class and name
+- root widgets   -> class + config name + occurrence on the page
+
+The page-level occurrence comes from a request-scoped counter (`id_scope()`,
+installed per request by :class:`byefrontend.middleware.WidgetIdScopeMiddleware`).
+Identical trees built in identical order therefore render byte-identical HTML,
+which is what the render cache, fragment caches and ETags need.
+
+Outside of any scope a process-wide counter is used: ids stay unique, but are
+no longer reproducible between requests.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+ID_PREFIX = "bfe-"
+DIGEST_SIZE = 6  # bytes -> 12 hex chars, plenty for one page
+
+_scope: ContextVar[Counter | None] = ContextVar("bfe_id_scope", default=None)
+_process_counter: Counter = Counter()
+_process_lock = threading.Lock()
+
+
+def derive_id(*parts: object) -> str:
+    """short, html-safe id (always starts with a letter) derived from *parts*"""
+    raw = "\x1f".join(str(p) for p in parts).encode("utf-8", "surrogatepass")
+    return ID_PREFIX + hashlib.blake2b(raw, digest_size=DIGEST_SIZE).hexdigest()
+
+
+def page_sequence(key: str) -> int:
+    """
+    Return how many times *key* was requested before in the active scope
+    (0, 1, 2, …).  Used when uniqueness on the page is all that matters.
+    """
+    counter = _scope.get()
+    if counter is not None:
+        n = counter[key]
+        counter[key] = n + 1
+        return n
+    with _process_lock:
+        n = _process_counter[key]
+        _process_counter[key] = n + 1
+    return n
+
+
+def peek_sequence(key: str) -> int | None:
+    """
+    What the next `page_sequence(key)` would return, without consuming it.
+    *None* outside of any scope, where sequence numbers are not reproducible.
+    """
+    counter = _scope.get()
+    return None if counter is None else counter[key]
+
+
+@contextmanager
+def id_scope() -> Iterator[None]:
+    """
+    Fresh page-level counter for the duration of the block, e.g. one request:
+
+    >>> with id_scope():
+    ...     navbar = NavBarWidget(config=cfg)
+    """
+    token = _scope.set(Counter())
+    try:
+        yield
+    finally:
+        _scope.reset(token)
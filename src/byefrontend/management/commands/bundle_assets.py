@@ -0,0 +1,38 @@
+"""
+Builds the page asset bundles ahead of time (see byefrontend.bundling).
+
+    manage.py bundle_assets                          # rebuild every set in the manifest
+    manage.py bundle_assets myapp.views.HOME_NAVBAR  # + the sets these page roots need
+    manage.py bundle_assets --clear                  # drop the old bundles first
+
+Roots are dotted paths (see byefrontend.management.roots).  Run it after
+``collectstatic`` on deploy so no request has to build a bundle.
+"""
+from django.core.management.base import BaseCommand
+
+from ...bundling import BUNDLE_DIR, bundle_paths, rebuild_manifest
+from ...render import collect_asset_paths
+from ..roots import load_roots
+
+
+class Command(BaseCommand):
+    help = "Concatenate + minify BFE widget CSS/JS into content-hashed bundles under STATIC_ROOT."
+
+    def add_arguments(self, parser):
+        parser.add_argument("roots", nargs="*", help="dotted paths to page widgets / forms (or callables returning them)")
+        parser.add_argument("--clear", action="store_true", help="delete existing bundles before building")
+
+    def handle(self, *args, roots=(), clear=False, **options):
+        components = load_roots(roots)
+
+        built = set(rebuild_manifest(clear=clear))
+        for component in components:
+            css, js = collect_asset_paths(component)
+            for path in (*bundle_paths("css", css), *bundle_paths("js", js)):
+                if path.startswith(f"{BUNDLE_DIR}/"):
+                    built.add(path)
+
+        bundles = sorted(built)
+        for path in bundles:
+            self.stdout.write(path)
+        self.stdout.write(self.style.SUCCESS(f"{len(bundles)} bundle(s) ready"))
@@ -0,0 +1,34 @@
+"""
+Writes compressed siblings of the BFE assets under STATIC_ROOT (see
+byefrontend.compression).  Run it after ``collectstatic`` (and
+``bundle_assets`` / ``generate_css``) on deploy:
+
+    manage.py compress_assets                    # .gz
+    manage.py compress_assets --codec gzip --codec br
+    manage.py compress_assets --minify --force   # compress minified copies
+
+The collected files themselves are left as they are.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from ...compression import CODECS, compress_assets
+
+
+class Command(BaseCommand):
+    help = "Precompress BFE CSS/JS under STATIC_ROOT (.gz, optionally .zst / .br)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--codec", action="append", dest="codecs", choices=sorted(CODECS),
+                            help="codec to write (repeatable, default: gzip)")
+        parser.add_argument("--minify", action="store_true",
+                            help="compress minified copies (breaks integrity= on those files)")
+        parser.add_argument("--force", action="store_true", help="recompress up-to-date files too")
+
+    def handle(self, *args, codecs=None, minify=False, force=False, **options):
+        try:
+            written = compress_assets(codecs=codecs or ("gzip",), minify=minify, force=force)
+        except ValueError as exc:  # no STATIC_ROOT / unknown codec
+            raise CommandError(str(exc)) from exc
+        for path in written:
+            self.stdout.write(str(path))
+        self.stdout.write(self.style.SUCCESS(f"{len(written)} compressed file(s) written"))
@@ -0,0 +1,25 @@
+"""
+Page roots for the asset commands (``bundle_assets``, ``generate_css``).
+
+A root is a dotted path to a widget config, widget or form, or to a callable
+returning one (or a list / tuple of them).
+"""
+from django.core.management.base import CommandError
+from django.utils.module_loading import import_string
+
+from ..builders import ChildBuilderRegistry
+from ..configs import WidgetConfig
+
+
+def load_roots(dotted_paths) -> list:
+    components = []
+    for dotted in dotted_paths:
+        try:
+            root = import_string(dotted)
+        except ImportError as exc:
+            raise CommandError(f"Cannot import {dotted!r}: {exc}") from exc
+        if callable(root):
+            root = root()
+        for item in root if isinstance(root, (list, tuple)) else (root,):
+            components.append(ChildBuilderRegistry.build(item) if isinstance(item, WidgetConfig) else item)
+    return components
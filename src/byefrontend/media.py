@@ -0,0 +1,138 @@
+"""
+Static media (CSS / JS) collection for widget trees.
+
+Django's ``Media.__add__`` re-runs its ordering resolution on every merge,
+which gets expensive when a big navbar or form folds dozens of children into
+one `Media`.  Widget media here is mostly static per *class*, so:
+
+- `class_media(cls)` reads a class's inner ``Media`` once per class
+- `tree_media(widget)` walks the tree once and unions the class media in
+  depth-first order (first occurrence wins) – no config or table data is
+  ever hashed. A tree-wide memo would need a key built by walking the same
+  tree, so the result is kept per root instance instead (`BFEBaseWidget.media`)
+
+Widgets whose media is dynamic (``static_media = False``: they override
+``media`` or ``_compute_media``, e.g. forms or the file upload) are asked
+for their own `media` instead.
+
+`static_url(path)` turns a collected path into its URL through the
+configured static files storage – so ``ManifestStaticFilesStorage`` hashed
+names and CDN ``STATIC_URL``s apply – remembering each answer per process.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from functools import cache
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.forms.widgets import Media
+
+_urls: dict[str, str] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class MediaSet:
+    """
+    ordered, de-duplicated static files
+    - css – ((medium, path), …)
+    - js  – (path, …)
+    """
+    css: tuple[tuple[str, str], ...] = ()
+    js: tuple[str, ...] = ()
+
+    @classmethod
+    def from_media(cls, media: Media) -> "MediaSet":
+        css = tuple((medium, path) for medium, paths in media._css.items() for path in paths)
+        return cls(css, tuple(media._js))
+
+    def css_for(self, medium: str = "all") -> tuple[str, ...]:
+        return tuple(path for m, path in self.css if m == medium)
+
+    def to_media(self) -> Media:
+        css: dict[str, list[str]] = {}
+        for medium, path in self.css:
+            css.setdefault(medium, []).append(path)
+        return Media(css=css, js=list(self.js))
+
+
+@cache
+def class_media(cls) -> MediaSet:
+    """a widget class's own inner ``Media``, read once per class"""
+    declared = getattr(cls, "Media", None)
+    css = getattr(declared, "css", None) or {}
+    js = getattr(declared, "js", None) or ()
+    return MediaSet(
+        tuple((medium, path) for medium, paths in css.items() for path in paths),
+        tuple(js),
+    )
+
+
+def tree_media(widget) -> MediaSet:
+    """class media of *widget* + everything below it, ordered & de-duplicated"""
+    css: dict[tuple[str, str], None] = dict.fromkeys(class_media(type(widget)).css)
+    js: dict[str, None] = dict.fromkeys(class_media(type(widget)).js)
+    for child in widget.children.values():
+        _walk(child, css, js)
+    return MediaSet(tuple(css), tuple(js))
+
+
+def collect(component) -> MediaSet:
+    """media of any widget: the tree walk, or its own `media` when that is dynamic"""
+    if _has_static_media(component):
+        return tree_media(component)
+    return MediaSet.from_media(component.media)
+
+
+def _walk(node, css: dict, js: dict) -> None:
+    if not _has_static_media(node):
+        if hasattr(node, "media"):
+            own = MediaSet.from_media(node.media)
+            css.update(dict.fromkeys(own.css))
+            js.update(dict.fromkeys(own.js))
+        return
+    own = class_media(type(node))
+    css.update(dict.fromkeys(own.css))
+    js.update(dict.fromkeys(own.js))
+    for child in node.children.values():
+        _walk(child, css, js)
+
+
+def _has_static_media(node) -> bool:
+    return getattr(node, "static_media", False) and hasattr(node, "_cache_identity")
+
+
+def static_url(path: str) -> str:
+    """
+    URL of a static *path* via ``staticfiles_storage.url()``; absolute paths
+    and URLs pass through like in `django.forms.Media`.  A path the storage
+    can't resolve (not in the manifest yet, e.g. a bundle written after
+    ``collectstatic``) falls back to plain ``STATIC_URL + path``.
+    """
+    try:
+        return _urls[path]
+    except KeyError:
+        pass
+    if path.startswith(("http://", "https://", "/")):
+        url = path
+    else:
+        try:
+            url = staticfiles_storage.url(path)
+        except ValueError:  # ManifestStaticFilesStorage: missing manifest entry
+            url = urljoin(settings.STATIC_URL or "/", path)
+    _urls[path] = url
+    return url
+
+
+def reset_static_urls() -> None:
+    """forget resolved URLs (tests, settings changes, a new manifest)"""
+    _urls.clear()
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(*, setting, **kwargs):
+    if setting in {"STATIC_URL", "STATIC_ROOT", "STORAGES", "STATICFILES_STORAGE"}:
+        reset_static_urls()
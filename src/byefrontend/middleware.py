@@ -0,0 +1,49 @@
+from django.conf import settings
+
+from .compression import serve_precompressed
+from .ids import id_scope
+
+
+class WidgetIdScopeMiddleware:
+    """
+    Opens a fresh widget-id scope for every request so root widgets get the
+    same ids on every render of the same page.
+
+    MIDDLEWARE = [
+        ...
+        "byefrontend.middleware.WidgetIdScopeMiddleware",
+    ]
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with id_scope():
+            return self.get_response(request)
+
+
+class PrecompressedStaticMiddleware:
+    """
+    Serves the ``.br`` / ``.zst`` / ``.gz`` siblings written by
+    ``manage.py compress_assets`` for requests under ``STATIC_URL`` when the
+    client accepts them – for deployments without a proxy that does this
+    itself.  Everything else (no sibling, not accepted) falls through to the
+    usual static serving.
+
+    MIDDLEWARE = [
+        "byefrontend.middleware.PrecompressedStaticMiddleware",
+        ...
+    ]
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        prefix = settings.STATIC_URL or ""
+        if request.method in ("GET", "HEAD") and prefix.startswith("/") and request.path.startswith(prefix):
+            response = serve_precompressed(request, request.path[len(prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
@@ -0,0 +1,205 @@
+"""
+Helpers shared by paginated widgets (currently :class:`DataFilterWidget`).
+
+Keyset ("cursor") pagination
+----------------------------
+Instead of ``OFFSET n`` the next page is fetched with
+``WHERE (sort, pk) > (last_sort, last_pk)``, so page 1000 costs the same as
+page 1.  The position is carried in an opaque, url-safe ``cursor=`` token:
+
+    {"d": "next" | "prev" | "last", "v": <sort value>, "k": <pk>}
+
+Tokens are signed with ``SECRET_KEY`` (`django.core.signing`); a forged or
+mangled one decodes to *None* and the widget shows the first page.  The
+widget also checks ``v`` / ``k`` against the model fields before they reach
+a query, so a bad value never turns into a 500.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+from dataclasses import dataclass
+from typing import Any
+
+from django.core import signing
+
+CURSOR_PARAM = "cursor"
+
+NEXT, PREV, LAST = "next", "prev", "last"
+
+_CURSOR_SALT = "byefrontend.pagination.cursor"
+
+
+def encode_cursor(direction: str, value: Any = None, pk: Any = None) -> str:
+    payload = {"d": direction}
+    if direction != LAST:
+        payload["v"] = _jsonable(value)
+        payload["k"] = _jsonable(pk)
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    token = base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+    return signing.Signer(salt=_CURSOR_SALT).sign(token)
+
+
+def decode_cursor(token: str | None) -> dict | None:
+    """payload dict, or *None* for a missing / malformed / unsigned token (-> first page)"""
+    if not token:
+        return None
+    try:
+        token = signing.Signer(salt=_CURSOR_SALT).unsign(token)
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+    except (signing.BadSignature, binascii.Error, ValueError):
+        return None
+    if not isinstance(payload, dict) or payload.get("d") not in {NEXT, PREV, LAST}:
+        return None
+    if payload["d"] != LAST and not {"v", "k"} <= payload.keys():
+        return None
+    return payload
+
+
+def _jsonable(value: Any) -> Any:
+    """sort keys the ORM understands again when passed back as strings"""
+    if isinstance(value, (datetime.date, datetime.time)):  # datetime is a date
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+# ── count strategies ────────────────────────────────────────────────────────
+#
+# A strategy is any callable ``(data, *, query_dict) -> CountResult``.
+# `DataFilterConfig.count_strategy` takes one of the names below or an
+# instance (e.g. ``CappedCount(cap=5000)``).  They are frozen dataclasses so
+# they have a stable repr and therefore a stable config fingerprint.
+
+
+@dataclass(frozen=True, slots=True)
+class CountResult:
+    """
+    - total – rows (exact, lower bound or estimate – see *kind*)
+    - kind  – "exact" | "capped" (at least *total*) | "estimated" (planner guess)
+    """
+    total: int
+    kind: str = "exact"
+
+    @property
+    def exact(self) -> bool:
+        return self.kind == "exact"
+
+
+@dataclass(frozen=True, slots=True)
+class ExactCount:
+    """`len()` for sequences, one `COUNT(*)` for QuerySets"""
+
+    def __call__(self, data, *, query_dict=None) -> CountResult:
+        return CountResult(_exact(data))
+
+
+@dataclass(frozen=True, slots=True)
+class CachedCount:
+    """
+    Exact count remembered for *ttl* seconds in a Django cache, keyed on the
+    normalised filter query-string (minus page/cursor) and the query itself.
+    """
+    ttl: int = 60
+    alias: str = "default"
+
+    def __call__(self, data, *, query_dict=None) -> CountResult:
+        if not hasattr(data, "query"):  # in-memory: len() is already O(1)
+            return CountResult(_exact(data))
+
+        from django.core.cache import caches
+        from django.core.exceptions import EmptyResultSet
+        from .cache import make_key
+
+        try:
+            sql = str(data.order_by().query)
+        except EmptyResultSet:  # `filter(pk__in=[])` – nothing to count
+            return CountResult(0)
+        params = sorted(
+            (k, tuple(v)) for k, v in (query_dict.lists() if query_dict is not None else ())
+            if k not in {"page", CURSOR_PARAM}
+        )
+        # keyed on the SQL on purpose: a count *may* lag for ttl seconds
+        key = "bfe-count:" + make_key(data.model._meta.label, sql, params)
+        cache = caches[self.alias]
+        total = cache.get(key)
+        if total is None:
+            total = data.count()
+            cache.set(key, total, self.ttl)
+        return CountResult(total)
+
+
+@dataclass(frozen=True, slots=True)
+class CappedCount:
+    """
+    Count at most *cap* rows (``SELECT COUNT(*) FROM (… LIMIT cap + 1)``);
+    the pager then shows "50+" pages instead of an exact total.
+    """
+    cap: int = 1000
+
+    def __call__(self, data, *, query_dict=None) -> CountResult:
+        if hasattr(data, "query"):
+            seen = data[:self.cap + 1].count()
+        else:
+            seen = _exact(data)
+        if seen > self.cap:
+            return CountResult(self.cap, "capped")
+        return CountResult(seen)
+
+
+@dataclass(frozen=True, slots=True)
+class EstimatedCount:
+    """
+    Row estimate from the database planner (PostgreSQL ``EXPLAIN``), exact
+    count everywhere else and whenever the estimate is below *exact_below*
+    (small results are cheap to count and users notice when they are wrong).
+    """
+    exact_below: int = 10_000
+
+    def __call__(self, data, *, query_dict=None) -> CountResult:
+        estimate = _planner_estimate(data) if hasattr(data, "query") else None
+        if estimate is None or estimate < self.exact_below:
+            return CountResult(_exact(data))
+        return CountResult(estimate, "estimated")
+
+
+COUNT_STRATEGIES = {
+    "exact": ExactCount(),
+    "cached": CachedCount(),
+    "capped": CappedCount(),
+    "estimated": EstimatedCount(),
+}
+
+
+def get_count_strategy(strategy):
+    """resolve a name from `COUNT_STRATEGIES` or pass a callable through"""
+    if callable(strategy):
+        return strategy
+    try:
+        return COUNT_STRATEGIES[strategy]
+    except KeyError as exc:
+        raise ValueError(
+            f"Unknown count strategy {strategy!r}; choose from {sorted(COUNT_STRATEGIES)}"
+        ) from exc
+
+
+def _exact(data) -> int:
+    return data.count() if hasattr(data, "order_by") else len(data)
+
+
+def _planner_estimate(qs) -> int | None:
+    from django.db import connections
+
+    if connections[qs.db].vendor != "postgresql":
+        return None
+    try:
+        plan = json.loads(qs.order_by().explain(format="json"))
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except Exception:  # planner output is best-effort by definition
+        return None
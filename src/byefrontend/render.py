@@ -1,27 +1,53 @@
+import os
+import re
+from collections import Counter
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
 from django.forms import Form, ModelForm
+from django.http import HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from django.utils.translation import get_language
+from django.template.loader import get_template, render_to_string
 from django.utils.html import format_html_join
+from django.utils.safestring import mark_safe
 from django.shortcuts import render
 from django.forms.widgets import Media
 from collections.abc import Iterable
 from django.middleware.csrf import get_token
+from .bundling import bundle_paths, bundling_enabled
+from .cache import make_key
+from .configs import fingerprint
+from .media import collect, static_url
+from .stylesheet import generated_css_enabled, use_generated_css
+from .trees import BoundWidget
+from .widgets.base import BFEBaseWidget
 
 
 def collect_media(component, all_css, all_js):
     """
     Recursively collects media assets from a component and its children.
 
+    Files are collected as declared in the widgets' ``Media`` (static paths
+    such as ``byefrontend/css/navbar.css``); `static_url` turns them into URLs.
+
     Parameters:
     - component: The component to collect media from.
-    - all_css: A set to collect CSS files.
-    - all_js: A set to collect JS files.
+    - all_css: A set to collect CSS files (`OrderedAssets` keeps first-seen order).
+    - all_js: A set to collect JS files (likewise).
     """
+    # bfe widgets: one memoised walk over the whole tree (see byefrontend.media)
+    if isinstance(component, BFEBaseWidget):
+        media_set = collect(component)
+        all_css.update(media_set.css_for("all"))
+        all_js.update(media_set.js)
+        return
+
     # Get media from the component
     if hasattr(component, 'media'):
         media = component.media
-        for css in media._css.get('all', []):
-            all_css.add(f"/static/{css}")
-        for js in media._js:
-            all_js.add(f"/static/{js}")
+        all_css.update(media._css.get('all', []))
+        all_js.update(media._js)
 
     # If component is a form, get media from its fields
     if isinstance(component, (Form, ModelForm)):
@@ -42,6 +68,58 @@ def collect_media(component, all_css, all_js):
             collect_media(nested_component, all_css, all_js)
 
 
+class OrderedAssets:
+    """
+    insertion-ordered set with the `add` / `update` collect_media uses, so
+    tags come out in the same (depth-first, first-seen) order in every process
+    """
+    __slots__ = ("_items",)
+
+    def __init__(self, items=()):
+        self._items = dict.fromkeys(items)
+
+    def add(self, item):
+        self._items[item] = None
+
+    def update(self, items):
+        self._items.update(dict.fromkeys(items))
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+
+def collect_asset_paths(*components):
+    """(css paths, js paths) needed by *components*, ``root.css`` first, in page order"""
+    all_css = OrderedAssets(['byefrontend/css/root.css'])
+    all_js = OrderedAssets()
+
+    for component in components:
+        collect_media(component, all_css, all_js)
+    return list(all_css), list(all_js)
+
+
+def page_assets(*components):
+    """
+    (css urls, js urls) of `collect_asset_paths`, with the generated
+    stylesheet swapped in when ``BFE_GENERATED_CSS`` is on, folded into
+    bundles when ``BFE_ASSET_BUNDLING`` is on and resolved through the static
+    files storage (hashed names, CDN prefix – see `static_url`)
+    """
+    all_css, all_js = collect_asset_paths(*components)
+    if generated_css_enabled():
+        all_css = use_generated_css(all_css)
+    if bundling_enabled():
+        all_css = bundle_paths("css", all_css)
+        all_js = bundle_paths("js", all_js)
+    return [static_url(css) for css in all_css], [static_url(js) for js in all_js]
+
+
 def aggregate_media(*components):
     """
     Aggregates CSS and JS media from a list of components (forms, widgets, etc.).
@@ -49,17 +127,16 @@ def aggregate_media(*components):
     Parameters:
     - components: A list of components.
 
+    With ``settings.BFE_ASSET_BUNDLING`` on, the files are folded into one
+    CSS and one JS bundle (see byefrontend.bundling).
+
     Returns:
     - A tuple containing two strings: the first with <link> tags for CSS, the second with <script> tags for JS.
     """
-    # todo: documentation update
-    all_css = set()
-    all_js = set()
-    all_css.add('/static/byefrontend/css/root.css')
+    return _asset_tags(*page_assets(*components))
 
-    for component in components:
-        collect_media(component, all_css, all_js)
 
+def _asset_tags(all_css, all_js):
     css_links = format_html_join(
         '\n',
         '<link href="{0}" media="all" as="style" rel="preload" onload="this.rel=\'stylesheet\'">',
@@ -74,7 +151,106 @@ def aggregate_media(*components):
     return css_links, js_scripts
 
 
-def render_with_automatic_static(request, template_name, context=None):
+def asset_link_headers(*components):
+    """
+    ``{"Link": "</static/…>; rel=preload; as=style, …"}`` for the assets of
+    *components* (empty dict when there are none).  The same headers can be
+    sent ahead of the page as a 103 Early Hints response by servers / proxies
+    that support it – browsers then fetch widget CSS/JS before the HTML body.
+    """
+    return _link_headers(*page_assets(*components))
+
+
+def _link_headers(all_css, all_js):
+    links = [f"<{css}>; rel=preload; as=style" for css in all_css]
+    links += [f"<{js}>; rel=preload; as=script" for js in all_js]
+    return {"Link": ", ".join(links)} if links else {}
+
+
+def _page_components(context):
+    """the context items that bring media"""
+    return [item for item in (context or {}).values()
+            if hasattr(item, 'media') or hasattr(item, 'children') or isinstance(item, (Form, ModelForm))]
+
+
+def _context_with_media(request, context, assets=None):
+    """
+    shared by the render helpers: CSRF cookie + `all_css` / `all_js` in
+    *context*; returns ``(context, preload headers)``
+    """
+    get_token(request)
+    if context is None:
+        context = {}
+    if assets is None:
+        assets = page_assets(*_page_components(context))
+
+    context['all_css'], context['all_js'] = _asset_tags(*assets)
+    return context, _link_headers(*assets)
+
+
+def _add_preload_headers(response, links, preload_headers):
+    if preload_headers is None:
+        preload_headers = getattr(settings, "BFE_PRELOAD_HEADERS", False)
+    if preload_headers:
+        for header, value in links.items():
+            response[header] = value
+
+
+_PLAIN_VALUES = (str, int, float, bool, type(None))
+
+
+def page_etag(template_name, context=None, assets=None):
+    """
+    Strong ETag for the page *template_name* renders from *context*, derived
+    without rendering anything, or *None* when the context holds something
+    whose output can't be known up front (a form, a request-bound widget, a
+    widget over a QuerySet or other unfingerprintable data – see
+    configs._fingerprint –, an arbitrary object …).
+
+    It covers the widget trees' identities (class, config fingerprint, ids,
+    children) and bound state, plain context values, the asset URLs, the
+    template file (name + mtime) and the active language.  Anything the
+    *template itself* pulls from the request (``{{ user }}``, messages …) is
+    not covered – only turn conditional rendering on for pages that don't.
+    """
+    context = context or {}
+    parts = []
+    for key, item in context.items():
+        if isinstance(item, BoundWidget):
+            widget, state = item.widget, sorted(item.state.items())
+        else:
+            widget, state = item, ()
+        if isinstance(widget, BFEBaseWidget):
+            # not cacheable covers QuerySet data: same SQL, different rows -> never a 304
+            if not widget._is_cacheable() or fingerprint(state) is None:
+                return None
+            parts.append((key, type(widget).__qualname__, widget._cache_identity(), state))
+        elif isinstance(item, _PLAIN_VALUES):
+            parts.append((key, item))
+        else:
+            return None
+    if assets is None:
+        assets = page_assets(*_page_components(context))
+    return quote_etag(make_key("page", template_name, _template_stamp(template_name),
+                               get_language(), parts, assets))
+
+
+def _template_stamp(template_name):
+    """(origin, mtime) of the template file, so editing it changes the ETag"""
+    template = get_template(template_name)
+    origin = getattr(getattr(template, "template", template), "origin", None)
+    name = getattr(origin, "name", None)
+    try:
+        return name, os.stat(name).st_mtime_ns
+    except (TypeError, OSError):  # not loaded from a file
+        return name, None
+
+
+FRAGMENT_HEADER = "X-BFE-Fragment"
+
+
+def render_with_automatic_static(request, template_name, context=None, *, preload_headers=None,
+                                 conditional=None):
     """
     Renders the template with automatic inclusion of CSS and JS media assets.
 
@@ -82,19 +258,149 @@ def render_with_automatic_static(request, template_name, context=None):
     - request: The HTTP request object.
     - template_name: The name of the template to render.
     - context: The context dictionary for the template.
+    - preload_headers: add a ``Link: rel=preload`` header for the page's
+      CSS/JS (see `asset_link_headers()`); defaults to ``settings.BFE_PRELOAD_HEADERS``.
+    - conditional: send an ``ETag`` (see `page_etag()`) and answer a matching
+      ``If-None-Match`` with a 304 before any widget renders; defaults to
+      ``settings.BFE_CONDITIONAL_RENDER``.  Pages whose context can't be
+      fingerprinted are rendered as usual, without an ETag.
+
+    Requests carrying the ``X-BFE-Fragment`` header are answered with just the
+    fragment of the widget in *context* whose region id it names, or a 400
+    when none does.
 
     Returns:
     - An HttpResponse object with the rendered template.
     """
-    get_token(request)
-    if context is None:
-        context = {}
-    all_components = []
-    for item in context.values():
-        if hasattr(item, 'media') or hasattr(item, 'children') or isinstance(item, (Form, ModelForm)):
-            all_components.append(item)
-    all_css, all_js = aggregate_media(*all_components)
-
-    context['all_css'] = all_css
-    context['all_js'] = all_js
-    return render(request, template_name, context)
+    fragment_widgets = _fragment_widgets(context)
+    if fragment_widgets:
+        target = request.headers.get(FRAGMENT_HEADER)
+        if target:
+            widget = _pick_fragment(fragment_widgets, target)
+            if widget is None:  # stale / foreign region id: data_filter.js reloads the whole page
+                response = HttpResponseBadRequest("Unknown fragment")
+                patch_vary_headers(response, (FRAGMENT_HEADER,))
+                return response
+            return render_fragment_response(widget)
+
+    if conditional is None:
+        conditional = getattr(settings, "BFE_CONDITIONAL_RENDER", False)
+    assets = page_assets(*_page_components(context))
+    etag = page_etag(template_name, context, assets) if conditional else None
+    if etag is not None:
+        get_token(request)  # the CSRF cookie still goes out with a 304
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            if fragment_widgets:
+                patch_vary_headers(not_modified, (FRAGMENT_HEADER,))
+            return not_modified
+
+    context, links = _context_with_media(request, context, assets)
+    response = render(request, template_name, context)
+    _add_preload_headers(response, links, preload_headers)
+    if etag is not None:
+        response["ETag"] = etag
+    if fragment_widgets:
+        patch_vary_headers(response, (FRAGMENT_HEADER,))
+    return response
+
+
+def render_fragment_response(widget):
+    """
+    Answers a fragment request (``X-BFE-Fragment`` header, sent by
+    ``data_filter.js``) with only ``widget.render_fragment()`` – no template,
+    no media, no navbar.  Views that do not use render_with_automatic_static
+    can return this themselves when the header is present.
+    """
+    response = HttpResponse(widget.render_fragment())
+    patch_vary_headers(response, (FRAGMENT_HEADER,))
+    return response
+
+
+def _fragment_widgets(context):
+    if not context:
+        return []
+    widgets = [item for item in context.values()
+               if hasattr(item, 'render_fragment') and getattr(item.config, 'fragments', False)]
+    regions = Counter(widget.region_id for widget in widgets)
+    clashes = sorted(region for region, n in regions.items() if n > 1)
+    if clashes:
+        raise ImproperlyConfigured(
+            f"fragment widgets share the region id(s) {', '.join(clashes)}; "
+            f"give each one its own config `name` or `html_id`"
+        )
+    return widgets
+
+
+def _pick_fragment(widgets, target):
+    """
+    the widget whose region the header names (`region_id` – stable across
+    requests, pages and filters), *None* when no widget matches
+    """
+    for widget in widgets:
+        if target == widget.region_id:
+            return widget
+    return None
+
+
+_STREAM_MARKER = re.compile(r"<!--bfe-stream:([^>]*?)-->")
+
+
+class _StreamSlot:
+    """stands in for a streamable widget while the template renders"""
+
+    def __init__(self, key: str):
+        self.marker = mark_safe(f"<!--bfe-stream:{key}-->")
+
+    def render(self, *args, **kwargs):
+        return self.marker
+
+    def __html__(self):
+        return self.marker
+
+    __str__ = __html__
+
+
+def stream_with_automatic_static(request, template_name, context=None, *, chunk_rows=None,
+                                 preload_headers=None):
+    """
+    Streaming variant of :func:`render_with_automatic_static`.
+
+    Every context item exposing ``iter_render()`` (e.g. ``TableWidget``) is
+    swapped for a placeholder while the template renders; the response then
+    yields the template around it and the widget's own chunks in between, so
+    a 50k-row table never exists as one string.  Media is collected from the
+    real widgets *before* the swap.
+
+    Parameters:
+    - request / template_name / context / preload_headers: as for
+      render_with_automatic_static.
+    - chunk_rows: rows per chunk, defaults to each widget's own config.
+
+    Returns:
+    - A StreamingHttpResponse.
+    """
+    context, links = _context_with_media(request, context)
+
+    streams = {}
+    for key, item in list(context.items()):
+        if hasattr(item, 'iter_render'):
+            streams[key] = item
+            context[key] = _StreamSlot(key)
+
+    page = render_to_string(template_name, context, request=request)
+
+    def _chunks():
+        pos = 0
+        for match in _STREAM_MARKER.finditer(page):
+            widget = streams.get(match.group(1))
+            if widget is None:
+                continue
+            yield page[pos:match.start()]
+            yield from widget.iter_render(chunk_rows)
+            pos = match.end()
+        yield page[pos:]
+
+    response = StreamingHttpResponse(_chunks(), content_type="text/html; charset=utf-8")
+    _add_preload_headers(response, links, preload_headers)
+    return response
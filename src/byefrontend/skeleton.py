@@ -0,0 +1,90 @@
+"""
+Skeleton / slot precompilation of widget HTML.
+
+Most of a widget's markup is a pure function of its config; only a handful of
+spots (the bound value, which option is selected, nested child output) change
+between renders.  A widget opts in by writing its markup *once* with
+`slot("name")` markers in the dynamic spots:
+
+    def _compile_skeleton(self, name):
+        return f'<input name="{name}"{slot("value")}>'
+
+    def _render(self, name, value, **kwargs):
+        return skeleton_for(self, name).fill(value=f' value="{value}"' if value else "")
+
+`skeleton_for()` splits that string into static parts + slot names.  With
+``settings.BFE_WIDGET_CACHE`` on it caches the result per widget identity
+(class, config fingerprint, id, attrs, children – see
+`BFEBaseWidget._cache_identity`) and field name, so every later render is a
+single ``"".join``; otherwise – and for trees that aren't cacheable – it is
+compiled on every render, which costs about what plain string building did.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any
+
+from .cache import LRURenderCache, cache_enabled, make_key
+
+_MARK = "\x00"  # never appears in rendered HTML
+_SLOT = re.compile(f"{_MARK}([^{_MARK}]+){_MARK}")
+
+_skeletons = LRURenderCache(maxsize=2048)
+
+
+def slot(name: str) -> str:
+    """placeholder for a dynamic spot inside `_compile_skeleton` output"""
+    return f"{_MARK}{name}{_MARK}"
+
+
+class Skeleton:
+    """static HTML parts interleaved with named slots (``len(parts) == len(slots) + 1``)"""
+    __slots__ = ("parts", "slots")
+
+    def __init__(self, parts: tuple[str, ...], slots: tuple[str, ...]):
+        self.parts = parts
+        self.slots = slots
+
+    @classmethod
+    def compile(cls, markup: str) -> "Skeleton":
+        pieces = _SLOT.split(markup)  # static, slot, static, slot, …, static
+        return cls(tuple(pieces[0::2]), tuple(pieces[1::2]))
+
+    def fill(self, **values: Any) -> str:
+        """join the parts, slots missing from *values* render empty"""
+        parts = self.parts
+        out = [parts[0]]
+        for i, name in enumerate(self.slots, 1):
+            out.append(str(values.get(name, "")))
+            out.append(parts[i])
+        return "".join(out)
+
+    def write(self, buf: list[str], **values: Any) -> None:
+        """
+        `fill()` straight into a render buffer; a callable value is called
+        with *buf* so child widgets can `render_into` it in place.
+        """
+        parts = self.parts
+        buf.append(parts[0])
+        for i, name in enumerate(self.slots, 1):
+            value = values.get(name, "")
+            if callable(value):
+                value(buf)
+            else:
+                buf.append(str(value))
+            buf.append(parts[i])
+
+    def __repr__(self):
+        return f"Skeleton(slots={self.slots!r})"
+
+
+def skeleton_for(widget, name: str | None = None) -> Skeleton:
+    """compiled (and, with the widget cache on, cached) `widget._compile_skeleton(name)`"""
+    if not cache_enabled() or not widget._is_cacheable():
+        return Skeleton.compile(widget._compile_skeleton(name))
+    key = make_key("skeleton", widget._cache_identity(), name)
+    skeleton = _skeletons.get(key)
+    if skeleton is None:
+        skeleton = Skeleton.compile(widget._compile_skeleton(name))
+        _skeletons.set(key, skeleton)
+    return skeleton
@@ -0,0 +1,89 @@
+/* DataFilterWidget pager + fragment mode
+ *
+ * - page jump: <input data-bfe-page-url="?…&page="> + [data-bfe-page-go] button
+ *   (or Enter) navigates to url + n, one delegated handler for every pager
+ * - fragment mode: inside <section data-bfe-datafilter> pager links and the
+ *   filter form fetch only the table + pager (request header X-BFE-Fragment)
+ *   and swap them into the [data-bfe-fragment] region.  Any failure falls
+ *   back to a normal page load.
+ */
+(() => {
+  const HEADER = "X-BFE-Fragment";
+
+  const regionOf = el => {
+    const section = el.closest("[data-bfe-datafilter]");
+    return section && section.querySelector("[data-bfe-fragment]");
+  };
+
+  const load = async (region, url, push = true) => {
+    region.setAttribute("aria-busy", "true");
+    try {
+      const res = await fetch(url, { headers: { [HEADER]: region.id } });
+      if (!res.ok) throw new Error(res.status);
+      region.innerHTML = await res.text();
+      if (push) history.pushState({ bfeFragment: region.id }, "", url);
+    } catch (_) {
+      window.location.href = url;
+    } finally {
+      region.removeAttribute("aria-busy");
+    }
+  };
+
+  const navigate = (from, url) => {
+    const region = regionOf(from);
+    if (region) load(region, url);
+    else window.location.href = url;
+  };
+
+  /* change only the page= parameter, keep filters & sorts */
+  const jump = inp => {
+    const n = parseInt(inp.value, 10);
+    if (!n || n < 1 || (inp.max && n > +inp.max)) return;
+    navigate(inp, new URL(inp.dataset.bfePageUrl + n, window.location));
+  };
+
+  document.addEventListener("click", e => {
+    const go = e.target.closest("[data-bfe-page-go]");
+    if (!go) return;
+    const inp = go.parentElement.querySelector("[data-bfe-page-url]");
+    if (inp) jump(inp);
+  });
+
+  document.addEventListener("keydown", e => {
+    if (e.key !== "Enter" || !e.target.matches("[data-bfe-page-url]")) return;
+    e.preventDefault();
+    jump(e.target);
+  });
+
+  document.addEventListener("click", e => {
+    const a = e.target.closest("[data-bfe-fragment] a[href]");
+    if (!a || e.defaultPrevented || e.button !== 0 ||
+        e.metaKey || e.ctrlKey || e.shiftKey || e.altKey) return;
+    const region = regionOf(a);
+    if (!region) return;
+    e.preventDefault();
+    load(region, new URL(a.href, window.location));
+  });
+
+  document.addEventListener("submit", e => {
+    const form = e.target;
+    const region = regionOf(form);
+    if (!region || (form.method || "get").toLowerCase() !== "get") return;
+    e.preventDefault();
+    const url = new URL(form.action || window.location.href, window.location);
+    url.search = new URLSearchParams(new FormData(form)).toString();
+    load(region, url);
+  });
+
+  window.addEventListener("popstate", e => {
+    const id = e.state && e.state.bfeFragment;
+    const region = id && document.getElementById(id);
+    if (region) load(region, window.location.href, false);
+  });
+
+  /* remember the initial state so "back" to the first page swaps too */
+  document.addEventListener("DOMContentLoaded", () => {
+    const region = document.querySelector("[data-bfe-datafilter] [data-bfe-fragment]");
+    if (region && !history.state) history.replaceState({ bfeFragment: region.id }, "");
+  });
+})();
@@ -0,0 +1,272 @@
+"""
+Tree-shaken, themed stylesheet – the engine behind ``manage.py generate_css``.
+
+Every page preloads ``root.css`` plus one file per widget, most of it rules
+for classes the page never uses.  `generate_stylesheet()` instead
+
+1. takes the CSS files of a set of widgets (all registered widget classes,
+   or the trees of a few page roots – see the command),
+2. keeps only the rules whose class names occur in the *content* those
+   widgets can produce: their modules' source, their JS, their configs and
+   the project's templates (a token scan, Tailwind style – a class assembled
+   at runtime from ``f"level-{n}"`` is matched through its ``level-`` prefix),
+3. applies theme overrides from ``settings.BFE_THEME``
+   (``{"primary-color": "#0a3d62", …}``) to the ``:root`` custom properties,
+4. minifies the result and writes it content-hashed to
+   ``STATIC_ROOT/byefrontend/generated/`` next to a ``manifest.json``
+   listing the files it replaces.
+
+With ``settings.BFE_GENERATED_CSS = True`` `aggregate_media` swaps those
+files for the generated stylesheet; widgets it does not cover keep their own
+files.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .bundling import minify_css, rebase_urls, write_atomic
+
+GENERATED_DIR = "byefrontend/generated"
+MANIFEST_NAME = "manifest.json"
+
+# at-rules whose body is more rules (shaken recursively); every other block
+# (@keyframes, @font-face, @page …) is kept as it is
+_GROUPING_AT_RULES = ("@media", "@supports", "@container", "@layer", "@document")
+
+_COMMENT = re.compile(r"/\*.*?\*/", re.S)
+_TOKEN = re.compile(r"[A-Za-z_-][\w-]*")
+_CLASS = re.compile(r"\.(-?[A-Za-z_][\w-]*)")
+_FUNCTIONAL_PSEUDO = re.compile(r":[\w-]+\((?:[^()]|\([^()]*\))*\)")
+
+_lock = threading.Lock()
+_manifest: dict | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class GeneratedStylesheet:
+    """
+    - path     – static-relative path of the written file
+    - sources  – static-relative CSS files it replaces
+    - size     – bytes written, *source_size* – bytes of the sources
+    - missing  – requested files the staticfiles finders don't know (left out)
+    """
+    path: str
+    sources: tuple[str, ...]
+    size: int
+    source_size: int
+    missing: tuple[str, ...] = ()
+
+
+class UsedTokens:
+    """class-name candidates found in content, plus prefixes of dynamic ones"""
+    __slots__ = ("tokens", "prefixes")
+
+    def __init__(self, texts=()):
+        self.tokens: set[str] = set()
+        self.prefixes: set[str] = set()
+        for text in texts:
+            self.add(text)
+
+    def add(self, text: str) -> None:
+        for token in _TOKEN.findall(text):
+            self.tokens.add(token)
+            if token.endswith(("-", "_")) and len(token) > 1:
+                self.prefixes.add(token)
+
+    def __contains__(self, class_name: str) -> bool:
+        return class_name in self.tokens or any(class_name.startswith(p) for p in self.prefixes)
+
+
+# ── shaking / theming ───────────────────────────────────────────────────────
+
+
+def shake(css: str, used: UsedTokens) -> str:
+    """*css* without the rules (and selectors of a list) whose classes are never used"""
+    return "".join(_shake_block(_COMMENT.sub("", css), used))
+
+
+def _shake_block(css: str, used: UsedTokens):
+    pos, n = 0, len(css)
+    while pos < n:
+        brace = css.find("{", pos)
+        semi = css.find(";", pos)
+        if brace < 0:
+            tail = css[pos:].strip()
+            if tail:
+                yield tail
+            return
+        if 0 <= semi < brace and css[pos:semi].lstrip().startswith("@"):  # @import / @charset …
+            yield css[pos:semi + 1].strip()
+            pos = semi + 1
+            continue
+        end = _matching_brace(css, brace)
+        prelude, body = css[pos:brace].strip(), css[brace + 1:end]
+        pos = end + 1
+        if prelude.startswith(_GROUPING_AT_RULES):
+            inner = "".join(_shake_block(body, used))
+            if inner:
+                yield f"{prelude}{{{inner}}}"
+        elif prelude.startswith("@"):
+            yield f"{prelude}{{{body}}}"
+        else:
+            selectors = [sel for sel in _split_selectors(prelude) if _selector_used(sel, used)]
+            if selectors:
+                yield f"{','.join(selectors)}{{{body}}}"
+
+
+def _matching_brace(css: str, start: int) -> int:
+    depth = 0
+    for i in range(start, len(css)):
+        if css[i] == "{":
+            depth += 1
+        elif css[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return i
+    return len(css) - 1
+
+
+def _split_selectors(prelude: str) -> list[str]:
+    """top-level commas only – ``:is(.a, .b)`` stays in one piece"""
+    out, depth, start = [], 0, 0
+    for i, ch in enumerate(prelude):
+        if ch in "([":
+            depth += 1
+        elif ch in ")]":
+            depth -= 1
+        elif ch == "," and depth == 0:
+            out.append(prelude[start:i].strip())
+            start = i + 1
+    out.append(prelude[start:].strip())
+    return [sel for sel in out if sel]
+
+
+def _selector_used(selector: str, used: UsedTokens) -> bool:
+    # classes inside :not() / :is() / :has() … don't have to exist for a match
+    required = _CLASS.findall(_FUNCTIONAL_PSEUDO.sub("", selector))
+    return all(name in used for name in required)
+
+
+def apply_theme(css: str, theme) -> str:
+    """
+    set the ``--custom-properties`` in *theme* (``{"primary-color": "#fff"}``,
+    leading dashes optional) wherever a ``:root`` rule declares them; ones not
+    declared anywhere are added in a trailing ``:root`` rule
+    """
+    overrides = {f"--{name.lstrip('-')}": str(value) for name, value in dict(theme or {}).items()}
+    if not overrides:
+        return css
+    seen = set()
+
+    def root_rule(match):
+        declarations = []
+        for declaration in match.group(1).split(";"):
+            name, colon, value = declaration.partition(":")
+            name = name.strip()
+            if colon and name in overrides:
+                seen.add(name)
+                value = overrides[name]
+            declarations.append(f"{name}{colon}{value}" if colon else declaration)
+        return f":root{{{';'.join(declarations)}}}"
+
+    css = re.sub(r":root\s*\{([^{}]*)\}", root_rule, css)
+    missing = [f"{name}:{value}" for name, value in overrides.items() if name not in seen]
+    if missing:
+        css += f":root{{{';'.join(missing)}}}"
+    return css
+
+
+# ── building ────────────────────────────────────────────────────────────────
+
+
+def generate_stylesheet(css_paths, content, theme=None) -> GeneratedStylesheet:
+    """
+    shake, theme and minify the static-relative *css_paths* (in cascade
+    order) against *content* (strings), write the result content-hashed
+    under ``STATIC_ROOT`` and point the manifest at it
+    """
+    static_root = getattr(settings, "STATIC_ROOT", None)
+    if not static_root:
+        raise ValueError("generate_css needs settings.STATIC_ROOT")
+    used = UsedTokens(content)
+
+    chunks, sources, missing, source_size = [], [], [], 0
+    for path in css_paths:
+        source = finders.find(path)
+        if source is None:
+            missing.append(path)
+            continue
+        sources.append(path)
+        text = Path(source).read_text(encoding="utf-8")
+        source_size += len(text.encode("utf-8"))
+        chunks.append(shake(rebase_urls(text, path, GENERATED_DIR), used))
+    css = minify_css(apply_theme("".join(chunks), theme)) + "\n"
+
+    digest = hashlib.sha256(css.encode("utf-8")).hexdigest()[:16]
+    name = f"{GENERATED_DIR}/bfe.{digest}.css"
+    root = Path(static_root) / GENERATED_DIR
+    write_atomic(root / f"bfe.{digest}.css", css)
+    write_atomic(root / MANIFEST_NAME, json.dumps({"file": name, "sources": sources}, indent=1))
+    reset_generated_css()
+    return GeneratedStylesheet(name, tuple(sources), len(css.encode("utf-8")), source_size, tuple(missing))
+
+
+# ── serving ─────────────────────────────────────────────────────────────────
+
+
+def generated_css_enabled() -> bool:
+    return getattr(settings, "BFE_GENERATED_CSS", False)
+
+
+def use_generated_css(paths) -> list[str]:
+    """
+    *paths* with the files covered by the generated stylesheet replaced by it
+    (at the position of the first of them); unchanged when there is none
+    """
+    manifest = _read_manifest()
+    if not manifest:
+        return list(paths)
+    covered = set(manifest["sources"])
+    out, placed = [], False
+    for path in paths:
+        if path not in covered:
+            out.append(path)
+        elif not placed:
+            out.append(manifest["file"])
+            placed = True
+    return out
+
+
+def reset_generated_css() -> None:
+    """forget the loaded manifest (tests, settings changes, a fresh build)"""
+    global _manifest
+    with _lock:
+        _manifest = None
+
+
+def _read_manifest() -> dict:
+    global _manifest
+    if _manifest is None:
+        with _lock:
+            try:
+                path = Path(settings.STATIC_ROOT) / GENERATED_DIR / MANIFEST_NAME
+                _manifest = json.loads(path.read_text(encoding="utf-8"))
+            except (TypeError, OSError, ValueError):  # no root / not generated yet
+                _manifest = {}
+    return _manifest
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(*, setting, **kwargs):
+    if setting in {"BFE_GENERATED_CSS", "STATIC_ROOT"}:
+        reset_generated_css()
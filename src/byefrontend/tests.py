@@ -1,7 +1,52 @@
-from django.test import TestCase
+import datetime
+import decimal
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import replace
+from importlib import import_module
+from pathlib import Path
+from unittest.mock import patch
 
-from .widgets import BFEFormWidget
-from .configs import FormConfig, TagInputConfig
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from .builders import ChildBuilderRegistry
+from .bundling import bundle_paths, minify_css, minify_js, reset_bundles
+from . import widgets
+from .cache import reset_render_cache
+from .compression import compress_assets, negotiate
+from .datasets import ColumnarDataset, IndexedDataset
+from .ids import id_scope
+from .middleware import PrecompressedStaticMiddleware
+from .media import class_media, collect, static_url, tree_media
+from .trees import bind, reset_widget_trees, shared_tree
+from .pagination import LAST, NEXT, PREV, CappedCount, CountResult, encode_cursor
+from .skeleton import Skeleton, slot
+from .stylesheet import UsedTokens, apply_theme, generate_stylesheet, reset_generated_css, shake
+from .render import (
+    FRAGMENT_HEADER, aggregate_media, asset_link_headers, collect_asset_paths, page_assets, page_etag,
+    render_with_automatic_static, stream_with_automatic_static,
+)
+from .widgets.datepicker import DatePickerWidget
+from .widgets.dropdown import DropdownWidget
+from .widgets.tag_input import TagInputWidget
+from .widgets.table import compile_fields
+from .widgets import (
+    BFEFormWidget, CardWidget, CharInputWidget, DataFilterWidget, InlineFormWidget,
+    SecretToggleCharWidget, FileUploadWidget, LabelWidget, NavBarWidget, ParagraphWidget, TableWidget,
+)
+from .configs import (
+    FormConfig, TagInputConfig, ParagraphConfig, TableConfig, NavBarConfig,
+    HyperlinkConfig, CardConfig, DataFilterConfig, DropdownConfig, InlineFormConfig,
+    SecretToggleConfig, DatePickerConfig, FileUploadConfig, fingerprint,
+)
 
 
 class TagInputWidgetTests(TestCase):
@@ -20,3 +65,860 @@ class FormWidgetSubmitTextTests(TestCase):
         self.assertIn("Send", html)
 
 
+
+
+@override_settings(BFE_WIDGET_CACHE=True)
+class WidgetRenderCacheTests(TestCase):
+    def setUp(self):
+        reset_render_cache()
+
+    def test_identical_render_is_served_from_backend(self):
+        widget = ParagraphWidget(config=ParagraphConfig(text="hello"))
+        first = widget.render()
+        with patch.object(ParagraphWidget, "_render", side_effect=AssertionError("re-rendered")):
+            widget._render_memo = None
+            self.assertEqual(widget.render(), first)
+
+    def test_attrs_mutation_invalidates(self):
+        widget = CharInputWidget()
+        widget.render("q", "a")
+        widget.attrs = {"placeholder": "changed"}
+        self.assertIn('placeholder="changed"', widget.render("q", None))
+
+    def test_media_is_computed_when_cache_enabled(self):
+        widget = TableWidget(config=TableConfig())
+        self.assertIn("byefrontend/css/table.css", str(widget.media))
+
+    def test_forms_are_never_cached(self):
+        form = BFEFormWidget(config=FormConfig(children={}, csrf=False))
+        self.assertIsNone(form._render_cache_key(None, None))
+
+    def test_render_values_are_keyed_by_fingerprint(self):
+        widget = CharInputWidget()
+        ada = User(username="ada", email="ada@example.com")
+        self.assertIsNone(widget._render_cache_key("q", ada))
+        self.assertNotEqual(widget._render_cache_key("q", "a"), widget._render_cache_key("q", "b"))
+
+    def test_cacheability_is_worked_out_once_per_tree(self):
+        nav = NavBarWidget(config=NavBarConfig(children={"a": HyperlinkConfig(text="A", link="/")}))
+        self.assertTrue(nav._is_cacheable())
+        child = nav.children["a"]
+        with patch.object(type(child), "cacheable", False):
+            self.assertTrue(nav._is_cacheable())  # memo, no second walk
+            child.attrs = {"title": "x"}  # invalidates up the tree
+            self.assertFalse(nav._is_cacheable())
+
+
+class ConfigFingerprintTests(TestCase):
+    def test_equal_trees_share_fingerprint(self):
+        def make():
+            return NavBarConfig(children={"home": HyperlinkConfig(text="Home", link="/")})
+        self.assertEqual(make().fingerprint, make().fingerprint)
+
+    def test_nested_change_and_child_order_change_fingerprint(self):
+        a = CardConfig(children={"x": ParagraphConfig(text="1"), "y": ParagraphConfig(text="2")})
+        b = replace(a, children={"x": ParagraphConfig(text="1"), "y": ParagraphConfig(text="3")})
+        c = replace(a, children={"y": ParagraphConfig(text="2"), "x": ParagraphConfig(text="1")})
+        self.assertEqual(len({a.fingerprint, b.fingerprint, c.fingerprint}), 3)
+
+    def test_value_types_are_distinguished(self):
+        self.assertNotEqual(fingerprint(TableConfig(data=[{"n": 1}])),
+                            fingerprint(TableConfig(data=[{"n": "1"}])))
+
+    def test_querysets_and_opaque_objects_are_not_fingerprinted(self):
+        self.assertIsNone(TableConfig(data=User.objects.values("username")).fingerprint)
+        self.assertIsNone(fingerprint([object()]))
+        self.assertIsNone(fingerprint({"render": lambda row: row}))
+        nested = CardConfig(children={"t": TableConfig(data=User.objects.all())})
+        self.assertIsNone(nested.fingerprint)
+        self.assertIsNotNone(fingerprint({"render": str.upper}))
+
+    def test_model_instances_are_not_fingerprinted_by_repr(self):
+        ada = User(username="ada", email="ada@example.com")
+        other = User(username="ada", email="other@example.com")
+        self.assertEqual(repr(ada), repr(other))
+        self.assertIsNone(fingerprint({"user": ada}))
+        self.assertIsNotNone(fingerprint([datetime.date(2024, 1, 1), decimal.Decimal("1.5")]))
+
+    @override_settings(BFE_WIDGET_CACHE=True)
+    def test_queryset_tables_are_never_served_stale(self):
+        reset_render_cache()
+        config = TableConfig(fields=[{"field_name": "username", "field_text": "User"}],
+                             data=User.objects.values("username"))
+        with id_scope():
+            self.assertNotIn("ada", TableWidget(config=config).render())
+        User.objects.create(username="ada")
+        with id_scope():
+            self.assertIn("ada", TableWidget(config=config).render())
+
+
+class DeterministicIdTests(TestCase):
+    def _navbar_html(self):
+        cfg = NavBarConfig(children={
+            "a": HyperlinkConfig(text="Same", link="/"),
+            "b": HyperlinkConfig(text="Same", link="/"),
+        })
+        with id_scope():
+            navbar = NavBarWidget(config=cfg)
+            return navbar, navbar.render()
+
+    def test_identical_trees_render_identical_html(self):
+        self.assertEqual(self._navbar_html()[1], self._navbar_html()[1])
+
+    def test_siblings_and_roots_with_same_config_get_distinct_ids(self):
+        navbar, _ = self._navbar_html()
+        self.assertNotEqual(navbar.children["a"].id, navbar.children["b"].id)
+        with id_scope():
+            self.assertNotEqual(ParagraphWidget().id, ParagraphWidget().id)
+
+    def test_ids_never_hash_content(self):
+        with patch("byefrontend.configs.base.config_fingerprint", side_effect=AssertionError("hashed")):
+            with id_scope():
+                small = TableWidget(config=TableConfig(data=[{"n": 1}]))
+            with id_scope():
+                big = TableWidget(config=TableConfig(data=[{"n": i} for i in range(1000)]))
+        self.assertEqual(small.id, big.id)  # same position, same kind of widget
+
+
+class TableStreamingTests(TestCase):
+    def _table(self, rows=5):
+        return TableWidget(config=TableConfig(
+            fields=[{"field_name": "n", "field_text": "N"}],
+            data=[{"n": i} for i in range(rows)],
+        ))
+
+    def test_iter_render_yields_row_chunks(self):
+        table = self._table()
+        chunks = list(table.iter_render(chunk_rows=2))
+        self.assertEqual(len(chunks), 5)  # head, 2 + 2 + 1 rows, tail
+        self.assertEqual("".join(chunks), table.render())
+
+    def test_streaming_response_splices_table_into_template(self):
+        table = self._table()
+        request = RequestFactory().get("/")
+        fake_render = lambda name, ctx, request=None: f"<main>{ctx['table'].render()}</main>"
+        with patch("byefrontend.render.render_to_string", side_effect=fake_render):
+            response = stream_with_automatic_static(request, "page.html", {"table": table})
+        body = b"".join(response.streaming_content).decode()
+        self.assertEqual(body, f"<main>{table.render()}</main>")
+
+
+class CompiledCellRendererTests(TestCase):
+    FIELDS = [
+        {"field_name": "name", "field_type": "text"},
+        {"field_name": "pic", "field_type": "img"},
+        {"field_name": "note", "editable": True},
+        {"field_name": "actions", "field_type": "actions"},
+    ]
+
+    def test_compiled_rows_match_generic_cells(self):
+        table = TableWidget(config=TableConfig(fields=self.FIELDS))
+        render_row = table._row_renderer(self.FIELDS)
+        for row in ({"name": "a", "pic": "/x.png", "note": None}, {"name": None}, {}):
+            self.assertEqual(render_row(row), table._render_row(row, self.FIELDS))
+
+    def test_equal_schemas_share_compiled_renderers(self):
+        self.assertIs(compile_fields(self.FIELDS), compile_fields([dict(f) for f in self.FIELDS]))
+
+
+class UserRowsTestCase(TestCase):
+    """30 users (user00 … user29) and a one-column table over them"""
+    FIELDS = ({"field_name": "username", "field_text": "User"},)
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.bulk_create(User(username=f"user{i:02d}") for i in range(30))
+
+
+class DataFilterQuerySetTests(UserRowsTestCase):
+    def test_sort_and_page_are_pushed_down(self):
+        cfg = DataFilterConfig(data=User.objects.values("username"), table_fields=self.FIELDS,
+                               page=2, page_size=10, sort_by="username", sort_dir="desc")
+        with self.assertNumQueries(1):
+            widget = DataFilterWidget(config=cfg)
+        names = [row["username"] for row in widget._table.cfg.data]
+        self.assertEqual(names, [f"user{i:02d}" for i in range(19, 9, -1)])
+        with self.assertNumQueries(1):
+            self.assertEqual(widget._total_pages(), 3)
+            widget._total_pages()
+
+    def test_unlisted_sort_by_falls_back_to_default_order(self):
+        for sort_by in ("bogus", "password", "groups__name", "username__len"):
+            cfg = DataFilterConfig(data=User.objects.values("username"), table_fields=self.FIELDS,
+                                   page_size=3, sort_by=sort_by, sort_dir="desc")
+            names = [row["username"] for row in DataFilterWidget(config=cfg)._table.cfg.data]
+            self.assertEqual(names, ["user00", "user01", "user02"], sort_by)
+
+    def test_model_instances_are_exposed_as_rows(self):
+        cfg = DataFilterConfig(data=User.objects.all(), table_fields=self.FIELDS, page_size=5)
+        widget = DataFilterWidget(config=cfg)
+        self.assertEqual(widget._table.cfg.data[0]["username"], "user00")
+
+
+class DataFilterKeysetTests(UserRowsTestCase):
+    def _page(self, cursor=None, data=None):
+        data = User.objects.values("pk", "username") if data is None else data
+        cfg = DataFilterConfig(data=data, table_fields=self.FIELDS,
+                               page_size=10, sort_by="username", pagination="keyset", cursor=cursor)
+        with self.assertNumQueries(1):  # no COUNT(*), ever
+            widget = DataFilterWidget(config=cfg)
+        return widget, [row["username"] for row in widget._table.cfg.data]
+
+    def test_next_prev_and_last_cursors(self):
+        first, names = self._page()
+        self.assertEqual(names[0], "user00")
+        second, names = self._page(encode_cursor(NEXT, *first._keyset["last"]))
+        self.assertEqual(names, [f"user{i:02d}" for i in range(10, 20)])
+        _, names = self._page(encode_cursor(PREV, *second._keyset["first"]))
+        self.assertEqual(names[0], "user00")
+        last, names = self._page(encode_cursor(LAST))
+        self.assertEqual(names[-1], "user29")
+        self.assertFalse(last._keyset["has_next"])
+        self.assertIn("cursor=", second._pagination_controls())
+
+    def test_values_without_pk_get_the_keyset_columns(self):
+        first, names = self._page(data=User.objects.values("username"))
+        self.assertEqual(names[0], "user00")
+        _, names = self._page(encode_cursor(NEXT, *first._keyset["last"]),
+                              data=User.objects.values("username"))
+        self.assertEqual(names[0], "user10")
+        with self.assertRaises(ValueError):
+            DataFilterWidget(config=DataFilterConfig(
+                data=User.objects.values_list("username"), table_fields=self.FIELDS,
+                pagination="keyset"))
+
+    def test_unlisted_sort_by_walks_in_pk_order(self):
+        cfg = DataFilterConfig(data=User.objects.values("username"), table_fields=self.FIELDS,
+                               page_size=3, sort_by="password", pagination="keyset")
+        widget = DataFilterWidget(config=cfg)
+        self.assertEqual([row["username"] for row in widget._table.cfg.data],
+                         ["user00", "user01", "user02"])
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        self.assertEqual(self._page("not-a-cursor!")[1][0], "user00")
+
+    def test_tampered_cursors_fall_back_to_first_page(self):
+        forged = encode_cursor(NEXT, "user10", 11).partition(":")[0]  # signature stripped
+        self.assertEqual(self._page(forged)[1][0], "user00")
+        for value, pk in (("user10", "eleven"), ({"a": 1}, 11), ("user10", [1, 2]), (None, 11)):
+            self.assertEqual(self._page(encode_cursor(NEXT, value, pk))[1][0], "user00")
+
+
+class DataFilterCountStrategyTests(UserRowsTestCase):
+    def _widget(self, strategy, **kwargs):
+        cfg = DataFilterConfig(data=User.objects.values("username"), table_fields=self.FIELDS,
+                               page_size=10, count_strategy=strategy, **kwargs)
+        return DataFilterWidget(config=cfg)
+
+    def test_capped_count_renders_lower_bound(self):
+        widget = self._widget(CappedCount(cap=15), page=2)
+        self.assertEqual(widget._count(), CountResult(15, "capped"))
+        pager = widget._pagination_controls()
+        self.assertIn("/ 2+", pager)
+        self.assertIn("page=3", pager)  # Next stays enabled past the cap …
+
+    def test_capped_count_disables_next_on_a_short_page(self):
+        pager = self._widget(CappedCount(cap=15), page=3)._pagination_controls()
+        self.assertNotIn("page=4", pager)  # … until no row follows the page
+        self.assertIn('cursor:default;">Next »</span>', pager)
+
+    def test_cached_count_skips_count_query_on_repeat(self):
+        self._widget("cached")._count()
+        widget = self._widget("cached")
+        with self.assertNumQueries(0):
+            self.assertEqual(widget._total_rows(), 30)
+
+    def test_unknown_strategy_name_raises(self):
+        with self.assertRaises(ValueError):
+            self._widget("bogus")._count()
+
+
+class IndexedDatasetTests(TestCase):
+    ROWS = [{"name": n, "credits": c} for n, c in
+            [("delta", 3), ("alpha", 1), ("Charlie", 3), ("bravo", 2), ("alphonse", 5)]]
+    FIELDS = ({"field_name": "name", "field_text": "Name"},
+              {"field_name": "credits", "field_text": "Credits"})
+
+    def setUp(self):
+        self.ds = IndexedDataset(self.ROWS, sortable=("name", "credits"),
+                                 indexed=("credits",), searchable=("name",))
+
+    def test_matches_in_memory_sort_and_page(self):
+        for sort_dir in ("asc", "desc"):
+            expected = sorted(self.ROWS, key=lambda r: r["credits"], reverse=sort_dir == "desc")
+            kwargs = dict(table_fields=self.FIELDS, page_size=2, page=2,
+                          sort_by="credits", sort_dir=sort_dir)
+            plain = DataFilterWidget(config=DataFilterConfig(data=self.ROWS, **kwargs))
+            indexed = DataFilterWidget(config=DataFilterConfig(data=self.ds, **kwargs))
+            self.assertEqual(indexed._table.cfg.data, expected[2:4])
+            self.assertEqual(plain._table.cfg.data, expected[2:4])
+            self.assertEqual(indexed._total_rows(), 5)
+
+    def test_indexed_lookups_agree_with_scans(self):
+        ds = self.ds
+        self.assertEqual([r["name"] for r in ds.filter(name__icontains="LPH")], ["alpha", "alphonse"])
+        self.assertEqual([r["name"] for r in ds.filter(name__istartswith="AL").order_by("-name")],
+                         ["alphonse", "alpha"])
+        self.assertEqual(ds.filter(credits=3).count(), 2)
+        self.assertEqual(ds.filter(credits__in=[1, 2], name__icontains="a").count(), 2)
+        self.assertEqual(ds.filter(credits__gte=3).order_by("name")[0]["name"], "Charlie")
+
+    def test_empty_substring_lookups_are_skipped(self):
+        with patch.object(IndexedDataset, "_match", side_effect=AssertionError("scanned")):
+            everything = self.ds.filter(name__icontains="", name__istartswith="")
+        self.assertEqual(everything.count(), len(self.ROWS))
+        self.assertEqual(everything.fingerprint, self.ds.fingerprint)
+
+    def test_filtered_order_is_worked_out_once(self):
+        sort = IndexedDataset._sort_selection
+        with patch.object(IndexedDataset, "_sort_selection", autospec=True, side_effect=sort) as spy:
+            pages = [list(self.ds.filter(credits__gte=2).order_by("-name")[i:i + 2]) for i in (0, 2)]
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual([r["name"] for page in pages for r in page],
+                         ["delta", "bravo", "alphonse", "Charlie"])
+
+    def test_fingerprint_tracks_filters(self):
+        self.assertEqual(self.ds.filter(credits=3).fingerprint,
+                         IndexedDataset(list(self.ROWS)).filter(credits=3).fingerprint)
+        self.assertNotEqual(self.ds.filter(credits=3).fingerprint,
+                            self.ds.filter(credits=2).fingerprint)
+
+
+class ColumnarDatasetTests(TestCase):
+    ROWS = IndexedDatasetTests.ROWS
+    FIELDS = IndexedDatasetTests.FIELDS
+
+    def setUp(self):
+        self.ds = ColumnarDataset.from_rows(self.ROWS)
+
+    def test_page_matches_list_backend(self):
+        kwargs = dict(table_fields=self.FIELDS, page_size=2, page=1, sort_by="credits", sort_dir="desc")
+        plain = DataFilterWidget(config=DataFilterConfig(data=self.ROWS, **kwargs))
+        columnar = DataFilterWidget(config=DataFilterConfig(data=self.ds, **kwargs))
+        self.assertEqual(columnar._table.cfg.data, plain._table.cfg.data)
+        self.assertIs(type(columnar._table.cfg.data[0]["credits"]), int)  # plain Python scalars
+        self.assertEqual(columnar._total_rows(), 5)
+
+    def test_vectorised_filters_and_ordering(self):
+        view = self.ds.filter(name__icontains="A", credits__lt=5).order_by("-credits", "pk")
+        self.assertEqual([r["name"] for r in view], ["delta", "Charlie", "bravo", "alpha"])
+        self.assertEqual(self.ds.filter(name__istartswith="al").count(), 2)
+        self.assertEqual(self.ds.filter(credits__in=[2, 5])[-1]["name"], "alphonse")
+
+
+class DataFilterFragmentTests(TestCase):
+    FIELDS = ({"field_name": "n", "field_text": "N"},)
+
+    def _widget(self, request, fragments=True, page=2, name="widget"):
+        cfg = DataFilterConfig(data=[{"n": i} for i in range(30)], table_fields=self.FIELDS,
+                               page=page, page_size=10, fragments=fragments, name=name)
+        return DataFilterWidget(config=cfg, request=request)
+
+    def test_fragment_header_skips_the_template(self):
+        loaded = self._widget(RequestFactory().get("/"), page=1)  # the page the browser loaded
+        request = RequestFactory().get("/?page=2", headers={FRAGMENT_HEADER: loaded.region_id})
+        widget = self._widget(request)  # no id scope: a new id, but the same region
+        self.assertNotEqual(widget.id, loaded.id)
+        with patch("byefrontend.render.render") as full_render:
+            response = render_with_automatic_static(request, "page.html", {"df": widget})
+        full_render.assert_not_called()
+        self.assertEqual(response.content.decode(), widget.render_fragment())
+        self.assertNotIn("<form", response.content.decode())
+        self.assertIn(FRAGMENT_HEADER, response["Vary"])
+
+    def test_fragment_target_picks_its_own_widget_or_fails(self):
+        def page(header):
+            request = RequestFactory().get("/?page=3", headers={FRAGMENT_HEADER: header})
+            with id_scope():
+                widgets = (self._widget(request, name="a", page=3), self._widget(request, name="b", page=3))
+                return widgets, render_with_automatic_static(request, "page.html",
+                                                             {"a": widgets[0], "b": widgets[1]})
+        second_region = self._widget(RequestFactory().get("/"), name="b", page=1).region_id
+        (_, second), response = page(second_region)
+        self.assertEqual(response.content.decode(), second.render_fragment())
+        _, response = page("bfe-000000000000_results")
+        self.assertEqual(response.status_code, 400)
+
+    def test_fragment_widgets_need_distinct_regions(self):
+        request = RequestFactory().get("/")
+        context = {"a": self._widget(request), "b": self._widget(request)}
+        with self.assertRaises(ImproperlyConfigured):
+            render_with_automatic_static(request, "page.html", context)
+
+    def test_full_render_wraps_swappable_region(self):
+        html = self._widget(RequestFactory().get("/")).render()
+        self.assertIn("data-bfe-datafilter", html)
+        self.assertIn("data-bfe-fragment", html)
+        self.assertNotIn("data-bfe-fragment", self._widget(None, fragments=False).render())
+
+
+class DataFilterPagerTests(TestCase):
+    FIELDS = ({"field_name": "n", "field_text": "N"},)
+
+    def _widget(self, url):
+        cfg = DataFilterConfig(data=[{"n": i} for i in range(50)], table_fields=self.FIELDS,
+                               page=2, page_size=10)
+        return DataFilterWidget(config=cfg, request=RequestFactory().get(url))
+
+    def test_links_share_one_encoded_query(self):
+        widget = self._widget("/?name=a%26b&page=2&tag=x&tag=y")
+        with patch.object(widget._query_dict, "copy", wraps=widget._query_dict.copy) as copy:
+            pager = widget._pagination_controls()
+        self.assertEqual(copy.call_count, 1)
+        prefix = "?name=a%26b&amp;tag=x&amp;tag=y&amp;page="
+        for target in (1, 3, 5):
+            self.assertIn(f'href="{prefix}{target}"', pager)
+        self.assertIn(f'data-bfe-page-url="{prefix}"', pager)
+
+    def test_pager_has_no_inline_script(self):
+        widget = self._widget("/")
+        pager = widget._pagination_controls()
+        self.assertNotIn("<script", pager)
+        self.assertIn('href="?page=3"', pager)
+        self.assertIn("byefrontend/js/data_filter.js", str(widget.media))
+
+
+@override_settings(BFE_WIDGET_CACHE=True)
+class SharedWidgetTreeTests(TestCase):
+    CFG = NavBarConfig(text="Site", children={"home": HyperlinkConfig(text="Home", link="/")})
+
+    def setUp(self):
+        reset_render_cache()
+        reset_widget_trees()
+
+    def test_tree_is_built_once_per_page_position(self):
+        with id_scope():
+            first, second = shared_tree(NavBarWidget, self.CFG), shared_tree(NavBarWidget, self.CFG)
+        with id_scope():
+            again = shared_tree(NavBarWidget, self.CFG)
+        self.assertIs(again, first)
+        self.assertIsNot(second, first)  # same config twice on one page -> own ids
+        self.assertNotEqual(second.id, first.id)
+        with id_scope():
+            self.assertEqual(NavBarWidget(config=self.CFG).id, first.id)  # same id as a fresh build
+
+    def test_binding_changes_output_without_touching_the_tree(self):
+        with id_scope():
+            tree = shared_tree(NavBarWidget, self.CFG)
+        a = bind(tree, selected_id="home").render()
+        b = bind(tree, selected_id=None).render()
+        self.assertIn('"selected_id": "home"', a)
+        self.assertNotEqual(a, b)
+        self.assertIsNone(tree.selected_id)
+        self.assertEqual(bind(tree, selected_id="home").render(), a)
+
+    def test_request_bound_trees_are_not_shared(self):
+        cfg = FormConfig(children={}, csrf=False)
+        with id_scope():
+            first = shared_tree(BFEFormWidget, cfg)
+        with id_scope():
+            self.assertIsNot(shared_tree(BFEFormWidget, cfg), first)
+
+
+class SkeletonTests(TestCase):
+    def test_compile_and_fill(self):
+        skel = Skeleton.compile(f"<a{slot('x')}>{slot('y')}</a>")
+        self.assertEqual(skel.slots, ("x", "y"))
+        self.assertEqual(skel.fill(y="hi"), "<a>hi</a>")
+
+    @override_settings(BFE_WIDGET_CACHE=True)
+    def test_widget_compiles_once_and_fills_values(self):
+        reset_render_cache()
+        widget = CharInputWidget()
+        with patch.object(CharInputWidget, "_compile_skeleton",
+                          autospec=True, side_effect=CharInputWidget._compile_skeleton) as compile_:
+            first = widget.render("q", "a")
+            second = widget.render("q", "b")
+        self.assertEqual(compile_.call_count, 1)
+        self.assertIn('value="a"', first)
+        self.assertIn('value="b"', second)
+        self.assertEqual(first.replace('value="a"', 'value="b"'), second)
+
+    def test_skeletons_are_not_kept_without_the_cache(self):
+        widget = CharInputWidget()
+        with patch.object(CharInputWidget, "_compile_skeleton",
+                          autospec=True, side_effect=CharInputWidget._compile_skeleton) as compile_:
+            widget.render("q", "a")
+            widget.render("q", "b")
+        self.assertEqual(compile_.call_count, 2)
+
+    @override_settings(BFE_WIDGET_CACHE=True)
+    def test_in_place_attrs_changes_are_picked_up(self):
+        reset_render_cache()
+        widget = CharInputWidget()
+        widget.render("q", None)
+        widget.attrs["placeholder"] = "Search"
+        self.assertIn('placeholder="Search"', widget.render("q", None))
+        del widget.attrs["placeholder"]
+        self.assertNotIn("placeholder", widget.render("q", None))
+
+    def test_dropdown_selection_is_a_slot(self):
+        widget = DropdownWidget(config=DropdownConfig(choices=[("a", "A"), ("b", "B")],
+                                                      placeholder="Pick"))
+        self.assertIn('<option value="" disabled selected>', widget.render("d", None))
+        html = widget.render("d", "b")
+        self.assertIn('<option value="b" selected>', html)
+        self.assertIn('<option value="a">', html)
+
+
+class RenderIntoTests(TestCase):
+    def _card(self):
+        inner = CardConfig(title="Inner", children={"p": ParagraphConfig(text="deep")})
+        return CardWidget(config=CardConfig(title="Outer", children={
+            "a": ParagraphConfig(text="one"), "inner": inner,
+        }))
+
+    def test_containers_share_one_buffer(self):
+        card = self._card()
+        buf = ["<main>"]
+        card.render_into(buf)
+        self.assertGreater(len(buf), 4)  # children appended in place, not pre-joined
+        self.assertEqual("".join(buf), "<main>" + card.render())
+        self.assertIn("deep", card.render())
+
+    @override_settings(BFE_WIDGET_CACHE=True)
+    def test_cached_subtree_is_appended_whole(self):
+        reset_render_cache()
+        card = self._card()
+        html = card.render()
+        with patch.object(ParagraphWidget, "_render", side_effect=AssertionError("re-rendered")):
+            buf = []
+            card.render_into(buf)
+        self.assertEqual(buf, [html])
+
+
+class WrapperHookTests(TestCase):
+    def test_secret_toggle_is_emitted_inside_wrapper(self):
+        html = SecretToggleCharWidget(config=SecretToggleConfig(label="Key")).render("key", None)
+        self.assertTrue(html.startswith('<div class="secret-input-wrapper">'))
+        self.assertTrue(html.endswith("</button></div>"))
+        self.assertEqual(html.count("</div>"), 1)
+
+    def test_inline_form_sets_form_tag_attrs(self):
+        form = InlineFormWidget(config=InlineFormConfig(children={}, csrf=False, gap=1, wrap=False))
+        self.assertIn(
+            'class="bfe-form-widget bfe-inline-form" style="display:flex;flex-wrap:nowrap;gap:1rem;">',
+            form.render(),
+        )
+
+
+class FlyweightHelperTests(TestCase):
+    def test_labels_render_without_label_widgets(self):
+        widget = DatePickerWidget(config=DatePickerConfig(label="When"))
+        with patch.object(LabelWidget, "__init__", side_effect=AssertionError("built a label")):
+            first = widget.render("when", None)
+            second = widget.render("when", None)
+        self.assertEqual(first, second)
+        self.assertIn(f'<label for="{widget.id}" id="{widget.id}_label" class="bfe-label">When</label>',
+                      first)
+
+    def test_upload_tables_built_once_per_shape(self):
+        widget = FileUploadWidget(config=FileUploadConfig(upload_url="/u/", auto_upload=False))
+        first = widget.render()
+        with patch.object(CardWidget, "__init__", side_effect=AssertionError("rebuilt tables")):
+            self.assertEqual(widget.render(), first)
+        self.assertIn('id="to-upload-list"', first)
+
+    def test_upload_tables_shared_across_widget_ids(self):
+        cfg = FileUploadConfig(upload_url="/u/", auto_upload=False)
+        first = FileUploadWidget(config=replace(cfg, html_id="up-a")).render()
+        with patch.object(CardWidget, "__init__", side_effect=AssertionError("rebuilt tables")), \
+                patch.object(Skeleton, "compile", side_effect=AssertionError("recompiled tables")):
+            second = FileUploadWidget(config=replace(cfg, html_id="up-b")).render()
+        self.assertIn("id='up-a_uploaded'", first)
+        self.assertIn("id='up-b_uploaded'", second)
+        self.assertNotIn("up-a", second)
+
+    def test_secret_input_built_once(self):
+        widget = SecretToggleCharWidget(config=SecretToggleConfig())
+        with patch.object(CharInputWidget, "__init__", side_effect=AssertionError("rebuilt input")):
+            first = widget.render("key", None)
+            second = widget.render("token", None)
+        self.assertIn(">key</label>", first)
+        self.assertIn(">token</label>", second)
+
+
+class MediaCollectorTests(TestCase):
+    def _form(self):
+        return BFEFormWidget(config=FormConfig(csrf=False, children={
+            "a": TagInputConfig(), "b": TagInputConfig(), "c": DropdownConfig(),
+        }))
+
+    def test_tree_media_is_ordered_and_deduplicated(self):
+        card = CardWidget(config=CardConfig(children={
+            "nav": NavBarConfig(children={"sub": NavBarConfig()}),
+            "tbl": TableConfig(),
+        }))
+        media = tree_media(card)
+        self.assertEqual(media.js, ("byefrontend/js/navbar.js",))
+        self.assertEqual(media.css_for("all"),
+                         ("byefrontend/css/navbar.css", "byefrontend/css/table.css"))
+
+    @override_settings(BFE_WIDGET_CACHE=True)
+    def test_media_is_walked_once_per_instance(self):
+        table = TableWidget(config=TableConfig(data=[{"n": i} for i in range(1000)]))
+        with patch("byefrontend.configs.base.config_fingerprint", side_effect=AssertionError("hashed")), \
+                patch("byefrontend.widgets.base.tree_media", wraps=tree_media) as walk:
+            media = table.media
+            self.assertIs(table.media, media)
+            self.assertEqual(walk.call_count, 1)
+            table._invalidate_media_cache()
+            table.media
+            self.assertEqual(walk.call_count, 2)
+
+    def test_no_media_merging_for_static_trees(self):
+        form = self._form()
+        with patch("django.forms.widgets.Media.__add__", side_effect=AssertionError("merged")):
+            media = tree_media(form)
+        self.assertEqual(media.js, ("byefrontend/js/tag_input.js",))
+        self.assertEqual(class_media(TagInputWidget).js, ("byefrontend/js/tag_input.js",))
+
+    def test_dynamic_media_widgets_are_asked_directly(self):
+        single = FileUploadWidget(config=FileUploadConfig(can_upload_multiple_files=False))
+        self.assertEqual(collect(single).js, ())
+        self.assertIn("byefrontend/css/form.css", collect(self._form()).css_for("all"))
+
+
+class StaticRootTestCase(TestCase):
+    """a fresh, self-deleting STATIC_ROOT per test in ``self.static_root``"""
+    def setUp(self):
+        self.static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.static_root)
+
+
+class AssetBundlingTests(StaticRootTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(reset_bundles)
+
+    def test_minifiers_keep_literals(self):
+        self.assertEqual(minify_css("a  >  b {\n  color: red;\n} /* x */"), "a>b{color: red}")
+        js = "const t = `a\n  b`; // note\nlet r = /\\/*x/g;\n\n  f('//', \"/*\")"
+        self.assertEqual(minify_js(js), "const t = `a\n  b`;\nlet r = /\\/*x/g;\nf('//', \"/*\")")
+
+    def test_page_gets_one_css_and_one_js_bundle(self):
+        card = CardWidget(config=CardConfig(children={
+            "nav": NavBarConfig(), "tags": TagInputConfig(), "secret": SecretToggleConfig(),
+        }))
+        with override_settings(BFE_ASSET_BUNDLING=True, STATIC_ROOT=self.static_root):
+            css, js = (str(tags) for tags in aggregate_media(card))
+            self.assertEqual(css.count("<link"), 1)
+            self.assertEqual(js.count("<script"), 1)
+            bundle_css = css.split('href="/static/')[1].split('"')[0]
+            content = Path(self.static_root, bundle_css).read_text()
+            self.assertIn("url('../img/icons/open-eye.png')", content)  # rebased onto bundles/
+            with patch("byefrontend.bundling.minify_css", side_effect=AssertionError("rebuilt")):
+                reset_bundles()  # fresh process: the manifest is enough
+                self.assertEqual(str(aggregate_media(card)[0]), css)
+
+    def test_unknown_file_leaves_the_set_unbundled(self):
+        with override_settings(BFE_ASSET_BUNDLING=True, STATIC_ROOT=self.static_root):
+            paths = ["byefrontend/css/root.css", "missing.css"]
+            self.assertEqual(bundle_paths("css", paths), paths)
+
+
+class AssetOrderingTests(TestCase):
+    def _card(self):
+        return CardWidget(config=CardConfig(children={
+            "tbl": TableConfig(), "nav": NavBarConfig(), "tags": TagInputConfig(),
+        }))
+
+    def test_assets_come_out_in_page_order(self):
+        css, js = collect_asset_paths(self._card(), self._card())
+        self.assertEqual(css, [
+            "byefrontend/css/root.css", "byefrontend/css/table.css",
+            "byefrontend/css/navbar.css", "byefrontend/css/tag_input.css",
+        ])
+        self.assertEqual(js, ["byefrontend/js/navbar.js", "byefrontend/js/tag_input.js"])
+
+    def test_preload_link_header_is_opt_in(self):
+        request = RequestFactory().get("/")
+        with patch("byefrontend.render.render", side_effect=lambda *a, **kw: HttpResponse("page")):
+            plain = render_with_automatic_static(request, "page.html", {"card": self._card()})
+            hinted = render_with_automatic_static(request, "page.html", {"card": self._card()},
+                                                  preload_headers=True)
+        self.assertNotIn("Link", plain)
+        self.assertEqual(hinted["Link"], asset_link_headers(self._card())["Link"])
+        self.assertTrue(hinted["Link"].startswith("</static/byefrontend/css/root.css>; rel=preload; as=style, "))
+        self.assertIn("</static/byefrontend/js/navbar.js>; rel=preload; as=script", hinted["Link"])
+
+
+class GeneratedStylesheetTests(StaticRootTestCase):
+    def setUp(self):
+        super().setUp()
+        self.addCleanup(reset_generated_css)
+
+    def test_shake_keeps_only_used_classes(self):
+        css = ".a{x:1}.b,.c .a{x:2}@media (x){.b{x:3}.a:not(.zz){x:4}}:root{--k:1}.level-3{x:5}"
+        used = UsedTokens(["a c", 'f"level-{n}"'])
+        self.assertEqual(shake(css, used), ".a{x:1}.c .a{x:2}@media (x){.a:not(.zz){x:4}}:root{--k:1}.level-3{x:5}")
+
+    def test_theme_overrides_root_properties(self):
+        css = apply_theme(":root{--primary-color: #edf4f7;--gap:1rem}", {"primary-color": "#000", "--new": "2px"})
+        self.assertEqual(css, ":root{--primary-color:#000;--gap:1rem}:root{--new:2px}")
+
+    def test_page_references_the_generated_sheet(self):
+        card = CardWidget(config=CardConfig(children={"nav": NavBarConfig(), "tbl": TableConfig()}))
+        with override_settings(STATIC_ROOT=self.static_root, BFE_GENERATED_CSS=True):
+            sheet = generate_stylesheet(
+                ["byefrontend/css/root.css", "byefrontend/css/navbar.css"], ["navbar navbar-button bfe-card"],
+            )
+            content = Path(self.static_root, sheet.path).read_text()
+            self.assertIn(".navbar-button{", content)
+            self.assertNotIn(".bfe-paragraph", content)
+            css, _ = collect_asset_paths(card)
+            self.assertEqual(page_assets(card)[0], [f"/static/{sheet.path}", "/static/byefrontend/css/table.css"])
+            self.assertEqual(len(css), 3)
+
+
+class StaticUrlTests(StaticRootTestCase):
+    def setUp(self):
+        super().setUp()
+        Path(self.static_root, "staticfiles.json").write_text(json.dumps({
+            "version": "1.1", "hash": "x",
+            "paths": {"byefrontend/css/root.css": "byefrontend/css/root.0123abcd.css"},
+        }))
+
+    def test_assets_resolve_through_the_static_storage(self):
+        storages = {"staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.ManifestStaticFilesStorage"}}
+        with override_settings(STATIC_ROOT=self.static_root, STATIC_URL="https://cdn.example/s/", STORAGES=storages):
+            css, _ = page_assets()
+            self.assertEqual(css, ["https://cdn.example/s/byefrontend/css/root.0123abcd.css"])
+            # not in the manifest (e.g. a bundle written later): plain STATIC_URL
+            self.assertEqual(static_url("byefrontend/bundles/x.css"), "https://cdn.example/s/byefrontend/bundles/x.css")
+            self.assertEqual(static_url("https://other/x.js"), "https://other/x.js")
+            with patch("byefrontend.media.staticfiles_storage.url", side_effect=AssertionError("resolved again")):
+                self.assertEqual(page_assets()[0], css)
+        self.assertEqual(page_assets()[0], ["/static/byefrontend/css/root.css"])  # cache reset with the settings
+
+
+class PrecompressedAssetTests(StaticRootTestCase):
+    def setUp(self):
+        super().setUp()
+        js = Path(self.static_root, "byefrontend/js/app.js")
+        js.parent.mkdir(parents=True)
+        js.write_text("/* app */\nfunction go() {\n    return 'x  y';\n}\n" * 40)
+        self.js = js
+
+    def test_gz_siblings_are_incremental_and_leave_originals_alone(self):
+        original = self.js.read_bytes()
+        written = compress_assets(self.static_root)
+        self.assertEqual(written, [self.js.with_name("app.js.gz")])
+        self.assertEqual(self.js.read_bytes(), original)
+        self.assertEqual(gzip.decompress(written[0].read_bytes()), original)
+        self.assertEqual(compress_assets(self.static_root), [])  # up to date
+
+    def test_minify_is_opt_in_and_only_reaches_the_sibling(self):
+        original = self.js.read_bytes()
+        [gz] = compress_assets(self.static_root, minify=True)
+        self.assertEqual(self.js.read_bytes(), original)
+        self.assertNotIn(b"/* app */", gzip.decompress(gz.read_bytes()))
+
+    def test_negotiation(self):
+        self.assertEqual(negotiate("gzip, deflate, br", {"gzip"}), "gzip")
+        self.assertIsNone(negotiate("gzip;q=0, identity", {"gzip"}))
+        self.assertEqual(negotiate("*", {"gzip"}), "gzip")
+
+    def test_middleware_serves_the_sibling_when_accepted(self):
+        compress_assets(self.static_root)
+        middleware = PrecompressedStaticMiddleware(lambda request: HttpResponse("fallthrough"))
+        factory = RequestFactory()
+        with override_settings(STATIC_ROOT=self.static_root, STATIC_URL="/static/"):
+            response = middleware(factory.get("/static/byefrontend/js/app.js", headers={"Accept-Encoding": "gzip"}))
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertEqual(response["Content-Type"], "text/javascript")
+            self.assertIn("Accept-Encoding", response["Vary"])
+            self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), self.js.read_bytes())
+            plain = middleware(factory.get("/static/byefrontend/js/app.js"))
+            self.assertEqual(plain.content, b"fallthrough")
+            escape = middleware(factory.get("/static/../etc/passwd", headers={"Accept-Encoding": "gzip"}))
+            self.assertEqual(escape.content, b"fallthrough")
+
+
+@override_settings(TEMPLATES=[{
+    "BACKEND": "django.template.backends.django.DjangoTemplates",
+    "OPTIONS": {"loaders": [("django.template.loaders.locmem.Loader", {"page.html": "{{ nav }}|{{ title }}"})]},
+}])
+class ConditionalRenderTests(TestCase):
+    NAV = NavBarConfig(children={"home": HyperlinkConfig(text="Home", link="/")})
+
+    def _get(self, context, **headers):
+        return render_with_automatic_static(RequestFactory().get("/", headers=headers), "page.html",
+                                            context, conditional=True)
+
+    def test_matching_etag_skips_rendering(self):
+        with id_scope():
+            first = self._get({"nav": NavBarWidget(config=self.NAV), "title": "Hi"})
+        self.assertEqual(first.status_code, 200)
+        etag = first["ETag"]
+        with id_scope(), patch.object(NavBarWidget, "render", side_effect=AssertionError("rendered")):
+            again = self._get({"nav": NavBarWidget(config=self.NAV), "title": "Hi"}, **{"If-None-Match": etag})
+        self.assertEqual(again.status_code, 304)
+        with id_scope():
+            changed = self._get({"nav": NavBarWidget(config=self.NAV), "title": "Bye"}, **{"If-None-Match": etag})
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+
+    def test_bound_state_and_uncacheable_widgets(self):
+        with id_scope():
+            nav = NavBarWidget(config=self.NAV)
+            self.assertNotEqual(page_etag("page.html", {"nav": bind(nav, selected_id="a")}),
+                                page_etag("page.html", {"nav": bind(nav, selected_id="b")}))
+            form = BFEFormWidget(config=FormConfig(csrf=False))
+            self.assertIsNone(page_etag("page.html", {"form": form}))
+            self.assertNotIn("ETag", self._get({"form": form}))
+
+    def test_queryset_data_gets_no_etag(self):
+        config = TableConfig(fields=[{"field_name": "username", "field_text": "User"}],
+                             data=User.objects.values("username"))
+        with id_scope():
+            response = self._get({"nav": TableWidget(config=config)}, **{"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        with id_scope():
+            nav = NavBarWidget(config=self.NAV)
+            self.assertIsNone(page_etag("page.html", {"nav": bind(nav, selected_id=object())}))
+
+
+class LazyImportTests(TestCase):
+    def test_package_attributes_load_on_demand(self):
+        self.assertIs(widgets.TableWidget, TableWidget)
+        self.assertIn("DataFilterWidget", dir(widgets))
+        with self.assertRaises(AttributeError):
+            widgets.NoSuchWidget
+
+    def test_lazy_maps_match_the_registrations(self):
+        from . import configs
+        widgets.import_all()
+        configs_pkg = f"{configs.__name__}."
+        registered = {
+            f"{cfg_type.__module__}.{cfg_type.__qualname__}": fn.__module__
+            for cfg_type, fn in ChildBuilderRegistry._registry.items()
+            if cfg_type.__module__.startswith(configs_pkg)
+        }
+        announced = {path: module for path, module in ChildBuilderRegistry._lazy.items()
+                     if path.startswith(configs_pkg)}
+        self.assertEqual(announced, registered)
+        for package in (widgets, configs):
+            for name, module in package._EXPORTS.items():
+                self.assertIs(getattr(package, name),
+                              getattr(import_module(f".{module}", package.__name__), name))
+
+    def test_fresh_interpreter_imports_only_what_it_builds(self):
+        code = (
+            "import sys, django\n"
+            "from django.conf import settings\n"
+            "settings.configure(USE_I18N=False)\n"
+            "django.setup()\n"
+            "import byefrontend.widgets\n"
+            "from byefrontend.builders import ChildBuilderRegistry\n"
+            "from byefrontend.configs import HyperlinkConfig, NavBarConfig\n"
+            "assert 'byefrontend.widgets.navbar' not in sys.modules\n"
+            "nav = ChildBuilderRegistry.build(NavBarConfig(children={'a': HyperlinkConfig(text='A', link='/')}))\n"
+            "assert type(nav).__name__ == 'NavBarWidget' and 'A' in nav.render()\n"
+            "assert 'byefrontend.widgets.table' not in sys.modules\n"
+        )
+        src = str(Path(__file__).resolve().parent.parent)
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                env={**os.environ, "PYTHONPATH": src})
+        self.assertEqual(result.returncode, 0, result.stderr)
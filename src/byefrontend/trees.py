@@ -0,0 +1,142 @@
+"""
+Process-wide reuse of built widget trees.
+
+Configs are frozen and ids are derived from tree positions (see
+:mod:`byefrontend.ids`), so the tree a widget class builds from a config is the same on every request.
+`shared_tree()` builds it once per process and hands out that instance
+afterwards; request-specific state is layered on top with `bind()` instead of
+rebuilding:
+
+    NAVBAR = NavBarConfig(...)          # module level
+
+    def view(request):
+        navbar = bind(shared_tree(NavBarWidget, NAVBAR), selected_id="about")
+
+Rules of the game:
+
+- only trees whose widgets are all `cacheable` are shared – forms and
+  other request-bound widgets are built fresh every time
+- a shared tree must never be mutated; per-request state goes through
+  `bind()` / `current_binding()`, which is a ContextVar and therefore
+  thread- and async-safe
+- reuse needs reproducible ids, i.e. an active `id_scope()` (installed by
+  `WidgetIdScopeMiddleware`); outside a scope every call builds a new tree
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from types import MappingProxyType
+from typing import Any, Iterator, Mapping
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.safestring import mark_safe
+
+from .cache import LRURenderCache, make_key
+from .ids import page_sequence, peek_sequence
+
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+_binding: ContextVar[Mapping[str, Any]] = ContextVar("bfe_binding", default=_EMPTY)
+
+_trees: LRURenderCache | None = None
+
+
+def current_binding() -> Mapping[str, Any]:
+    """request-specific state for the widget currently rendering (read-only)"""
+    return _binding.get()
+
+
+@contextmanager
+def binding(**state) -> Iterator[None]:
+    """layer *state* over the active binding for the duration of the block"""
+    token = _binding.set(MappingProxyType({**_binding.get(), **state}))
+    try:
+        yield
+    finally:
+        _binding.reset(token)
+
+
+class BoundWidget:
+    """
+    Thin per-request view of a (shared) widget: `render()` runs inside
+    `binding(**state)`, everything else is delegated to the widget.
+
+    Recognised keys: ``selected_id`` (NavBarWidget), ``value`` (used when
+    render() gets no value) and ``csrf_token`` (BFEFormWidget).
+    """
+    __slots__ = ("widget", "state")
+
+    def __init__(self, widget, **state):
+        self.widget = widget
+        self.state = MappingProxyType(state)
+
+    def render(self, name=None, value=None, attrs=None, renderer=None, **kwargs):
+        if value is None:
+            value = self.state.get("value")
+        with binding(**self.state):
+            return self.widget.render(name, value, attrs=attrs, renderer=renderer, **kwargs)
+
+    def __html__(self):
+        return mark_safe(self.render())
+
+    __str__ = __html__
+
+    def __getattr__(self, item):
+        return getattr(self.widget, item)
+
+
+def bind(widget, **state) -> BoundWidget:
+    return BoundWidget(widget, **state)
+
+
+def _tree_cache() -> LRURenderCache:
+    global _trees
+    if _trees is None:
+        _trees = LRURenderCache(maxsize=getattr(settings, "BFE_WIDGET_TREE_CACHE_SIZE", 256))
+    return _trees
+
+
+def shared_tree(widget_cls, config):
+    """
+    The process-wide instance of ``widget_cls(config=config)`` for this
+    position on the page, built on first use.
+    """
+    fp = config.fingerprint
+    if fp is None:  # holds a QuerySet & co. – never shared
+        return widget_cls(config=config)
+    cls_path = f"{widget_cls.__module__}.{widget_cls.__qualname__}"
+
+    id_key = widget_cls._id_key(config)
+    if config.html_id:
+        key = make_key("tree", cls_path, fp)
+    else:
+        n = peek_sequence(id_key)  # the root id the fresh build would get
+        if n is None:
+            return widget_cls(config=config)
+        key = make_key("tree", cls_path, fp, n)
+
+    trees = _tree_cache()
+    tree = trees.get(key)
+    if tree is not None:
+        if not config.html_id:
+            page_sequence(id_key)  # keep the page counter in step with a fresh build
+        return tree
+
+    tree = widget_cls(config=config)
+    if tree._is_cacheable():
+        trees.set(key, tree)
+    return tree
+
+
+def reset_widget_trees() -> None:
+    """drop every shared tree (tests, settings changes)"""
+    global _trees
+    _trees = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(*, setting, **kwargs):
+    if setting == "BFE_WIDGET_TREE_CACHE_SIZE":
+        reset_widget_trees()
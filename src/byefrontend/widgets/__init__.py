@@ -1,30 +1,137 @@
-from .base import BFEBaseWidget
-from .binary import CheckBoxWidget, RadioWidget
-from .code_box import CodeBoxWidget
-from .file_upload import FileUploadWidget
-from .label import LabelWidget
-from .popout import PopOut
-from .thumbnail import TinyThumbnailWidget
-from .title import TitleWidget
-from .navbar import NavBarWidget
-from .table import TableWidget
-from .secret import SecretToggleCharWidget
-from .hyperlink import HyperlinkWidget
-from .radio_group import RadioGroupWidget
-from .inline_group import InlineGroupWidget
-from .char_input import CharInputWidget
-from .card import CardWidget
-from .text_editor import TextEditorWidget
-from .datepicker import DatePickerConfig
-from .dropdown import DropdownConfig
-from .tag_input import TagInputWidget
-from .form import BFEFormWidget
-from .inline_form import InlineFormWidget
-from .button import ButtonWidget
-from .paragraph import ParagraphWidget
-from .document_viewer import DocumentViewerWidget
-from .document_link import DocumentLinkWidget
-from .data_filter import DataFilterWidget
+"""
+Widget classes, imported on first use.
+
+``from byefrontend.widgets import TableWidget`` loads ``widgets/table.py``
+(and what it needs) only; the other modules stay unimported until something
+asks for them, which keeps worker and management-command start-up short.
+A config whose widget module is not loaded yet still builds: its builder is
+announced to `ChildBuilderRegistry` here and imported on the first build.
+
+`import_all()` loads every widget module – for code that scans
+``BFEBaseWidget.__subclasses__()``.
+"""
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+from ..builders import ChildBuilderRegistry
+
+if TYPE_CHECKING:
+    from .base import BFEBaseWidget
+    from .binary import CheckBoxWidget, RadioWidget
+    from .code_box import CodeBoxWidget
+    from .file_upload import FileUploadWidget
+    from .label import LabelWidget
+    from .popout import PopOut
+    from .thumbnail import TinyThumbnailWidget
+    from .title import TitleWidget
+    from .navbar import NavBarWidget
+    from .table import TableWidget
+    from .secret import SecretToggleCharWidget
+    from .hyperlink import HyperlinkWidget
+    from .radio_group import RadioGroupWidget
+    from .inline_group import InlineGroupWidget
+    from .char_input import CharInputWidget
+    from .card import CardWidget
+    from .text_editor import TextEditorWidget
+    from .datepicker import DatePickerConfig
+    from .dropdown import DropdownConfig
+    from .tag_input import TagInputWidget
+    from .form import BFEFormWidget
+    from .inline_form import InlineFormWidget
+    from .button import ButtonWidget
+    from .paragraph import ParagraphWidget
+    from .document_viewer import DocumentViewerWidget
+    from .document_link import DocumentLinkWidget
+    from .data_filter import DataFilterWidget
+
+# public name -> submodule defining it
+_EXPORTS: dict[str, str] = {
+    "BFEBaseWidget": "base",
+    "CheckBoxWidget": "binary",
+    "RadioWidget": "binary",
+    "CodeBoxWidget": "code_box",
+    "FileUploadWidget": "file_upload",
+    "LabelWidget": "label",
+    "PopOut": "popout",
+    "TinyThumbnailWidget": "thumbnail",
+    "TitleWidget": "title",
+    "NavBarWidget": "navbar",
+    "TableWidget": "table",
+    "SecretToggleCharWidget": "secret",
+    "HyperlinkWidget": "hyperlink",
+    "RadioGroupWidget": "radio_group",
+    "InlineGroupWidget": "inline_group",
+    "CharInputWidget": "char_input",
+    "CardWidget": "card",
+    "TextEditorWidget": "text_editor",
+    "DatePickerConfig": "datepicker",
+    "DropdownConfig": "dropdown",
+    "TagInputWidget": "tag_input",
+    "BFEFormWidget": "form",
+    "InlineFormWidget": "inline_form",
+    "ButtonWidget": "button",
+    "ParagraphWidget": "paragraph",
+    "DocumentViewerWidget": "document_viewer",
+    "DocumentLinkWidget": "document_link",
+    "DataFilterWidget": "data_filter",
+}
+
+# config class (under byefrontend.configs) -> submodule registering its builder
+_BUILDERS: dict[str, str] = {
+    "binary.CheckBoxConfig": "binary",
+    "binary.RadioConfig": "binary",
+    "button.ButtonConfig": "button",
+    "card.CardConfig": "card",
+    "code_box.CodeBoxConfig": "code_box",
+    "data_filter.DataFilterConfig": "data_filter",
+    "datepicker.DatePickerConfig": "datepicker",
+    "document_link.DocumentLinkConfig": "document_link",
+    "dropdown.DropdownConfig": "dropdown",
+    "file_upload.FileUploadConfig": "file_upload",
+    "form.FormConfig": "form",
+    "hyperlink.HyperlinkConfig": "hyperlink",
+    "inline_form.InlineFormConfig": "inline_form",
+    "inline_group.InlineGroupConfig": "inline_group",
+    "input.TextInputConfig": "char_input",
+    "label.LabelConfig": "label",
+    "navbar.NavBarConfig": "navbar",
+    "paragraph.ParagraphConfig": "paragraph",
+    "popout.PopOutConfig": "popout",
+    "radio_group.RadioGroupConfig": "radio_group",
+    "secret.SecretToggleConfig": "secret",
+    "table.TableConfig": "table",
+    "tag_input.TagInputConfig": "tag_input",
+    "text_editor.TextEditorConfig": "text_editor",
+    "title.TitleConfig": "title",
+}
+
+_CONFIGS = f"{__name__.rpartition('.')[0]}.configs"
+for _cfg, _module in _BUILDERS.items():
+    ChildBuilderRegistry.register_lazy(f"{_CONFIGS}.{_cfg}", f"{__name__}.{_module}")
+del _cfg, _module
+
+
+def __getattr__(name: str):
+    try:
+        module = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
+
+
+def import_all() -> None:
+    """import every widget module (their classes and builders register on import)"""
+    for module in dict.fromkeys((*_EXPORTS.values(), *_BUILDERS.values())):
+        import_module(f".{module}", __name__)
+
 
 __all__ = (
     "BFEBaseWidget",
@@ -1,29 +1,93 @@
 from __future__ import annotations
-import uuid
+import weakref
+from collections import Counter
 from types import MappingProxyType
 from dataclasses import replace
 from typing import Iterable, Set, Any
-from django.conf import settings
 from django.forms.widgets import Media, Widget as _DjangoWidget
 from django.urls import reverse
 from django.utils.safestring import mark_safe
+from ..configs import fingerprint
 from ..configs.base import WidgetConfig
+from ..cache import cache_enabled, get_render_cache, make_key
+from ..ids import derive_id, page_sequence
+from ..media import tree_media
+from ..trees import current_binding
+
+
+class _Attrs(dict):
+    """
+    a widget's mutable attrs: changing them in place (``widget.attrs["foo"] = …``)
+    drops the owner's render and identity memos like assigning new attrs does
+    """
+
+    def __init__(self, owner, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._owner = weakref.ref(owner)
+
+    def _changed(self):
+        owner = self._owner()
+        if owner is not None:
+            owner._invalidate_render_cache()
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._changed()
 
 
 class BFEBaseWidget:
     """
-    Unified widget base-class with future centralised cache handling.
+    Unified widget base-class with centralised cache handling.
 
     - only implements `_render()` and (optionally) `Media`; never touches _needs_render_recache / cached_render / etc
-    - If you turn the global flag  `settings.BFE_WIDGET_CACHE`  to True you’ll hit a `NotImplementedError`
+    - containers implement `_render_into(buf, …)` instead and call `child.render_into(buf, …)`,
+      so nested output is appended to one shared list rather than re-copied at every level
+    - turn the global flag  `settings.BFE_WIDGET_CACHE`  on to serve HTML and Media from the
+      backend configured in `settings.BFE_WIDGET_CACHE_BACKEND` (see :mod:`byefrontend.cache`)
+    - widgets whose output depends on per-request state set `cacheable = False`; a tree is only
+      cached when every widget in it is cacheable
     """
     DEFAULT_CONFIG: WidgetConfig = WidgetConfig()
     DEFAULT_NAME: str = "widget"
     aria_label: str | None = None # subclasses may override
+    cacheable: bool = True  # False -> output depends on request/bound state, never shared
+    static_media: bool = True  # False -> overrides media/_compute_media, asked directly (see byefrontend.media)
     cache_relevant_attrs: Set[str] = {
         # *Any* mutation of these attrs invalidates the cached HTML.
         "name", "id", "classes", "attrs",
-        "label", "help_text", "required", "children",
+        "label", "help_text", "required", "children", "_children",
     }
 
     def __init__(self,
@@ -40,6 +104,7 @@ class BFEBaseWidget:
 
 
         self.parent = parent
+        self._child_id_counts: Counter = Counter()  # id key -> children built so far
         self.name = config.name
         self.id = config.html_id or self._generate_id()
         self.label = config.label
@@ -47,18 +112,36 @@ class BFEBaseWidget:
         self.required = config.required
         self.value = None
 
-        self._attrs: dict = dict(config.attrs)  # local, mutable copy
+        self._attrs: dict = _Attrs(self, config.attrs)  # local, mutable copy
 
-        self._render_cache_valid = False
-        self._cached_render: str = ""
+        # (key, html) in one attribute so shared trees never pair a key with another call's html
+        self._render_memo: tuple[str, str] | None = None
+        self._identity_key: str | None = None
+        self._cacheable: bool | None = None  # `_is_cacheable()` memo
         self._media_cache_valid = False
         self._cached_media: Media | None = None
 
         self._children = MappingProxyType({})
 
-    @staticmethod
-    def _generate_id() -> str:
-        return uuid.uuid4().hex
+    @classmethod
+    def _id_key(cls, config: WidgetConfig) -> str:
+        """the structural part of an id: widget class + config name, never the content"""
+        return f"{cls.__module__}.{cls.__qualname__}:{config.name}"
+
+    def _generate_id(self) -> str:
+        """
+        Deterministic id: position in the tree + class + config name.
+        siblings sharing both are told apart by their occurrence number,
+        roots by the request-scoped page counter (see :mod:`byefrontend.ids`).
+        O(1) – table rows, pages or cursors never go into it.
+        """
+        key = self._id_key(self.config)
+        parent = self.parent
+        if parent is None:
+            return derive_id("root", key, page_sequence(key))
+        n = parent._child_id_counts[key]
+        parent._child_id_counts[key] = n + 1
+        return derive_id(parent.id, key, n)
 
     # attrs proxied so templates can still do widget.attrs["foo"] = …
     @property
@@ -69,7 +152,7 @@ class BFEBaseWidget:
     def attrs(self, value: dict):
         if not isinstance(value, dict):
             raise TypeError("attrs must be a dict, got %r" % type(value))
-        self._attrs = value
+        self._attrs = _Attrs(self, value)
         self._invalidate_render_cache()
 
     def __setattr__(self, name, value):
@@ -83,37 +166,122 @@ class BFEBaseWidget:
 
     def render(self, name: str = None, value: object | None = None, attrs=None, renderer=None, **kwargs):
         """
-        Single source of truth for caching strategy.
+        HTML of this widget (and its subtree) as one safe string – a thin
+        wrapper that joins what `render_into()` appended.
+        """
+        buf: list[str] = []
+        self.render_into(buf, name, value, attrs=attrs, renderer=renderer, **kwargs)
+        return mark_safe(buf[0] if len(buf) == 1 else "".join(buf))
+
+    def render_into(self, buf: list[str], name: str = None, value: object | None = None,
+                    attrs=None, renderer=None, **kwargs) -> None:
+        """
+        Append this widget's HTML to *buf*; the single source of truth for caching strategy.
 
         - If global cache flag is *off*  -> always compute fresh HTML.
         - If caller passes *attrs*       -> consider it unique, bypass cache.
-        - Otherwise                      -> cached HTML when valid.
-        """
-        use_cache = bool(getattr(settings, "BFE_WIDGET_CACHE", False))
+        - If the tree is not cacheable   -> always compute fresh HTML.
+        - Otherwise                      -> per-instance memo, then shared backend, then `_render_into()`.
 
-        if attrs or not use_cache:
-            return self._render(name, value, attrs=attrs, renderer=renderer, **kwargs)
+        Containers pass the same *buf* down to their children, so a page is
+        assembled with one final join instead of one copy per nesting level.
+        """
+        if attrs or not cache_enabled():
+            self._render_into(buf, name, value, attrs=attrs, renderer=renderer, **kwargs)
+            return
+
+        key = self._render_cache_key(name, value, **kwargs)
+        if key is None:
+            self._render_into(buf, name, value, renderer=renderer, **kwargs)
+            return
+
+        memo = self._render_memo
+        if memo is not None and memo[0] == key:
+            buf.append(memo[1])
+            return
+
+        backend = get_render_cache()
+        html = backend.get(key)
+        if html is None:
+            start = len(buf)
+            self._render_into(buf, name, value, renderer=renderer, **kwargs)
+            html = "".join(buf[start:])  # one copy, only when filling the cache
+            backend.set(key, html)
+        else:
+            buf.append(html)
+
+        self._render_memo = (key, mark_safe(html))
+
+    def _is_cacheable(self) -> bool:
+        """
+        every widget in the tree is `cacheable` and has a config fingerprint –
+        a QuerySet or an object without a stable identity in the config means
+        the output can change while the key would not (see configs._fingerprint).
+        worked out once per tree: memoised until the next `_invalidate_render_cache()`
+        """
+        if self._cacheable is None:
+            self._cacheable = self.cacheable and self.config.fingerprint is not None and all(
+                getattr(child, "_is_cacheable", lambda: False)()
+                for child in self.children.values()
+            )
+        return self._cacheable
 
-        if not self._render_cache_valid:
-            self._cached_render = self._render(name, value, renderer=renderer, **kwargs)
-            self._render_cache_valid = True
+    def _cache_identity(self) -> str:
+        """
+        Digest of everything *structural* the output depends on: class, config,
+        id, mutable instance attrs and (recursively) the children.
+        memoised until the next `_invalidate_render_cache()`.
+        """
+        if self._identity_key is None:
+            cls = type(self)
+            self._identity_key = make_key(
+                f"{cls.__module__}.{cls.__qualname__}",
+                self.config.fingerprint,
+                self.id, self.name, self.label, self.help_text, self.required,
+                sorted(self._attrs.items(), key=lambda kv: kv[0]),
+                tuple(child._cache_identity() for child in self.children.values()),
+            )
+        return self._identity_key
 
-        return self._cached_render
+    def _render_cache_key(self, name, value, **kwargs) -> str | None:
+        """
+        Key for one `render()` call, or *None* when the call must not be cached.
+        value, render kwargs and bindings are keyed by their `fingerprint`, so
+        anything without a trustworthy content identity (model instances,
+        opaque objects, …) makes the call uncacheable.
+        """
+        if not self._is_cacheable():
+            return None
+        bound = current_binding()  # per-request state of shared trees, see byefrontend.trees
+        state = fingerprint((name, value, sorted(kwargs.items()), sorted(bound.items())))
+        if state is None:
+            return None
+        return make_key(self._cache_identity(), state)
 
     def _render(self, name, value, attrs=None, renderer=None, **kwargs) -> str:
         """
-        subclasses implement this
+        subclasses implement this (leaf widgets) or `_render_into` (containers)
         """
-        raise NotImplementedError
+        if type(self)._render_into is BFEBaseWidget._render_into:
+            raise NotImplementedError
+        buf: list[str] = []
+        self._render_into(buf, name, value, attrs=attrs, renderer=renderer, **kwargs)
+        return "".join(buf)
+
+    def _render_into(self, buf: list[str], name, value, attrs=None, renderer=None, **kwargs) -> None:
+        """
+        append-style rendering; defaults to one `_render()` call so leaf
+        widgets only implement `_render`
+        """
+        buf.append(self._render(name, value, attrs=attrs, renderer=renderer, **kwargs))
 
     @property
     def media(self) -> Media:
-        use_cache = bool(getattr(settings, "BFE_WIDGET_CACHE", False))
-
-        if not use_cache:
+        if not cache_enabled():
             return self._compute_media()
 
         if not self._media_cache_valid:
+            # one tree walk per instance, until `_invalidate_media_cache()`
             self._cached_media = self._compute_media()
             self._media_cache_valid = True
 
@@ -121,28 +289,21 @@ class BFEBaseWidget:
 
     def _compute_media(self) -> Media:
         """
-        walk *immutable* children tree and aggregate Media
+        class media of the whole (immutable) children tree, unioned once per
+        tree by :mod:`byefrontend.media` – no chain of `Media +=` merges
         """
-        if getattr(settings, "BFE_WIDGET_CACHE", False):
-            raise NotImplementedError(
-                "Widget-level caching is ON but no cache backend exists. "
-                "Disable BFE_WIDGET_CACHE before deploying."
-            )
-
-        own_media = Media(css=self.Media.css, js=self.Media.js)
-        child_media = [child.media for child in self.children.values()
-                       if hasattr(child, "media")]
-        for cm in child_media:
-            own_media += cm
-        return own_media
+        return tree_media(self).to_media()
 
     def _invalidate_render_cache(self):
-        self._render_cache_valid = False
+        self._render_memo = None
+        self._identity_key = None
+        self._cacheable = None
         if self.parent is not None:
             self.parent._invalidate_render_cache()
 
     def _invalidate_media_cache(self):
         self._media_cache_valid = False
+        self._identity_key = None
         if self.parent is not None:
             self.parent._invalidate_media_cache()
 
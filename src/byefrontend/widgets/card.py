@@ -1,9 +1,10 @@
 from __future__ import annotations
+from functools import partial
 from typing import Any
 
-from django.utils.safestring import mark_safe
 from ..builders import build_children, ChildBuilderRegistry
 from ..configs.card import CardConfig
+from ..skeleton import skeleton_for, slot
 from .base import BFEBaseWidget
 
 
@@ -25,19 +26,23 @@ class CardWidget(BFEBaseWidget):
 
     cfg = property(lambda self: self.config)
 
-    def _render(self, name: str | None = None, value: Any = None,
-                attrs=None, renderer=None, **kwargs) -> str:
+    def _render_into(self, buf: list[str], name: str | None = None, value: Any = None,
+                     attrs=None, renderer=None, **kwargs) -> None:
+        inner = {
+            f"child:{key}": partial(child.render_into, name=name, value=value, renderer=renderer)
+            for key, child in self.children.items()
+        }
+        skeleton_for(self).write(buf, **inner)
+
+    def _compile_skeleton(self, name=None):
+        """wrapper + heading are static, one slot per child"""
         heading = ""
         if self.cfg.title:
             tag = f"h{min(max(self.cfg.level, 1), 6)}"
             heading = f"<{tag} class='bfe-card-title'>{self.cfg.title}</{tag}>"
 
-        inner = "".join(child.render(name=name, value=value, renderer=renderer)
-                        for child in self.children.values())
-
-        return mark_safe(
-            f"<div id='{self.id}' class='bfe-card'>{heading}{inner}</div>"
-        )
+        inner = "".join(slot(f"child:{key}") for key in self.children)
+        return f"<div id='{self.id}' class='bfe-card'>{heading}{inner}</div>"
 
     # re-uses .bfe-card look
     class Media:
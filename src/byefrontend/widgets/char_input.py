@@ -1,9 +1,9 @@
 from django.utils.safestring import mark_safe
 from .base import BFEFormCompatibleWidget
-from .label import LabelWidget
-from ..configs.label import LabelConfig
+from .label import render_label
 from ..configs.input import TextInputConfig
 from ..builders import ChildBuilderRegistry
+from ..skeleton import skeleton_for, slot
 
 
 class CharInputWidget(BFEFormCompatibleWidget):
@@ -15,6 +15,17 @@ class CharInputWidget(BFEFormCompatibleWidget):
     aria_label = "Text input"
 
     def _render(self, name, value, attrs=None, renderer=None, **kwargs):
+        # initial value precedence: explicit value > attrs["value"]
+        val_attr = ""
+        if value is not None:
+            val_attr = f' value="{value}"'
+        elif (dv := self.attrs.get("value")) is not None:
+            val_attr = f' value="{dv}"'
+
+        return mark_safe(skeleton_for(self, name).fill(value=val_attr))
+
+    def _compile_skeleton(self, name):
+        """everything but the value attribute is fixed by config + name"""
         cfg = self.config
         placeholder = cfg.placeholder or self.attrs.get("placeholder", "")
         required = " required" if cfg.required else ""
@@ -24,28 +35,22 @@ class CharInputWidget(BFEFormCompatibleWidget):
 
         base_id = self.id  # unique, stable
 
-        # initial value precedence: explicit value > attrs["value"]
-        val_attr = ""
-        if value is not None:
-            val_attr = f' value="{value}"'
-        elif (dv := self.attrs.get("value")) is not None:
-            val_attr = f' value="{dv}"'
-
         input_html = (
             f'<input type="{cfg.input_type}" id="{base_id}" name="{name}" '
             f'class="bfe-text-entry-field"'
             f'{f" placeholder=\"{placeholder}\"" if placeholder else ""}'
-            f'{required}{readonly}{disabled}{val_attr}>'
+            f'{required}{readonly}{disabled}{slot("value")}>'
         )
 
         if cfg.is_in_form:
             label_html = ""        # Django’s Form machinery handles <label>
         else:
-            label_cfg = LabelConfig(text=label_txt, html_for=base_id)
-            label_html = LabelWidget(config=label_cfg, parent=self).render()
+            label_html = render_label(self, label_txt, base_id)
 
-        return mark_safe(
-            f'<div class="text-input-wrapper">{label_html}{input_html}</div>'
+        return (
+            f'<div class="{cfg.wrapper_class}">'
+            f'{label_html}{input_html}{cfg.trailing_html}'
+            f'</div>'
         )
 
     class Media:  # todo: create own styling and make secret_field inherit from that
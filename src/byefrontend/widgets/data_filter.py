@@ -3,6 +3,9 @@ import math, html
 from types import MappingProxyType
 from typing import Any, Mapping, Sequence
 from django.utils.safestring import mark_safe
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from django.db.models.query import ModelIterable, ValuesIterable
 from django.http import QueryDict
 from ..configs.data_filter import DataFilterConfig
 from ..configs.inline_form import InlineFormConfig
@@ -11,6 +14,10 @@ from ..widgets.inline_form import InlineFormWidget
 from ..widgets.table       import TableWidget
 from ..widgets.base        import BFEBaseWidget
 from ..builders            import ChildBuilderRegistry
+from ..ids                 import derive_id
+from ..pagination          import (
+    CURSOR_PARAM, NEXT, PREV, LAST, CountResult, encode_cursor, decode_cursor, get_count_strategy,
+)
 
 
 class DataFilterWidget(BFEBaseWidget):
@@ -20,6 +27,7 @@ class DataFilterWidget(BFEBaseWidget):
     """
     DEFAULT_CONFIG = DataFilterConfig()
     aria_label = "Data table with filters & pagination"
+    cacheable = False  # pager links are built from the request's query-string
 
     # shorthand
     cfg = property(lambda self: self.config)
@@ -47,6 +55,10 @@ class DataFilterWidget(BFEBaseWidget):
         self._form = InlineFormWidget(config=form_cfg, parent=self,
                                       request=request)
 
+        self._row_count: CountResult | None = None
+        self._base_query: str | None = None  # see `_href`
+        self._keyset: dict[str, Any] | None = None  # filled by `_keyset_page`
+        self._has_more = False  # a row exists past this page, see `_trim`
         sliced = self._slice_and_sort(self.cfg.data)
 
         tbl_cfg = TableConfig(
@@ -60,49 +72,221 @@ class DataFilterWidget(BFEBaseWidget):
             "table": self._table,
         })
 
+    @property
+    def _page_size(self) -> int:
+        return max(1, min(self.cfg.page_size, self.cfg.max_page_size))
+
+    @property
+    def region_id(self) -> str:
+        """
+        DOM id of the swappable results region. Built from `html_id` or the
+        config name – not from `self.id`, whose page counter only repeats
+        between requests under `WidgetIdScopeMiddleware` – so a fragment
+        request finds its widget again either way.
+        """
+        cfg = self.cfg
+        if cfg.html_id:
+            return f"{cfg.html_id}_results"
+        return f"{derive_id(self._id_key(cfg))}_results"
+
+    @property
+    def _sort_by(self) -> str | None:
+        """
+        `cfg.sort_by` when it names one of `table_fields`, else *None* (default
+        order) – unknown names or relation paths never reach `order_by`
+        """
+        sort_by = self.cfg.sort_by
+        if sort_by and any(f.get("field_name") == sort_by for f in self.cfg.table_fields):
+            return sort_by
+        return None
+
     def _slice_and_sort(self, data: Sequence[Mapping[str, Any]]) -> Sequence[Mapping[str, Any]]:
         cfg = self.cfg
+        psize = self._page_size
+        start = max(cfg.page - 1, 0) * psize
+
+        if self._uses_keyset(data):
+            return self._keyset_page(data, psize)
+        if _is_queryset(data):
+            return self._query_page(data, start, psize)
+
         # optional in-memory sort
-        if cfg.sort_by:
+        sort_by = self._sort_by
+        if sort_by:
             data = sorted(data,
-                          key=lambda r: r.get(cfg.sort_by, ""),
+                          key=lambda r: r.get(sort_by, ""),
                           reverse=(cfg.sort_dir == "desc"))
         # pagination
-        psize = min(cfg.page_size, cfg.max_page_size)
-        start = max(cfg.page - 1, 0) * psize
-        return list(data)[start:start + psize]
+        if not isinstance(data, Sequence):
+            data = list(data)
+        return self._trim(list(data[start:start + psize + 1]), psize)
+
+    def _trim(self, rows: list, psize: int) -> list:
+        """drop the look-ahead row of a *psize* + 1 fetch, remembering whether it was there"""
+        self._has_more = len(rows) > psize
+        return rows[:psize]
+
+    def _query_page(self, qs, start: int, psize: int) -> list[Mapping[str, Any]]:
+        """
+        sort + page pushed down to the database: one ORDER BY … LIMIT/OFFSET
+        query that only ever fetches *psize* rows (+ 1 to tell whether Next leads anywhere).
+        """
+        sort_by = self._sort_by
+        if sort_by:
+            key = f"-{sort_by}" if self.cfg.sort_dir == "desc" else sort_by
+            qs = qs.order_by(key, "pk")  # pk tie-breaker -> stable pages
+        elif not getattr(qs, "ordered", True):
+            qs = qs.order_by("pk")
+
+        return [self._as_row(obj) for obj in self._trim(list(qs[start:start + psize + 1]), psize)]
+
+    def _uses_keyset(self, data) -> bool:
+        # keyset needs Q-lookups -> real QuerySets; in-memory data is cheap to offset anyway
+        return self.cfg.pagination == "keyset" and hasattr(data, "query") and _is_queryset(data)
+
+    def _keyset_page(self, qs, psize: int) -> list[Mapping[str, Any]]:
+        """
+        WHERE (sort, pk) > (cursor) ORDER BY sort, pk LIMIT psize + 1 –
+        the extra row only tells us whether another page exists.
+        """
+        cfg = self.cfg
+        pk = cfg.pk_field
+        if pk == "pk":  # `.values()` rows are keyed by the column, not by "pk"
+            pk = qs.model._meta.pk.attname
+        sort = self._sort_by or pk
+        desc = cfg.sort_dir == "desc"
+        qs = _with_columns(qs, sort, pk)
+        cursor = decode_cursor(cfg.cursor)
+        bounds = None
+        if cursor and cursor["d"] != LAST:
+            bounds = _cursor_bounds(qs.model, (sort, cursor["v"]), (pk, cursor["k"]))
+            if bounds is None:  # values that don't fit the columns -> first page
+                cursor = None
+        direction = cursor["d"] if cursor else NEXT
+
+        # walking backwards (prev / last) == walking forwards in reversed order
+        backwards = direction in (PREV, LAST)
+        descending = desc != backwards
+        ordering = [f"-{sort}" if descending else sort]
+        if sort != pk:
+            ordering.append(f"-{pk}" if descending else pk)
+        qs = qs.order_by(*ordering)
+
+        if bounds is not None:
+            op = "lt" if descending else "gt"
+            value, key = bounds
+            cond = Q(**{f"{sort}__{op}": value})
+            if sort != pk:
+                cond |= Q(**{sort: value, f"{pk}__{op}": key})
+            qs = qs.filter(cond)
+
+        objs = list(qs[:psize + 1])
+        more = len(objs) > psize
+        objs = objs[:psize]
+        if backwards:
+            objs.reverse()
+
+        self._keyset = {
+            "has_prev": more if backwards else cursor is not None,
+            "has_next": direction == PREV if backwards else more,
+            "first": (_field(objs[0], sort), _field(objs[0], pk)) if objs else None,
+            "last": (_field(objs[-1], sort), _field(objs[-1], pk)) if objs else None,
+        }
+        return [self._as_row(obj) for obj in objs]
+
+    def _as_row(self, obj) -> Mapping[str, Any]:
+        """`.values()` rows pass through; model instances expose the table's columns"""
+        if isinstance(obj, Mapping):
+            return obj
+        return {
+            f["field_name"]: getattr(obj, f["field_name"], "")
+            for f in self.cfg.table_fields
+        }
+
+    def _count(self) -> CountResult:
+        """total as reported by `cfg.count_strategy` – asked once per widget"""
+        if self._row_count is None:
+            strategy = get_count_strategy(self.cfg.count_strategy)
+            self._row_count = strategy(self.cfg.data, query_dict=self._query_dict)
+        return self._row_count
+
+    def _total_rows(self) -> int:
+        return self._count().total
 
     def _total_pages(self) -> int:
-        return max(1, math.ceil(len(self.cfg.data) / max(1, self.cfg.page_size)))
+        return max(1, math.ceil(self._total_rows() / self._page_size))
+
+    def _keyset_controls(self) -> str:
+        """First / Prev / Next / Last driven by cursor tokens – no page numbers, no COUNT(*)"""
+        state = self._keyset
+        if not state["has_prev"] and not state["has_next"]:
+            return ""
+
+        def _link(label: str, cursor: str | None, disabled: bool) -> str:
+            if disabled:
+                return _disabled(label)
+            href = self._href(CURSOR_PARAM, cursor) if cursor is not None else self._href()
+            return f'<a href="{href}" class="bfe-btn">{label}</a>'
+
+        no_prev, no_next = not state["has_prev"], not state["has_next"]
+        prev_cursor = encode_cursor(PREV, *state["first"]) if not no_prev else None
+        next_cursor = encode_cursor(NEXT, *state["last"]) if not no_next else None
+
+        return (
+            f'<nav id="{self.id}_pager" class="bfe-inline-group pagination" '
+            f'style="gap:.5rem;justify-content:center;margin-top:var(--gap-md);">'
+            f'{_link("« First", None, no_prev)}'
+            f'{_link("« Prev", prev_cursor, no_prev)}'
+            f'{_link("Next »", next_cursor, no_next)}'
+            f'{_link("Last »", encode_cursor(LAST), no_next)}'
+            f'</nav>'
+        )
+
+    def _href(self, param: str | None = None, value: str = "") -> str:
+        """
+        ``?<filters & sorts>&param=value`` – the query-string minus page/cursor is
+        url-encoded and html-escaped once per widget, links only append to it.
+        """
+        if self._base_query is None:
+            base = self._query_dict.copy()
+            base.pop('page', None)
+            base.pop(CURSOR_PARAM, None)
+            self._base_query = html.escape(base.urlencode())
+        query = self._base_query
+        if param is None:
+            return f"?{query}"
+        sep = "&amp;" if query else ""
+        return f"?{query}{sep}{param}={html.escape(value)}"
 
     def _pagination_controls(self) -> str:
         """
         Pager with:
         - First / Prev / Next / Last buttons
-        - an <input type="number"> to jump directly to any page
-        - tiny inline JS to keep all other query-string parameters
-          intact when navigating.
+        - an <input type="number"> to jump directly to any page; the
+          jump itself lives in ``data_filter.js`` (`data-bfe-page-url` + n)
         """
+        if self._keyset is not None:
+            return self._keyset_controls()
+
         page = self.cfg.page
+        count = self._count()
         last = self._total_pages()
-        if last == 1:  # nothing to paginate
+        if last == 1 and count.exact:  # nothing to paginate
             return ""
 
+        # capped  -> "/ 40+" : more pages may exist, the real last page is unknown
+        # estimate -> "/ ≈40": Last jumps to the approximate end
+        capped = count.kind == "capped"
+        last_label = {"capped": f"{last}+", "estimated": f"≈{last}"}.get(count.kind, str(last))
+        max_attr = f' max="{last}"' if count.exact else ""
+
+        page_url = self._href("page", "")  # "?…&page=" – append the number
+
         # helper to emit either <a …> or a disabled <span …>
         def _link(label: str, target: int, disabled: bool = False) -> str:
             if disabled:
-                return (
-                    '<span class="bfe-btn" '
-                    'style="opacity:.5;cursor:default;">'
-                    f'{label}</span>'
-                )
-
-            # merge *all* current GET params with new page number
-            query_dict = self._query_dict.copy()
-            query_dict['page'] = str(target)
-            query = query_dict.urlencode()
-
-            return f'<a href="?{html.escape(query)}" class="bfe-btn">{label}</a>'
+                return _disabled(label)
+            return f'<a href="{page_url}{target}" class="bfe-btn">{label}</a>'
 
         pager_id = f"{self.id}_pager"  # unique per widget
 
@@ -115,45 +299,96 @@ class DataFilterWidget(BFEBaseWidget):
             # numeric jump-field
             f'<span>Page</span>'
             f'<input type="number" id="{pager_id}_input" value="{page}" '
-            f'min="1" max="{last}" style="width:4rem;text-align:center;">'
-            f'<span>/ {last}</span>'
-            f'<button type="button" class="bfe-btn" id="{pager_id}_go">Go</button>'
+            f'min="1"{max_attr} data-bfe-page-url="{page_url}" '
+            f'style="width:4rem;text-align:center;">'
+            f'<span>/ {last_label}</span>'
+            f'<button type="button" class="bfe-btn" data-bfe-page-go>Go</button>'
 
-            f'{_link("Next »", page + 1, page == last)}'
-            f'{_link("Last »", last, page == last)}'
+            f'{_link("Next »", page + 1, not self._has_more)}'
+            f'{_link("Last »", last, page >= last or capped)}'
             f'</nav>'
-
-            # JS: change only the page= parameter, keep filters & sorts
-            f'<script>(function(){{'
-            f' const go = document.getElementById("{pager_id}_go");'
-            f' const inp = document.getElementById("{pager_id}_input");'
-            f' if(!go||!inp) return;'
-            f' const jump = () => {{'
-            f'   const n = parseInt(inp.value,10);'
-            f'   if(!n||n<1||n>{last}) return;'
-            f'   const url = new URL(window.location);'
-            f'   url.searchParams.set("page", n);'
-            f'   window.location.href = url;'
-            f' }};'
-            f' go.addEventListener("click", jump);'
-            f' inp.addEventListener("keydown", e=>{{if(e.key==="Enter"){{e.preventDefault();jump();}}}});'
-            f'}})();</script>'
         )
 
-    def _render(self, *_, **__) -> str:
-        form_html = self._form.render()
-        table_html = self._table.render()
-        pager_html = self._pagination_controls()
+    def render_fragment(self) -> str:
+        """table + pager only – what a fragment request swaps into the page"""
+        buf: list[str] = []
+        self._fragment_into(buf)
+        return mark_safe("".join(buf))
 
-        return mark_safe(
-            f'<section id="{self.id}" class="bfe-card">'
-            f'{form_html}{table_html}{pager_html}'
-            f'</section>'
-        )
+    def _fragment_into(self, buf: list[str]) -> None:
+        self._table.render_into(buf)
+        buf.append(self._pagination_controls())
+
+    def _render_into(self, buf: list[str], *_, **__) -> None:
+        if self.cfg.fragments:
+            buf.append(f'<section id="{self.id}" class="bfe-card" data-bfe-datafilter>')
+            self._form.render_into(buf)
+            buf.append(f'<div id="{self.region_id}" data-bfe-fragment aria-live="polite">')
+            self._fragment_into(buf)
+            buf.append('</div></section>')
+            return
+
+        buf.append(f'<section id="{self.id}" class="bfe-card">')
+        self._form.render_into(buf)
+        self._fragment_into(buf)
+        buf.append('</section>')
 
     class Media:
         css = {}
-        js = ()
+        js = ("byefrontend/js/data_filter.js",)
+
+
+def _disabled(label: str) -> str:
+    return (
+        '<span class="bfe-btn" '
+        'style="opacity:.5;cursor:default;">'
+        f'{label}</span>'
+    )
+
+
+def _field(obj, name: str):
+    return obj[name] if isinstance(obj, Mapping) else getattr(obj, name)
+
+
+def _with_columns(qs, *names: str):
+    """
+    *qs* with *names* added to its `.values(...)` columns – the cursor is read
+    from the page's first / last row, so those rows must carry sort + pk
+    """
+    fields = getattr(qs, "_fields", None)
+    if not issubclass(getattr(qs, "_iterable_class", ValuesIterable), (ModelIterable, ValuesIterable)):
+        raise ValueError("keyset pagination needs model instances or .values() rows, "
+                         "not .values_list()")
+    if not fields:  # model instances, or `.values()` with every column
+        return qs
+    missing = [name for name in dict.fromkeys(names) if name not in fields]
+    return qs.values(*fields, *missing) if missing else qs
+
+
+def _cursor_bounds(model, *pairs):
+    """
+    the cursor's (column, value) *pairs* converted by the model fields'
+    ``to_python``, or *None* when a value can't be a bound for its column
+    """
+    bounds = []
+    for name, value in pairs:
+        if not isinstance(value, (str, int, float)):  # lists, dicts, NULL …
+            return None
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except FieldDoesNotExist:  # annotation / related path: let the ORM coerce it
+            bounds.append(value)
+            continue
+        try:
+            bounds.append(field.to_python(value))
+        except (ValidationError, TypeError, ValueError):
+            return None
+    return tuple(bounds)
+
+
+def _is_queryset(data) -> bool:
+    """duck-typed: anything with `order_by` + slicing + `count()` (QuerySet & friends)"""
+    return hasattr(data, "order_by") and hasattr(data, "count")
 
 
 @ChildBuilderRegistry.register(DataFilterConfig)
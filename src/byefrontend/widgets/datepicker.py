@@ -1,9 +1,8 @@
 from __future__ import annotations
 from django.utils.safestring import mark_safe
 from .base import BFEFormCompatibleWidget
-from .label import LabelWidget
+from .label import render_label
 from ..builders import ChildBuilderRegistry
-from ..configs.label import LabelConfig
 from ..configs.datepicker import DatePickerConfig
 
 
@@ -45,8 +44,7 @@ class DatePickerWidget(BFEFormCompatibleWidget):
         if cfg.is_in_form:
             label_html = ""
         else:
-            label_cfg = LabelConfig(text=cfg.label or name, html_for=base_id)
-            label_html = LabelWidget(config=label_cfg, parent=self).render()
+            label_html = render_label(self, cfg.label or name, base_id)
 
         return mark_safe(
             f'<div class="text-input-wrapper">{label_html}{input_html}</div>'
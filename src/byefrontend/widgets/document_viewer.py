@@ -11,6 +11,7 @@ from ..configs.document_viewer import DocumentViewerConfig
 
 class DocumentViewerWidget(BFEBaseWidget):
     DEFAULT_CONFIG = DocumentViewerConfig()
+    static_media = False  # media depends on the config, see `_compute_media`
     aria_label = "Document viewer"
 
     cfg = property(lambda self: self.config)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 from django.utils.safestring import mark_safe
 from .base import BFEFormCompatibleWidget
-from .label import LabelWidget
+from .label import render_label
 from ..builders import ChildBuilderRegistry
-from ..configs.label import LabelConfig
+from ..skeleton import skeleton_for, slot
 from ..configs.dropdown import DropdownConfig
 
 
@@ -17,6 +17,20 @@ class DropdownWidget(BFEFormCompatibleWidget):
     cfg = property(lambda self: self.config)
 
     def _render(self, name, value, attrs=None, renderer=None, **kwargs):
+        cfg = self.cfg
+        selected = {}
+        if cfg.placeholder and cfg.selected is None and value is None:
+            selected["sel_ph"] = " selected"
+
+        current = value if value is not None else cfg.selected
+        for i, (val, _label) in enumerate(cfg.choices):
+            if val == current:
+                selected[f"sel_{i}"] = " selected"
+
+        return mark_safe(skeleton_for(self, name).fill(**selected))
+
+    def _compile_skeleton(self, name):
+        """options, label & wrapper are static – only the `selected` flags are slots"""
         cfg = self.cfg
         base_id = self.id
         required = " required" if cfg.required else ""
@@ -24,15 +38,12 @@ class DropdownWidget(BFEFormCompatibleWidget):
 
         opts = []
         if cfg.placeholder:
-            ph_sel = " selected" if (cfg.selected is None and value is None) else ""
             opts.append(
-                f'<option value="" disabled{ph_sel}>{cfg.placeholder}</option>'
+                f'<option value="" disabled{slot("sel_ph")}>{cfg.placeholder}</option>'
             )
 
-        current = value if value is not None else cfg.selected
-        for val, label in cfg.choices:
-            sel = " selected" if val == current else ""
-            opts.append(f'<option value="{val}"{sel}>{label}</option>')
+        for i, (val, label) in enumerate(cfg.choices):
+            opts.append(f'<option value="{val}"{slot(f"sel_{i}")}>{label}</option>')
 
         select_html = (
             f'<select id="{base_id}" name="{name}" '
@@ -43,12 +54,9 @@ class DropdownWidget(BFEFormCompatibleWidget):
         if cfg.is_in_form:
             label_html = ""
         else:
-            label_cfg = LabelConfig(text=cfg.label or name, html_for=base_id)
-            label_html = LabelWidget(config=label_cfg, parent=self).render()
+            label_html = render_label(self, cfg.label or name, base_id)
 
-        return mark_safe(
-            f'<div class="text-input-wrapper">{label_html}{select_html}</div>'
-        )
+        return f'<div class="text-input-wrapper">{label_html}{select_html}</div>'
 
     class Media:
         css = {"all": ("byefrontend/css/dropdown.css",)}
@@ -2,18 +2,23 @@ from __future__ import annotations
 import json
 from dataclasses import replace
 from typing import Sequence, Mapping
-from django.utils.safestring import mark_safe
 from .base import BFEBaseWidget
 from ..builders import ChildBuilderRegistry
 from ..configs.file_upload import FileUploadConfig
 from ..widgets.card import CardWidget
 from ..configs.card  import CardConfig
 from ..configs.table import TableConfig
-from ..widgets.label import LabelWidget
-from ..configs.label import LabelConfig
+from ..widgets.label import render_label
+from ..cache import LRURenderCache, make_key
+from ..skeleton import Skeleton, slot
+from ..configs import fingerprint
 from django.forms.widgets import Media
 
 
+_tables_cache = LRURenderCache(maxsize=256)  # upload table skeletons, see `_tables_skeleton`
+_ID_MARK = "__bfe_upload_id__"  # the widget id while the tables are built
+
+
 # todo: should this also be a form widget?
 class FileUploadWidget(BFEBaseWidget):
     """
@@ -21,6 +26,7 @@ class FileUploadWidget(BFEBaseWidget):
     """
 
     DEFAULT_CONFIG = FileUploadConfig()
+    static_media = False  # media depends on the config, see `_compute_media`
 
     # static default for the four legacy columns.  Users may extend or replace by tweaking config fields
     _DEFAULT_FIELDS: Sequence[Mapping[str, object]] = (
@@ -58,73 +64,66 @@ class FileUploadWidget(BFEBaseWidget):
 
     cfg = property(lambda self: self.config)
 
-    def _render(self, name: str | None = None, value=None,
-                attrs=None, renderer=None, **__):
+    def _render_into(self, buf: list[str], name: str | None = None, value=None,
+                     attrs=None, renderer=None, **__) -> None:
         input_id = f"{self.id}_input"
 
+        # render <label> unless the widget is embedded in a Django Form
+        # InlineFormWidget sets ``is_in_form=True`` so the label appears
+        # inline with the upload control without an extra wrapper.
+        label_html = ""
+        if self.cfg.label:
+            label_html = render_label(self, self.cfg.label, input_id)
+
+        wrapper_style = ''
+        if self.cfg.is_in_form:
+            wrapper_style = ' style="flex-basis:100%;max-width:100%;"'
+
+        buf.append(f'<div class="text-input-wrapper"{wrapper_style}>{label_html}')
+
+        accept_attr = (
+            f' accept="{",".join(self.cfg.filetypes_accepted)}"'
+            if self.cfg.filetypes_accepted else ""
+        )
+
         # single file - styled similarly to the multi-file variant but without JS
         if not self.cfg.can_upload_multiple_files:
-            accept_attr = (
-                f' accept="{",".join(self.cfg.filetypes_accepted)}"'
-                if self.cfg.filetypes_accepted else ""
-            )
             required_attr = " required" if self.cfg.required else ""
-            input_html = (
+            buf.append(
                 f'<div id="{self.cfg.widget_html_id or self.id}"'
                 f' class="bfe-card file-upload-wrapper file-upload-single">'
                 f'  <label id="drop-zone" for="{input_id}">{self.cfg.inline_text}</label>'
                 f'  <input type="file" id="{input_id}"'
                 f'         name="{name or self.id}"{accept_attr}{required_attr}>'
                 f'  <div id="messages"></div>'
-                f'</div>'
-            )
-        else:
-            # multi file: full drag+drop widget with JS tables
-            data_json = json.dumps(self._create_data_json())
-
-            fields_for_tbl = (
-                [{**f, "editable": False} for f in self.cfg.fields]
-                if self.cfg.auto_upload else self.cfg.fields
+                f'</div></div>'
             )
-            tables_html = self._render_tables(fields_for_tbl)
+            return
 
-            upload_all_btn = (
-                '' if self.cfg.auto_upload else
-                '<button type="button" id="upload-all-btn">Upload All</button>'
-            )
-
-            accept_attr = (
-                f' accept="{",".join(self.cfg.filetypes_accepted)}"'
-                if self.cfg.filetypes_accepted else ""
-            )
+        # multi file: full drag+drop widget with JS tables
+        data_json = json.dumps(self._create_data_json())
 
-            input_html = (
-                f'<div id="{self.cfg.widget_html_id or self.id}"'
-                f' class="bfe-card file-upload-wrapper"'
-                f' data-config="{data_json}">'  # JSON passed to file_upload.js
-                f'  <div id="drop-zone">{self.cfg.inline_text}</div>'
-                f'  <input type="file" id="{input_id}" multiple{accept_attr}>'
-                f'  {upload_all_btn}'
-                f'  {tables_html}'
-                f'  <div id="messages"></div>'
-                f'</div>'
-            )
-
-        # render <label> unless the widget is embedded in a Django Form
-        # InlineFormWidget sets ``is_in_form=True`` so the label appears
-        # inline with the upload control without an extra wrapper.
-        label_html = ""
-        if self.cfg.label:
-            lbl_cfg = LabelConfig(text=self.cfg.label, html_for=input_id)
-            label_html = LabelWidget(config=lbl_cfg, parent=self).render()
+        fields_for_tbl = (
+            [{**f, "editable": False} for f in self.cfg.fields]
+            if self.cfg.auto_upload else self.cfg.fields
+        )
 
-        wrapper_style = ''
-        if self.cfg.is_in_form:
-            wrapper_style = ' style="flex-basis:100%;max-width:100%;"'
+        upload_all_btn = (
+            '' if self.cfg.auto_upload else
+            '<button type="button" id="upload-all-btn">Upload All</button>'
+        )
 
-        return mark_safe(
-            f'<div class="text-input-wrapper"{wrapper_style}>{label_html}{input_html}</div>'
+        buf.append(
+            f'<div id="{self.cfg.widget_html_id or self.id}"'
+            f' class="bfe-card file-upload-wrapper"'
+            f' data-config="{data_json}">'  # JSON passed to file_upload.js
+            f'  <div id="drop-zone">{self.cfg.inline_text}</div>'
+            f'  <input type="file" id="{input_id}" multiple{accept_attr}>'
+            f'  {upload_all_btn}'
+            f'  '
         )
+        self._tables_skeleton(fields_for_tbl).write(buf, id=self.id)
+        buf.append('  <div id="messages"></div></div></div>')
 
     def _create_data_json(self) -> Mapping[str, object]:
         """Shape expected by `file_upload.js`."""
@@ -137,11 +136,28 @@ class FileUploadWidget(BFEBaseWidget):
             "fields": list(self.cfg.fields),
         }
 
-    def _render_tables(self, fields: Sequence[Mapping[str, object]]) -> str:
+    def _tables_skeleton(self, fields: Sequence[Mapping[str, object]]) -> Skeleton:
         """
         auto_upload = True  ➜  only the “Uploaded” table is rendered
         auto_upload = False ➜  keep both “To Upload” and “Uploaded”
+
+        the (empty) tables only depend on fields + auto_upload, so the helper
+        Card/Table widgets are built once per shape; the widget id is a
+        skeleton `slot`, filled per render
         """
+        fp = fingerprint(list(fields))
+        key = None if fp is None else make_key(fp, self.cfg.auto_upload)
+        skeleton = None if key is None else _tables_cache.get(key)
+        if skeleton is None:
+            # the cards compile their own skeletons, so they get a plain marker
+            # that becomes our slot once their markup is done
+            skeleton = Skeleton.compile(self._build_tables(fields).replace(_ID_MARK, slot("id")))
+            if key is not None:
+                _tables_cache.set(key, skeleton)
+        return skeleton
+
+    def _build_tables(self, fields: Sequence[Mapping[str, object]]) -> str:
+        """card + table markup with `_ID_MARK` where this widget's id goes"""
         parts: list[str] = []
 
         # show “To Upload” only when users can queue files first
@@ -152,7 +168,8 @@ class FileUploadWidget(BFEBaseWidget):
             )
             to_upload_card = CardWidget(config=CardConfig(
                 title="To Upload", children={"tbl": to_upload_tbl},
-            ), parent=self)
+                html_id=f"{_ID_MARK}_to_upload",
+            ))
             parts.append(to_upload_card.render())
 
         uploaded_tbl = TableConfig(
@@ -161,7 +178,8 @@ class FileUploadWidget(BFEBaseWidget):
         )
         uploaded_card = CardWidget(config=CardConfig(
             title="Uploaded", children={"tbl": uploaded_tbl},
-        ), parent=self)
+            html_id=f"{_ID_MARK}_uploaded",
+        ))
         parts.append(uploaded_card.render())
 
         return f'<div id="lists-container">{"".join(parts)}</div>'
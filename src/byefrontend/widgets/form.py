@@ -1,14 +1,14 @@
 from __future__ import annotations
 import itertools
 import html
+import sys
 from typing import Any, Mapping
 from django import forms
-from django.utils.safestring import mark_safe
 from django.middleware.csrf import get_token
 from .base import BFEBaseWidget
 from ..builders import build_children, ChildBuilderRegistry
 from ..configs.form import FormConfig
-from ..widgets.file_upload import FileUploadWidget
+from ..trees import current_binding
 from ..form_fields import TagListField
 from logging import getLogger
 log = getLogger(__name__)
@@ -27,6 +27,12 @@ WIDGET_TO_FIELD = {
 }
 
 
+def _is_file_upload(widget) -> bool:
+    # no instance can exist before its module is imported, so don't import it here
+    module = sys.modules.get(f"{__package__}.file_upload")
+    return module is not None and isinstance(widget, module.FileUploadWidget)
+
+
 class BFEFormWidget(forms.Form, BFEBaseWidget):
     """
     Bye-Frontend composite form widget – glues Django’s Form plumbing to the
@@ -35,6 +41,8 @@ class BFEFormWidget(forms.Form, BFEBaseWidget):
     """
     DEFAULT_CONFIG = FormConfig()
     aria_label = "Composite Form Widget"
+    cacheable = False  # bound data, errors and CSRF token are per request
+    static_media = False  # adds the media of Django form fields, see `media`
 
     def __init__(
         self,
@@ -85,7 +93,7 @@ class BFEFormWidget(forms.Form, BFEBaseWidget):
             if field_cls is forms.ChoiceField and hasattr(widget, "cfg"):
                 kwargs["choices"] = getattr(widget.cfg, "choices", [])
 
-            if isinstance(widget, FileUploadWidget):
+            if _is_file_upload(widget):
                 kwargs["required"] = False  # file inputs are optional - remember why this is the case?
 
             self.fields[name] = field_cls(**kwargs)
@@ -110,7 +118,7 @@ class BFEFormWidget(forms.Form, BFEBaseWidget):
         fld = self.fields.get(field_name)
         return getattr(fld, "initial", None)
 
-    def _render(self, *_, **__):
+    def _render_into(self, buf: list[str], *_, **__) -> None:
         cfg = self.cfg
         log.debug(
             "BFEFormWidget: csrf=%s  multipart=%s  request=%s",
@@ -119,37 +127,34 @@ class BFEFormWidget(forms.Form, BFEBaseWidget):
             bool(self._request),
         )
         enctype = ""
-        if cfg.multipart or any(isinstance(w, FileUploadWidget) for w in self.children.values()):
+        if cfg.multipart or any(_is_file_upload(w) for w in self.children.values()):
             enctype = ' enctype="multipart/form-data"'
 
         csrf_input = ""
         if cfg.csrf:
-            token = getattr(self._request, "csrf_token", None) or get_token(self._request)
+            token = (current_binding().get("csrf_token")
+                     or getattr(self._request, "csrf_token", None) or get_token(self._request))
             csrf_input = (
                 f'<input type="hidden" name="csrfmiddlewaretoken" value="{token}">'
             )
 
-        inner = "".join(
-            child.render(
-                name=child_name,
-                value=self._initial_for(child_name)
-            )
-            for child_name, child in self.children.items()
+        buf.append(
+            f'<form id="{self.id}" action="{cfg.action}" method="{cfg.method}"{enctype} '
+            f'{self._form_tag_attrs()}>'
+            f'{csrf_input}{self._render_errors()}'
         )
-        errors_html = self._render_errors()
-
-        btn = (
+        for child_name, child in self.children.items():
+            child.render_into(buf, name=child_name, value=self._initial_for(child_name))
+        buf.append(
             f'<button type="submit" class="bfe-btn">'
             f'{html.escape(cfg.submit_text)}</button>'
-        )
-
-        return mark_safe(
-            f'<form id="{self.id}" action="{cfg.action}" method="{cfg.method}"{enctype} '
-            f'class="bfe-form-widget">'
-            f'{csrf_input}{errors_html}{inner}{btn}'
             f'</form>'
         )
 
+    def _form_tag_attrs(self) -> str:
+        """layout hook: class/style attributes of the <form> tag"""
+        return 'class="bfe-form-widget"'
+
     # basic error list styled by .bfe-error-list
     def _render_errors(self):
         if not self.errors:
@@ -1,6 +1,4 @@
 from __future__ import annotations
-from typing import Any
-
 from .form import BFEFormWidget
 from ..configs.inline_form import InlineFormConfig
 from ..builders import ChildBuilderRegistry
@@ -13,18 +11,11 @@ class InlineFormWidget(BFEFormWidget):
 
     cfg = property(lambda self: self.config)
 
-    def _render(self, name: str | None = None, value: Any = None,
-                attrs=None, renderer=None, **kwargs) -> str:
-
-        html = super()._render(name=name, value=value, attrs=attrs, renderer=renderer, **kwargs)
-
-        # first occurrence of  class="bfe-form-widget"
+    def _form_tag_attrs(self) -> str:
         gap = f"{self.cfg.gap}rem"
         wrap = "wrap" if self.cfg.wrap else "nowrap"
-        patch = (f'class="bfe-form-widget bfe-inline-form" '
-                 f'style="display:flex;flex-wrap:{wrap};gap:{gap};"')
-
-        return html.replace('class="bfe-form-widget"', patch, 1)
+        return (f'class="bfe-form-widget bfe-inline-form" '
+                f'style="display:flex;flex-wrap:{wrap};gap:{gap};"')
 
     class Media:
         css = {}
@@ -1,6 +1,5 @@
 from __future__ import annotations
 from typing import Any
-from django.utils.safestring import mark_safe
 from ..configs.inline_group import InlineGroupConfig
 from ..builders import build_children, ChildBuilderRegistry
 from .base import BFEBaseWidget
@@ -25,8 +24,8 @@ class InlineGroupWidget(BFEBaseWidget):
 
     cfg = property(lambda self: self.config)
 
-    def _render(self, name: str | None = None, value: Any = None,
-                attrs=None, renderer=None, **kwargs) -> str:
+    def _render_into(self, buf: list[str], name: str | None = None, value: Any = None,
+                     attrs=None, renderer=None, **kwargs) -> None:
         gap = f"{self.cfg.gap}rem"
         wrap_value = "wrap" if self.cfg.wrap else "nowrap"
 
@@ -36,12 +35,10 @@ class InlineGroupWidget(BFEBaseWidget):
         # rmit inline style so gap / wrapping take effect without extra CSS
         style = f"gap:{gap};flex-wrap:{wrap_value};"
 
-        inner = "".join(child.render(name=name, value=value, renderer=renderer)
-                        for child in self.children.values())
-
-        return mark_safe(
-            f'<div id="{self.id}" class="{classes}" style="{style}">{inner}</div>'
-        )
+        buf.append(f'<div id="{self.id}" class="{classes}" style="{style}">')
+        for child in self.children.values():
+            child.render_into(buf, name=name, value=value, renderer=renderer)
+        buf.append('</div>')
 
     class Media:
         css = {"all": ("byefrontend/css/inline_group.css",)}
@@ -12,15 +12,26 @@ class LabelWidget(BFEBaseWidget):
 
     def _render(self, name=None, value=None, attrs=None, renderer=None, **kwargs):
         cfg = self.config
-
-        classes = ("bfe-label", *cfg.classes)
-        class_attr = " ".join(classes)
-
-        for_attr = f' for="{cfg.html_for}"' if cfg.html_for else ""
-        return mark_safe(
-            f'<{cfg.tag}{for_attr} id="{self.id}" '
-            f'class="{class_attr}">{cfg.text}</{cfg.tag}>'
-        )
+        return label_html(self.id, cfg.text, cfg.html_for, cfg.tag, cfg.classes)
+
+
+def label_html(label_id: str, text, html_for: str | None = None,
+               tag: str = "label", classes=()) -> str:
+    """the markup of a LabelWidget as a pure function"""
+    class_attr = " ".join(("bfe-label", *classes))
+    for_attr = f' for="{html_for}"' if html_for else ""
+    return mark_safe(
+        f'<{tag}{for_attr} id="{label_id}" '
+        f'class="{class_attr}">{text}</{tag}>'
+    )
+
+
+def render_label(owner, text, html_for: str | None = None) -> str:
+    """
+    flyweight path for a widget's own <label>: no throwaway LabelConfig /
+    LabelWidget per render, the id is simply derived from the owner's
+    """
+    return label_html(f"{owner.id}_label", text, html_for)
 
 
 @ChildBuilderRegistry.register(LabelConfig)
@@ -1,11 +1,11 @@
 from __future__ import annotations
 import json
-import uuid
 from django.utils.safestring import mark_safe
 from ..configs import NavBarConfig, HyperlinkConfig
 from .base import BFEBaseWidget
 from .hyperlink import HyperlinkWidget
 from ..builders import build_children, ChildBuilderRegistry
+from ..trees import current_binding
 
 
 class NavBarWidget(BFEBaseWidget):
@@ -63,7 +63,8 @@ class NavBarWidget(BFEBaseWidget):
 
     @property
     def selected_id(self):
-        return self.cfg.selected_id
+        # shared trees get the per-request selection via `byefrontend.trees.bind`
+        return current_binding().get("selected_id", self.cfg.selected_id)
 
     def _render(self, name=None, value=None, attrs=None, renderer=None, **kwargs):
         """
@@ -71,7 +72,7 @@ class NavBarWidget(BFEBaseWidget):
         `navbar.js`, fed via a JSON blob emitted here.
         """
         payload = self.to_json()
-        payload["selected_id"] = self.cfg.selected_id
+        payload["selected_id"] = self.selected_id
         data_json = json.dumps(payload)
         return mark_safe(
             f"""
@@ -86,7 +87,7 @@ class NavBarWidget(BFEBaseWidget):
 
     def _own_json(self):
         return {
-            "uid": uuid.uuid4().hex,
+            "uid": self.id,
             "name": self.cfg.name,
             "text": self.cfg.text,
             "title_button": self.cfg.title_button,
@@ -1,12 +1,11 @@
 from __future__ import annotations
-import uuid
 from typing import Any, Mapping
-from django.utils.safestring import mark_safe
 from django.forms.widgets import Media
 from .base import BFEBaseWidget
 from ..configs import WidgetConfig
 from ..configs.popout import PopOutConfig
 from ..builders import ChildBuilderRegistry
+from ..skeleton import skeleton_for, slot
 from ..widgets.code_box import CodeBoxWidget
 from ..configs.code_box import CodeBoxConfig
 
@@ -63,10 +62,14 @@ class PopOut(BFEBaseWidget):
     cfg = property(lambda self: self.config)
     _content = property(lambda self: self.children["content"])
 
-    def _render(self, *_, **__) -> str:
-        uid = uuid.uuid4().hex
+    def _render_into(self, buf: list[str], *_, **__) -> None:
+        skeleton_for(self).write(buf, content=self._content.render_into)
+
+    def _compile_skeleton(self, name=None):
+        """the dialog chrome is static, only the content is a slot"""
+        uid = self.id
         title = self.cfg.title or "Dialog"
-        inner_html = self._content.render()
+        inner_html = slot("content")
 
         dialog_html = f"""
                 <button type="button"
@@ -96,7 +99,7 @@ class PopOut(BFEBaseWidget):
                   </form>
                 </dialog>
                 """
-        return mark_safe(dialog_html)
+        return dialog_html
 
     class Media:
         css = {"all": ("byefrontend/css/popout.css",)}
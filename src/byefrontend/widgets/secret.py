@@ -1,5 +1,5 @@
 from __future__ import annotations
-from django.utils.safestring import mark_safe
+from types import MappingProxyType
 from .char_input import CharInputWidget
 from .base import BFEBaseWidget, BFEFormCompatibleWidget
 from ..builders import ChildBuilderRegistry
@@ -11,24 +11,12 @@ class SecretToggleCharWidget(BFEFormCompatibleWidget):
     DEFAULT_CONFIG = SecretToggleConfig()
     aria_label = "Toggle Secret Field Visibility"
 
-    def _render(self, name, value, attrs=None, renderer=None, **kwargs):
+    def __init__(self, config: SecretToggleConfig | None = None, *, parent=None, **overrides):
+        super().__init__(config=config, parent=parent, **overrides)
         cfg = self.config
-
         base_id = f"secret-field_{self.id}"
-        char_cfg = TextInputConfig.build(
-            html_id = base_id,
-            label = cfg.label or name,
-            placeholder = cfg.placeholder,
-            required = cfg.required,
-            input_type = "password",
-            is_in_form = cfg.is_in_form,
-            classes = ("secret-entry-field",),
-        )
-        char_widget = CharInputWidget(config=char_cfg, parent=self)
-
-        inner_html = char_widget.render(name, value, attrs=attrs, renderer=renderer)
 
-        # eye-toggle button
+        # eye-toggle button, emitted by the inner input inside its wrapper
         toggle_html = (
             f'<button type="button" class="secret-entry-toggle" '
             f'data-bs-toggle="password" '
@@ -39,11 +27,22 @@ class SecretToggleCharWidget(BFEFormCompatibleWidget):
             f'</button>'
         )
 
-        final_html = inner_html.replace("</div>", f"{toggle_html}</div>")
-
-        final_html = final_html.replace("text-input-wrapper", "secret-input-wrapper", 1)
+        # built once; the label falls back to the field name at render time
+        char_cfg = TextInputConfig.build(
+            html_id = base_id,
+            label = cfg.label,
+            placeholder = cfg.placeholder,
+            required = cfg.required,
+            input_type = "password",
+            is_in_form = cfg.is_in_form,
+            classes = ("secret-entry-field",),
+            wrapper_class = "secret-input-wrapper",
+            trailing_html = toggle_html,
+        )
+        self._children = MappingProxyType({"input": CharInputWidget(config=char_cfg, parent=self)})
 
-        return mark_safe(final_html)
+    def _render_into(self, buf: list[str], name, value, attrs=None, renderer=None, **kwargs) -> None:
+        self.children["input"].render_into(buf, name, value, attrs=attrs, renderer=renderer)
 
     class Media:
         css = {"all": ("byefrontend/css/secret_field.css",)}
@@ -1,10 +1,17 @@
 from __future__ import annotations
-from typing import Sequence, Mapping
-from django.utils.safestring import mark_safe
+from typing import Callable, Iterable, Iterator, Sequence, Mapping
 from .base import BFEBaseWidget
 from ..builders import ChildBuilderRegistry
+from ..cache import LRURenderCache
+from ..configs import fingerprint
 from ..configs.table import TableConfig
 
+# one "<td>…</td>" for one row
+CellRenderer = Callable[[Mapping[str, object]], str]
+
+# compiled schemas are pure functions of `fields` -> share them process-wide
+_compiled_schemas = LRURenderCache(maxsize=256)
+
 
 class TableWidget(BFEBaseWidget):
     """
@@ -32,38 +39,91 @@ class TableWidget(BFEBaseWidget):
     # Convenience alias
     cfg = property(lambda self: self.config)
 
-    def _render(self, name=None, value=None, attrs=None, renderer=None, **kwargs):
-        html = self._render_table(
-            data=list(self.cfg.data),
+    def _render_into(self, buf: list[str], name=None, value=None, attrs=None, renderer=None, **kwargs):
+        buf.extend(self.iter_render())
+
+    def iter_render(self, chunk_rows: int | None = None) -> Iterator[str]:
+        """
+        Yield the table as HTML chunks: the opening tags + <thead>, then one
+        chunk per *chunk_rows* rows (default `cfg.stream_chunk_rows`), then the
+        closing tags.  Rows are pulled lazily, so peak memory is one chunk.
+
+        Feed it to `render.stream_with_automatic_static` (or any
+        `StreamingHttpResponse`) for export-sized tables.
+        """
+        return self._iter_table(
+            data=self.cfg.data,
             fields=[f for f in self.cfg.fields if f.get("visible", True)],
             table_id=self.cfg.table_id or self.id,
             table_class=self.cfg.table_class,
             scrollable=self.cfg.scrollable,
+            chunk_rows=chunk_rows or self.cfg.stream_chunk_rows,
         )
-        return mark_safe(html)
 
     def _render_table(self,
                       *,
-                      data: Sequence[Mapping[str, object]],
+                      data: Iterable[Mapping[str, object]],
                       fields: Sequence[Mapping[str, object]],
                       table_id: str,
                       table_class: str,
                       scrollable: bool) -> str:
+        return "".join(self._iter_table(
+            data=data, fields=fields, table_id=table_id,
+            table_class=table_class, scrollable=scrollable,
+            chunk_rows=self.cfg.stream_chunk_rows,
+        ))
+
+    def _iter_table(self,
+                    *,
+                    data: Iterable[Mapping[str, object]],
+                    fields: Sequence[Mapping[str, object]],
+                    table_id: str,
+                    table_class: str,
+                    scrollable: bool,
+                    chunk_rows: int) -> Iterator[str]:
 
         thead = "<thead><tr>" + "".join(
             f"<th>{field.get('field_text', field['field_name'])}</th>"
             for field in fields
         ) + "</tr></thead>"
 
-        tbody_rows = (
-            self._render_row(row, fields) for row in data
-        )
-        tbody = "<tbody>" + "".join(tbody_rows) + "</tbody>"
-
         scroll_cls = " bfe-table-widget--scrollable" if scrollable else ""
         attrs_str = f'id="{table_id}" class="{table_class} bfe-card{scroll_cls}"'
 
-        return f"<table {attrs_str}>{thead}{tbody}</table>"
+        yield f"<table {attrs_str}>{thead}<tbody>"
+
+        chunk_rows = max(chunk_rows, 1)
+        # QuerySets: stream from the DB cursor instead of filling the result cache
+        if hasattr(data, "iterator"):
+            data = data.iterator(chunk_size=chunk_rows)
+
+        render_row = self._row_renderer(fields)
+        batch: list[str] = []
+        for row in data:
+            batch.append(render_row(row))
+            if len(batch) >= chunk_rows:
+                yield "".join(batch)
+                batch.clear()
+        if batch:
+            yield "".join(batch)
+
+        yield "</tbody></table>"
+
+    def _row_renderer(self, fields: Sequence[Mapping[str, object]]) -> Callable[[Mapping[str, object]], str]:
+        """
+        Row function for the hot loop.  Uses the compiled per-column renderers
+        unless a subclass customised `_render_row` / `_render_cell`, in which
+        case the generic (per-cell dict lookup) path is kept for them.
+        """
+        cls = type(self)
+        if cls._render_row is not TableWidget._render_row or cls._render_cell is not TableWidget._render_cell:
+            return lambda row: self._render_row(row, fields)
+
+        cells = compile_fields(fields)
+
+        def render_row(row: Mapping[str, object]) -> str:
+            return "<tr>" + "".join([cell(row) for cell in cells]) + "</tr>"
+        return render_row
 
     def _render_row(self,
                     row_data: Mapping[str, object],
@@ -115,6 +175,52 @@ class TableWidget(BFEBaseWidget):
         js = ()
 
 
+def compile_fields(fields: Sequence[Mapping[str, object]]) -> tuple[CellRenderer, ...]:
+    """
+    Turn a `fields` schema into a tuple of specialised cell renderers – all
+    `field_type` / `field_name` / `editable` lookups happen here, once, instead
+    of rows × columns times.  cached per schema fingerprint (schemas holding
+    lambdas / closures have none and are compiled every time).
+
+    Output is identical to `TableWidget._render_cell` wrapped in <td>.
+    """
+    key = fingerprint(tuple(fields))
+    compiled = None if key is None else _compiled_schemas.get(key)
+    if compiled is None:
+        compiled = tuple(_compile_cell(field) for field in fields)
+        if key is not None:
+            _compiled_schemas.set(key, compiled)
+    return compiled
+
+
+def _compile_cell(field: Mapping[str, object]) -> CellRenderer:
+    ftype = field.get("field_type", "text")
+    fname = field.get("field_name", "")
+
+    if ftype == "img":
+        def img_cell(row):
+            value = row.get(fname, "")
+            if value:
+                return f'<td><img src="{value}" class="bfe-thumbnail" alt="thumbnail"></td>'
+            return '<td><span class="bfe-icon">📄</span></td>'
+        return img_cell
+
+    if ftype == "actions":
+        html = '<td><button class="bfe-action-remove">Remove</button></td>'
+        return lambda row: html
+
+    if field.get("editable", False):
+        head = f'<td><input type="text" name="{fname}" value="'
+        tail = f'" data-field="{fname}"></td>'
+
+        def editable_cell(row):
+            value = row.get(fname, "")
+            return f'{head}{"" if value is None else value}{tail}'
+        return editable_cell
+
+    return lambda row: f"<td>{row.get(fname, '')}</td>"
+
+
 @ChildBuilderRegistry.register(TableConfig)
 def _build_table(cfg: TableConfig, parent):
     return TableWidget(config=cfg, parent=parent)
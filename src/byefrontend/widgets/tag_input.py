@@ -6,9 +6,8 @@ from typing import Any, Sequence
 from django.utils.safestring import mark_safe
 
 from .base import BFEFormCompatibleWidget
-from .label import LabelWidget
+from .label import render_label
 from ..builders import ChildBuilderRegistry
-from ..configs.label import LabelConfig
 from ..configs.tag_input import TagInputConfig
 
 
@@ -62,8 +61,7 @@ class TagInputWidget(BFEFormCompatibleWidget):
         if cfg.is_in_form:
             label_html = ""
         else:
-            lbl_cfg = LabelConfig(text=cfg.label or name, html_for=input_id)
-            label_html = LabelWidget(config=lbl_cfg, parent=self).render()
+            label_html = render_label(self, cfg.label or name, input_id)
 
         return mark_safe(
             f'<div class="text-input-wrapper">{label_html}{wrapper}</div>'